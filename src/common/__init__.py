@@ -0,0 +1,6 @@
+"""
+AI Newsletter Platform - Common
+Building blocks shared by the strategic, operational and execution layers
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,176 @@
+"""
+Two-Tier Cache
+Bounded key/value store: an in-memory LRU over an optional SQLite table, with a TTL
+"""
+
+from typing import Dict, Any, Optional, Callable, Tuple
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+
+
+class TwoTierCache:
+    """
+    Key -> value store behind the response and validator caches:
+    - A bounded in-memory LRU answers hot lookups with the stored object
+    - An optional SQLite table keeps encoded values across restarts
+    - Entries expire after a TTL; both tiers evict least recently used
+    """
+
+    EVICTION_INTERVAL = 100
+
+    def __init__(
+        self,
+        table: str,
+        encode: Callable[[Any], str],
+        decode: Callable[[str], Any],
+        path: Optional[str] = None,
+        memory_entries: int = 1024,
+        disk_entries: int = 100_000,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.table = table
+        self.encode = encode
+        self.decode = decode
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_last_access ON {table} (last_access)"
+            )
+
+        self._writes_since_eviction = self.EVICTION_INTERVAL  # check on first write
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a value, promoting disk hits into memory"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    f"SELECT value, expires_at FROM {self.table} WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    encoded, expires_at = row
+                    if expires_at > now:
+                        self._conn.execute(
+                            f"UPDATE {self.table} SET last_access = ? WHERE cache_key = ?", (now, key)
+                        )
+                        value = self.decode(encoded)
+                        self._remember(key, expires_at, value)
+                        self._stats["disk_hits"] += 1
+                        return value
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE cache_key = ?", (key,))
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value in both tiers"""
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                    (key, self.encode(value), expires_at, now),
+                )
+                # Counting rows is O(n), so only enforce the bound periodically
+                self._writes_since_eviction += 1
+                if self._writes_since_eviction >= self.EVICTION_INTERVAL:
+                    self._evict_disk(now)
+            self._stats["writes"] += 1
+
+    def touch(self, key: str, ttl_seconds: Optional[float] = None) -> None:
+        """Restart an entry's TTL and mark it as recently used"""
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory[key] = (expires_at, entry[1])
+                self._memory.move_to_end(key)
+            if self._conn is not None:
+                self._conn.execute(
+                    f"UPDATE {self.table} SET expires_at = ?, last_access = ? WHERE cache_key = ?",
+                    (expires_at, now, key),
+                )
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit-rate and size statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            if self._conn is not None:
+                stats["disk_entries"] = self._count()
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def __len__(self) -> int:
+        """Entries in the largest tier: disk when there is one"""
+        with self._lock:
+            return self._count() if self._conn is not None else len(self._memory)
+
+    def close(self) -> None:
+        """Close the disk tier"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _count(self) -> int:
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows, then least recently used rows over the size bound"""
+        conn = self._conn
+        self._writes_since_eviction = 0
+        expired = conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,)).rowcount
+        overflow = self._count() - self.disk_entries
+        evicted = 0
+        if overflow > 0:
+            evicted = conn.execute(
+                f"""
+                DELETE FROM {self.table} WHERE cache_key IN (
+                    SELECT cache_key FROM {self.table} ORDER BY last_access LIMIT ?
+                )
+                """,
+                (overflow,),
+            ).rowcount
+        self._stats["evictions"] += max(expired, 0) + max(evicted, 0)
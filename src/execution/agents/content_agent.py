@@ -2,13 +2,55 @@
 Content Agent - AI-powered content generation
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Tuple, Union
 from datetime import datetime
+import asyncio
+import hashlib
+import json
+import os
+import time
 import structlog
 from pydantic import BaseModel
 
+from src.execution.llm.batching import MicroBatcher
+from src.execution.llm.cascade import CascadeProvider
+from src.execution.llm.context_packing import ContextPacker, PackedContext, estimate_tokens
+from src.execution.llm.providers import (
+    GenerationRequest,
+    GenerationResult,
+    LLMProvider,
+    create_provider,
+)
+from src.execution.llm.rate_limits import RateLimitedProvider
+from src.execution.llm.response_cache import ResponseCache
+from src.execution.llm.semantic_cache import SemanticCache
+
 logger = structlog.get_logger()
 
+# Research tokens per section prompt unless the spec or config sets context_tokens
+DEFAULT_CONTEXT_TOKENS = 2000
+
+DEFAULT_SECTIONS: List[Dict[str, Any]] = [
+    {
+        "section_type": "introduction",
+        "title": "This Week's Highlights",
+        "instructions": "Write a short introduction summarizing the most important developments.",
+        "max_tokens": 300,
+    },
+    {
+        "section_type": "main",
+        "title": "Deep Dive",
+        "instructions": "Write an in-depth analysis of the key story and what it means for readers.",
+        "max_tokens": 1200,
+    },
+    {
+        "section_type": "action_items",
+        "title": "What You Can Do",
+        "instructions": "List concrete, practical actions readers can take this week.",
+        "max_tokens": 400,
+    },
+]
+
 
 class ContentSection(BaseModel):
     """A section of newsletter content"""
@@ -18,6 +60,13 @@ class ContentSection(BaseModel):
     word_count: int
 
 
+class ContentChunk(BaseModel):
+    """Partial text of a section that is still being generated"""
+    section_type: str
+    text: str
+    index: int
+
+
 class GeneratedContent(BaseModel):
     """Complete generated newsletter content"""
     topic_id: str
@@ -26,44 +75,455 @@ class GeneratedContent(BaseModel):
     generated_at: datetime = datetime.utcnow()
 
 
+class _SectionOutcome(BaseModel):
+    """One finished section and how it was produced"""
+    section: ContentSection
+    result: GenerationResult
+    packed: PackedContext
+    fingerprint: str
+    reused: bool = False
+
+
 class ContentAgent:
     """AI agent for content generation"""
-    
-    def __init__(self, model: str = "gpt-4", temperature: float = 0.7):
+
+    def __init__(
+        self,
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        provider: Optional[LLMProvider] = None,
+        batcher: Optional[MicroBatcher] = None,
+        cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+    ):
         self.model = model
         self.temperature = temperature
+        # Agents sharing a batcher have their concurrent calls coalesced;
+        # the batcher's provider is already rate limited
+        self.batcher = batcher
+        if batcher:
+            self.provider = batcher.provider
+        else:
+            # LLM_PROVIDER selects openai/anthropic (e.g. pointed at the local stand-in via *_BASE_URL)
+            provider = provider or create_provider(os.getenv("LLM_PROVIDER") or "fake")
+            # All agents share the provider's process-wide concurrency and rate limits;
+            # a cascade applies them to each of its members
+            if not isinstance(provider, (RateLimitedProvider, CascadeProvider)):
+                provider = RateLimitedProvider(provider)
+            self.provider = provider
+        self.cache = cache
+        # Near-duplicate prompts (e.g. topics covering the same launch) reuse or adapt prior output
+        self.semantic_cache = semantic_cache
+        self._cache_hits = 0
+        self._semantic_hits = 0
         self.logger = logger.bind(component="content_agent")
-    
+
     async def generate_content(
         self, topic_id: str, research_data: Dict[str, Any], config: Dict[str, Any]
     ) -> GeneratedContent:
         """Generate newsletter content based on research"""
         self.logger.info("generating_content", topic_id=topic_id)
-        
-        # In production: Call LLM API (OpenAI, Anthropic, etc.)
-        sections = [
-            ContentSection(
-                section_type="introduction",
-                title="This Week's Highlights",
-                content="Generated introduction content...",
-                word_count=150
-            ),
-            ContentSection(
-                section_type="main",
-                title="Deep Dive",
-                content="Generated main content...",
-                word_count=800
-            ),
-            ContentSection(
-                section_type="action_items",
-                title="What You Can Do",
-                content="Generated action items...",
-                word_count=200
-            )
-        ]
-        
+        return await self._generate_all(topic_id, research_data, config)
+
+    async def regenerate_content(
+        self,
+        previous: GeneratedContent,
+        research_data: Dict[str, Any],
+        config: Dict[str, Any],
+    ) -> GeneratedContent:
+        """
+        Regenerate only the sections whose inputs changed
+
+        A section is reused from `previous` when its fingerprint (prompt
+        template, packed research subset, tone, language, model and the
+        fingerprints of the sections it depends on) is unchanged.
+        """
+        content = await self._generate_all(previous.topic_id, research_data, config, previous)
+        self.logger.info(
+            "content_regenerated",
+            topic_id=previous.topic_id,
+            regenerated=content.metadata["regenerated_sections"],
+            reused=content.metadata["reused_sections"],
+        )
+        return content
+
+    async def _generate_all(
+        self,
+        topic_id: str,
+        research_data: Dict[str, Any],
+        config: Dict[str, Any],
+        previous: Optional[GeneratedContent] = None,
+    ) -> GeneratedContent:
+        specs = config.get("content_sections") or DEFAULT_SECTIONS
+        hits_before = self._cache_hits
+        semantic_before = self._semantic_hits
+        tasks = self._launch_sections(topic_id, specs, research_data, config, previous=previous)
+        try:
+            outcomes: List[_SectionOutcome] = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        results = [o.result for o in outcomes]
+        packed = {o.section.section_type: o.packed for o in outcomes}
+
         return GeneratedContent(
             topic_id=topic_id,
-            sections=sections,
-            metadata={"model": self.model, "temperature": self.temperature}
+            sections=[o.section for o in outcomes],
+            metadata={
+                "model": self.model,
+                "temperature": self.temperature,
+                "provider": self.provider.name,
+                "input_tokens": sum(r.input_tokens for r in results),
+                "output_tokens": sum(r.output_tokens for r in results),
+                "cache_hits": self._cache_hits - hits_before,
+                "semantic_hits": self._semantic_hits - semantic_before,
+                "context_packing": {
+                    name: {
+                        "tokens_used": p.tokens_used,
+                        "token_budget": p.token_budget,
+                        "items_used": p.items_used,
+                        "items_dropped": p.items_dropped,
+                        "fields_dropped": p.dropped_fields,
+                    }
+                    for name, p in packed.items()
+                },
+                "context_tokens": sum(p.tokens_used for p in packed.values()),
+                "section_fingerprints": {o.section.section_type: o.fingerprint for o in outcomes},
+                "regenerated_sections": [o.section.section_type for o in outcomes if not o.reused],
+                "reused_sections": [o.section.section_type for o in outcomes if o.reused],
+            },
+        )
+
+    async def stream_content(
+        self,
+        topic_id: str,
+        research_data: Dict[str, Any],
+        config: Dict[str, Any],
+        include_chunks: bool = False,
+    ) -> AsyncIterator[Union[ContentSection, ContentChunk]]:
+        """
+        Generate sections concurrently and yield each as soon as it is done
+
+        Args:
+            topic_id: Topic being generated
+            research_data: Research input for every section
+            config: Generation config (content_sections, tone, ...)
+            include_chunks: Also yield ContentChunk objects with partial
+                text while sections are still streaming from the provider
+
+        Yields:
+            ContentChunk (optional) and ContentSection objects in
+            completion order, not section order
+        """
+        self.logger.info("streaming_content", topic_id=topic_id)
+        specs = config.get("content_sections") or DEFAULT_SECTIONS
+        queue: asyncio.Queue = asyncio.Queue()
+        on_chunk = queue.put_nowait if include_chunks else None
+
+        tasks = self._launch_sections(topic_id, specs, research_data, config, on_chunk)
+        for task in tasks.values():
+            task.add_done_callback(queue.put_nowait)
+
+        remaining = len(tasks)
+        try:
+            while remaining:
+                item = await queue.get()
+                if isinstance(item, asyncio.Task):
+                    remaining -= 1
+                    yield item.result().section  # re-raises a failed section
+                else:
+                    yield item
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def _launch_sections(
+        self,
+        topic_id: str,
+        specs: List[Dict[str, Any]],
+        research_data: Dict[str, Any],
+        config: Dict[str, Any],
+        on_chunk: Optional[Callable[[ContentChunk], None]] = None,
+        previous: Optional[GeneratedContent] = None,
+    ) -> Dict[str, asyncio.Task]:
+        """
+        Start one task per section, keyed by section_type in spec order
+
+        Sections run concurrently; a section listing others in
+        "depends_on" waits for them and sees their text in its prompt.
+        Sections of `previous` with an unchanged fingerprint are reused.
+        """
+        _check_dependencies(specs)
+        tasks: Dict[str, asyncio.Task] = {}
+        # Research is ranked once and packed per section budget
+        packer = ContextPacker(research_data)
+        previous_fingerprints = (previous.metadata.get("section_fingerprints", {}) if previous else {})
+        previous_sections = {s.section_type: s for s in previous.sections} if previous else {}
+
+        async def run(spec: Dict[str, Any]) -> _SectionOutcome:
+            name = spec["section_type"]
+            depends_on = spec.get("depends_on", [])
+            upstream: List[_SectionOutcome] = [await tasks[dep] for dep in depends_on]
+            packed = packer.pack(
+                spec.get("context_tokens") or config.get("context_tokens", DEFAULT_CONTEXT_TOKENS)
+            )
+            fingerprint = self._fingerprint(spec, packed, config, [u.fingerprint for u in upstream])
+
+            if previous_fingerprints.get(name) == fingerprint and name in previous_sections:
+                section = previous_sections[name]
+                if on_chunk is not None:
+                    on_chunk(ContentChunk(section_type=name, text=section.content, index=0))
+                result = GenerationResult(
+                    text=section.content, model=self.model, provider=self.provider.name
+                )
+                return _SectionOutcome(
+                    section=section, result=result, packed=packed, fingerprint=fingerprint, reused=True
+                )
+
+            context = {dep: u.section.content for dep, u in zip(depends_on, upstream)}
+            section, result = await self._generate_section(
+                topic_id, spec, research_data, packed, config, on_chunk, context
+            )
+            return _SectionOutcome(
+                section=section, result=result, packed=packed, fingerprint=fingerprint
+            )
+
+        # Every task is created before any runs, so dependencies can be looked up by name
+        for spec in specs:
+            tasks[spec["section_type"]] = asyncio.create_task(run(spec))
+        return tasks
+
+    async def _generate_section(
+        self,
+        topic_id: str,
+        spec: Dict[str, Any],
+        research_data: Dict[str, Any],
+        packed: PackedContext,
+        config: Dict[str, Any],
+        on_chunk: Optional[Callable[[ContentChunk], None]] = None,
+        context: Optional[Dict[str, str]] = None,
+    ) -> Tuple[ContentSection, GenerationResult]:
+        """Generate one section, optionally reporting partial text"""
+        request = self._build_request(topic_id, spec, packed, config, context)
+        if on_chunk is None:
+            result = await self._complete(request, research_data)
+        else:
+            result = await self._complete_streaming(request, research_data, on_chunk)
+
+        section = ContentSection(
+            section_type=spec["section_type"],
+            title=spec.get("title", spec["section_type"].replace("_", " ").title()),
+            content=result.text,
+            word_count=len(result.text.split()),
+        )
+        return section, result
+
+    def _fingerprint(
+        self,
+        spec: Dict[str, Any],
+        packed: PackedContext,
+        config: Dict[str, Any],
+        upstream: List[str],
+    ) -> str:
+        """Hash of everything that determines a section's prompt"""
+        inputs = {
+            "spec": {k: v for k, v in spec.items() if k != "depends_on"},
+            "depends_on": spec.get("depends_on", []),
+            "research": packed.text,
+            "tone": config.get("tone", "professional"),
+            "language": config.get("language", "en"),
+            "system": config.get("system_prompt"),
+            "model": self.model,
+            "temperature": self.temperature,
+            "upstream": upstream,
+        }
+        return hashlib.sha256(
+            json.dumps(inputs, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+
+    def _build_request(
+        self,
+        topic_id: str,
+        spec: Dict[str, Any],
+        packed: PackedContext,
+        config: Dict[str, Any],
+        context: Optional[Dict[str, str]] = None,
+    ) -> GenerationRequest:
+        """Turn a section spec, packed research and upstream sections into a provider request"""
+        parts = [
+            spec.get("instructions", f"Write the {spec['section_type']} section."),
+            f"Topic: {topic_id}",
+            f"Tone: {config.get('tone', 'professional')}",
+            f"Language: {config.get('language', 'en')}",
+            "Research:\n" + packed.text,
+        ]
+        for name, content in (context or {}).items():
+            parts.append(f"Section '{name}' (build on this):\n{content}")
+        prompt = "\n\n".join(parts)
+        return GenerationRequest(
+            prompt=prompt,
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=spec.get("max_tokens", 800),
+            system=config.get("system_prompt"),
+            metadata={
+                "topic_id": topic_id,
+                "section_type": spec["section_type"],
+                "tone": config.get("tone", "professional"),
+                "language": config.get("language", "en"),
+                "context_tokens": packed.tokens_used,
+            },
+        )
+
+    async def _complete(
+        self, request: GenerationRequest, research_data: Dict[str, Any]
+    ) -> GenerationResult:
+        """Serve a request from cache, else through the batcher or provider"""
+        key = None
+        if self.cache:
+            key = self.cache.make_key(
+                request.model, request.temperature, request.prompt, research_data
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._cache_hits += 1
+                return cached
+
+        reused, outgoing = self._semantic_lookup(request)
+        if reused is not None:
+            return reused
+
+        if self.batcher:
+            result = await self.batcher.submit(outgoing)
+        else:
+            result = await self.provider.generate(outgoing)
+
+        if key is not None:
+            self.cache.set(key, result)
+        self._semantic_add(request, result)
+        return result
+
+    async def _complete_streaming(
+        self,
+        request: GenerationRequest,
+        research_data: Dict[str, Any],
+        on_chunk: Callable[[ContentChunk], None],
+    ) -> GenerationResult:
+        """Like _complete, but stream provider output chunk by chunk"""
+        section_type = request.metadata["section_type"]
+        key = None
+        if self.cache:
+            key = self.cache.make_key(
+                request.model, request.temperature, request.prompt, research_data
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._cache_hits += 1
+                on_chunk(ContentChunk(section_type=section_type, text=cached.text, index=0))
+                return cached
+
+        reused, outgoing = self._semantic_lookup(request)
+        if reused is not None:
+            on_chunk(ContentChunk(section_type=section_type, text=reused.text, index=0))
+            return reused
+
+        started = time.monotonic()
+        parts: List[str] = []
+        async for text in self.provider.stream(outgoing):
+            on_chunk(ContentChunk(section_type=section_type, text=text, index=len(parts)))
+            parts.append(text)
+
+        text = "".join(parts)
+        result = GenerationResult(
+            text=text,
+            model=request.model,
+            provider=self.provider.name,
+            # Streaming responses carry no usage block; estimate locally
+            input_tokens=estimate_tokens(outgoing.prompt),
+            output_tokens=estimate_tokens(text),
+            latency_seconds=time.monotonic() - started,
+        )
+        if key is not None:
+            self.cache.set(key, result)
+        self._semantic_add(request, result)
+        return result
+
+    def _semantic_lookup(
+        self, request: GenerationRequest
+    ) -> Tuple[Optional[GenerationResult], GenerationRequest]:
+        """
+        Check the semantic cache for a near-duplicate prompt
+
+        Returns:
+            (prior result, request) on a hit under the reuse policy,
+            otherwise (None, request to send); under the adapt policy the
+            prior output is appended to the prompt as a draft
+        """
+        if not self.semantic_cache:
+            return None, request
+        match = self.semantic_cache.lookup(request.prompt, _semantic_namespace(request))
+        if match is None:
+            return None, request
+        self._semantic_hits += 1
+        if self.semantic_cache.policy == "reuse":
+            return match.result, request
+        draft = (
+            "Draft from a closely related newsletter; revise it to fit the research above:\n"
+            + match.result.text
+        )
+        return None, request.model_copy(update={"prompt": f"{request.prompt}\n\n{draft}"})
+
+    def _semantic_add(self, request: GenerationRequest, result: GenerationResult) -> None:
+        if self.semantic_cache:
+            self.semantic_cache.add(request.prompt, result, _semantic_namespace(request))
+
+
+def _semantic_namespace(request: GenerationRequest) -> str:
+    """
+    Only prompts for the same model, temperature, section, topic, tone and
+    language are comparable
+
+    The research text dominates the n-gram vector, so prompts differing
+    only in these short lines would otherwise score as near-duplicates.
+    """
+    metadata = request.metadata
+    return "|".join(
+        str(part)
+        for part in (
+            request.model,
+            request.temperature,
+            metadata.get("section_type", ""),
+            metadata.get("topic_id", ""),
+            metadata.get("tone", ""),
+            metadata.get("language", ""),
         )
+    )
+
+
+def _check_dependencies(specs: List[Dict[str, Any]]) -> None:
+    """Reject duplicate sections, unknown dependencies and cycles"""
+    names = [spec["section_type"] for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate section types: {names}")
+    graph = {spec["section_type"]: spec.get("depends_on", []) for spec in specs}
+    for name, deps in graph.items():
+        unknown = [d for d in deps if d not in graph]
+        if unknown:
+            raise ValueError(f"Section {name} depends on unknown sections: {unknown}")
+
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Circular section dependency involving {name}")
+        visiting.add(name)
+        for dep in graph[name]:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name)
@@ -0,0 +1,120 @@
+"""
+Micro-Batching
+Coalesces concurrent generation requests into batched provider calls
+"""
+
+from typing import Dict, Any, Optional, List, Tuple
+import asyncio
+import time
+import structlog
+
+from src.execution.llm.cascade import CascadeProvider
+from src.execution.llm.providers import GenerationRequest, GenerationResult, LLMProvider
+from src.execution.llm.rate_limits import RateLimitedProvider
+
+logger = structlog.get_logger()
+
+
+class MicroBatcher:
+    """
+    Collects requests for a short window and dispatches them together:
+    - Requests with the same model and temperature share a batch
+    - A batch is sent when the window closes or it reaches max size
+    - Providers without batch support still get one concurrent fan-out
+    - Time-to-batch and batch-size metrics are kept for tuning
+    - Calls go through the provider's shared rate limits, like any agent's
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        window_ms: float = 10.0,
+        max_batch_size: Optional[int] = None,
+    ):
+        # A batch takes one limiter slot; a cascade applies limits per member
+        if not isinstance(provider, (RateLimitedProvider, CascadeProvider)):
+            provider = RateLimitedProvider(provider)
+        self.provider = provider
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size or max(provider.max_batch_size, 1)
+        self.logger = logger.bind(component="micro_batcher", provider=provider.name)
+
+        self._pending: Dict[Tuple[str, float], List[Tuple[GenerationRequest, asyncio.Future, float]]] = {}
+        self._timers: Dict[Tuple[str, float], asyncio.TimerHandle] = {}
+        self._inflight: set = set()
+
+        self._batches = 0
+        self._requests = 0
+        self._batch_sizes: List[int] = []
+        self._time_to_batch: List[float] = []
+        self._sample_limit = 1000
+
+    async def submit(self, request: GenerationRequest) -> GenerationResult:
+        """Queue a request and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        key = (request.model, request.temperature)
+        queue = self._pending.setdefault(key, [])
+        queue.append((request, future, time.monotonic()))
+
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window_seconds, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, float]) -> None:
+        """Dispatch everything queued under `key`"""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._pending.pop(key, [])
+        if not queue:
+            return
+        task = asyncio.ensure_future(self._dispatch(queue))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[GenerationRequest, asyncio.Future, float]]) -> None:
+        now = time.monotonic()
+        self._record(len(batch), [now - enqueued for _, _, enqueued in batch])
+        requests = [request for request, _, _ in batch]
+        try:
+            if self.provider.supports_batching and len(requests) > 1:
+                results = await self.provider.generate_batch(requests)
+            else:
+                results = await asyncio.gather(
+                    *(self.provider.generate(r) for r in requests), return_exceptions=True
+                )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _record(self, size: int, waits: List[float]) -> None:
+        self._batches += 1
+        self._requests += size
+        self._batch_sizes.append(size)
+        self._time_to_batch.extend(waits)
+        # Keep bounded samples for percentile metrics
+        del self._batch_sizes[:-self._sample_limit]
+        del self._time_to_batch[:-self._sample_limit]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batching statistics since creation"""
+        waits = sorted(self._time_to_batch)
+        return {
+            "batches": self._batches,
+            "requests": self._requests,
+            "avg_batch_size": self._requests / self._batches if self._batches else 0.0,
+            "max_batch_size": max(self._batch_sizes, default=0),
+            "time_to_batch_avg_ms": (sum(waits) / len(waits) * 1000) if waits else 0.0,
+            "time_to_batch_p95_ms": waits[int(0.95 * (len(waits) - 1))] * 1000 if waits else 0.0,
+        }
@@ -0,0 +1,293 @@
+"""
+Provider Cascade
+Primary/secondary LLM providers with latency-budget hedging and fast failover
+"""
+
+from typing import Dict, Any, Optional, List, AsyncIterator, Set, Tuple
+import asyncio
+import time
+import structlog
+from pydantic import BaseModel
+
+from src.execution.llm.providers import (
+    GenerationRequest,
+    GenerationResult,
+    LLMProvider,
+    ProviderError,
+)
+from src.execution.llm.rate_limits import RateLimitedProvider
+
+logger = structlog.get_logger()
+
+
+class ProviderHealth(BaseModel):
+    """Rolling health of one provider in a cascade"""
+    provider: str
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    hedge_wins: int = 0
+    latency_ewma_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    unhealthy_until: float = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+
+class CascadeProvider(LLMProvider):
+    """
+    Tries providers in order of preference:
+    - The first healthy provider gets the request
+    - If it has not answered within latency_budget_seconds (for streams:
+      produced its first chunk), the next provider is hedged in parallel;
+      the first success wins and the rest are cancelled
+    - A 429, 5xx or transport error fails over to the next provider
+      immediately; other errors are raised as-is
+    - A provider failing failure_threshold times in a row is moved to
+      the back of the order for cooldown_seconds
+    """
+
+    name = "cascade"
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        latency_budget_seconds: float = 10.0,
+        models: Optional[Dict[str, str]] = None,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        ewma_alpha: float = 0.2,
+    ):
+        if not providers:
+            raise ValueError("CascadeProvider needs at least one provider")
+        names = [p.name for p in providers]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Cascade provider names must be unique: {names}")
+        # Each member keeps its own process-wide rate limits
+        self.providers = [
+            p if isinstance(p, RateLimitedProvider) else RateLimitedProvider(p) for p in providers
+        ]
+        self.latency_budget_seconds = latency_budget_seconds
+        self.models = models or {}
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.ewma_alpha = ewma_alpha
+        self.health: Dict[str, ProviderHealth] = {
+            p.name: ProviderHealth(provider=p.name) for p in self.providers
+        }
+        self.hedges = 0
+        self.failovers = 0
+        self.logger = logger.bind(component="provider_cascade")
+
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        waiting = self._ordered()
+        pending: Dict[asyncio.Task, LLMProvider] = {}
+        hedged: Set[asyncio.Task] = set()
+        last_error: Optional[ProviderError] = None
+
+        def launch() -> asyncio.Task:
+            provider = waiting.pop(0)
+            task = asyncio.create_task(self._attempt(provider, request))
+            pending[task] = provider
+            return task
+
+        launch()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.latency_budget_seconds if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self.hedges += 1
+                    self.logger.info(
+                        "provider_hedged",
+                        slow=[p.name for p in pending.values()],
+                        hedge=waiting[0].name,
+                    )
+                    hedged.add(launch())
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except ProviderError as e:
+                        if not e.retryable:
+                            raise
+                        last_error = e
+                        if waiting:
+                            self.failovers += 1
+                            self.logger.warning(
+                                "provider_failover",
+                                failed=provider.name,
+                                next=waiting[0].name,
+                                error=str(e),
+                            )
+                            launch()
+                        continue
+                    if task in hedged:
+                        self.health[provider.name].hedge_wins += 1
+                    return result
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        """
+        Stream from the first provider that starts answering
+
+        Providers are raced on time to first chunk, with the same latency
+        budget and failover rules as generate. Once a provider has
+        produced its first chunk the others are cancelled; an error after
+        that is raised, since switching providers would splice two
+        different outputs.
+        """
+        waiting = self._ordered()
+        pending: Dict[asyncio.Task, Tuple[LLMProvider, AsyncIterator[str], float]] = {}
+        hedged: Set[asyncio.Task] = set()
+        last_error: Optional[ProviderError] = None
+        winner = None
+
+        def launch() -> asyncio.Task:
+            provider = waiting.pop(0)
+            chunks = provider.stream(self._for_provider(provider, request)).__aiter__()
+            task = asyncio.create_task(_next_chunk(chunks))
+            pending[task] = (provider, chunks, time.monotonic())
+            return task
+
+        launch()
+        try:
+            while pending and winner is None:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.latency_budget_seconds if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self.hedges += 1
+                    self.logger.info(
+                        "provider_hedged",
+                        slow=[p.name for p, _, _ in pending.values()],
+                        hedge=waiting[0].name,
+                        stream=True,
+                    )
+                    hedged.add(launch())
+                    continue
+                for task in done:
+                    provider, chunks, started = pending.pop(task)
+                    try:
+                        first = task.result()
+                    except ProviderError as e:
+                        self._record_failure(provider.name, e)
+                        if not e.retryable:
+                            raise
+                        last_error = e
+                        if waiting:
+                            self.failovers += 1
+                            self.logger.warning(
+                                "provider_failover",
+                                failed=provider.name,
+                                next=waiting[0].name,
+                                error=str(e),
+                            )
+                            launch()
+                        continue
+                    if winner is None:
+                        winner = (provider, chunks, started, first)
+                        if task in hedged:
+                            self.health[provider.name].hedge_wins += 1
+                    else:
+                        await chunks.aclose()  # finished in the same round; first one wins
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for _, chunks, _ in pending.values():
+                await chunks.aclose()
+
+        if winner is None:
+            raise last_error
+        provider, chunks, started, (finished, chunk) = winner
+        try:
+            while not finished:
+                yield chunk
+                finished, chunk = await _next_chunk(chunks)
+        except ProviderError as e:
+            self._record_failure(provider.name, e)
+            raise
+        finally:
+            await chunks.aclose()
+        self._record_success(provider.name, time.monotonic() - started)
+
+    async def close(self) -> None:
+        for provider in self.providers:
+            await provider.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hedge/failover counts and per-provider health"""
+        now = time.monotonic()
+        return {
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "providers": {
+                name: {**health.model_dump(), "healthy": health.healthy(now)}
+                for name, health in self.health.items()
+            },
+        }
+
+    def _ordered(self) -> List[LLMProvider]:
+        """Healthy providers in preference order, then those cooling down"""
+        now = time.monotonic()
+        healthy = [p for p in self.providers if self.health[p.name].healthy(now)]
+        cooling = [p for p in self.providers if not self.health[p.name].healthy(now)]
+        return healthy + cooling
+
+    def _for_provider(self, provider: LLMProvider, request: GenerationRequest) -> GenerationRequest:
+        model = self.models.get(provider.name)
+        return request.model_copy(update={"model": model}) if model else request
+
+    async def _attempt(self, provider: LLMProvider, request: GenerationRequest) -> GenerationResult:
+        started = time.monotonic()
+        try:
+            result = await provider.generate(self._for_provider(provider, request))
+        except ProviderError as e:
+            self._record_failure(provider.name, e)
+            raise
+        self._record_success(provider.name, time.monotonic() - started)
+        return result
+
+    def _record_success(self, name: str, latency: float) -> None:
+        health = self.health[name]
+        health.successes += 1
+        health.consecutive_failures = 0
+        health.unhealthy_until = 0.0
+        health.latency_ewma_seconds = (
+            latency
+            if health.latency_ewma_seconds is None
+            else self.ewma_alpha * latency + (1 - self.ewma_alpha) * health.latency_ewma_seconds
+        )
+
+    def _record_failure(self, name: str, error: ProviderError) -> None:
+        health = self.health[name]
+        health.failures += 1
+        health.consecutive_failures += 1
+        health.last_error = str(error)
+        if health.consecutive_failures >= self.failure_threshold:
+            health.unhealthy_until = time.monotonic() + self.cooldown_seconds
+            self.logger.warning(
+                "provider_marked_unhealthy",
+                provider=name,
+                consecutive_failures=health.consecutive_failures,
+                cooldown_seconds=self.cooldown_seconds,
+            )
+
+
+async def _next_chunk(chunks: AsyncIterator[str]) -> Tuple[bool, str]:
+    """(finished, chunk) for the next item of a provider stream"""
+    try:
+        return False, await chunks.__anext__()
+    except StopAsyncIteration:
+        return True, ""
@@ -0,0 +1,184 @@
+"""
+Provider Client Pool
+Warm keep-alive HTTP clients shared by every provider in the process
+"""
+
+from typing import Dict, Any, Optional, AsyncIterator
+from urllib.parse import urlsplit
+import asyncio
+import importlib.util
+import weakref
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+
+class _PooledStream(httpx.AsyncByteStream):
+    """Response body that frees its pool slot once closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Any):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Per-host transport that reports to its ClientPool"""
+
+    def __init__(self, pool: "ClientPool", transport: httpx.AsyncHTTPTransport):
+        self.pool = pool
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.pool._acquire()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.pool._release()
+
+        request.extensions = {**request.extensions, "trace": self.pool._trace}
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _PooledStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ClientPool:
+    """
+    One keep-alive httpx client per host, shared by all providers:
+    - Connections and TLS sessions are reused across agents and calls
+    - HTTP/2 by default (httpx[http2]); falls back to HTTP/1.1, with a
+      warning, if the h2 package is missing
+    - Per-host connection limits plus a pool-wide in-flight cap
+    - metrics() reports reuse ratio and saturation
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        per_host_connections: int = 20,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        timeout_seconds: float = 60.0,
+        http2: Optional[bool] = None,
+    ):
+        self.max_connections = max_connections
+        self.per_host_connections = per_host_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry_seconds = keepalive_expiry_seconds
+        self.timeout_seconds = timeout_seconds
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._stats = {
+            "requests": 0,
+            "new_connections": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "saturated_waits": 0,
+        }
+        self.logger = logger.bind(component="client_pool")
+        if http2 is None and not self.http2:
+            self.logger.warning(
+                "client_pool_http2_unavailable",
+                detail="h2 is not installed; install httpx[http2] to multiplex requests",
+            )
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """Shared client for the host of `base_url`"""
+        parts = urlsplit(base_url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        if host not in self._clients:
+            transport = httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.per_host_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry_seconds,
+                ),
+            )
+            self._clients[host] = httpx.AsyncClient(
+                transport=_PooledTransport(self, transport), timeout=self.timeout_seconds
+            )
+            self.logger.info("client_pool_host_added", host=host, http2=self.http2)
+        return self._clients[host]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Connection reuse and saturation statistics"""
+        stats: Dict[str, Any] = dict(self._stats)
+        requests = stats["requests"]
+        stats["hosts"] = len(self._clients)
+        stats["reused_connections"] = max(0, requests - stats["new_connections"])
+        stats["reuse_ratio"] = stats["reused_connections"] / requests if requests else 0.0
+        stats["max_connections"] = self.max_connections
+        stats["saturation"] = stats["in_flight"] / self.max_connections
+        stats["http2"] = self.http2
+        return stats
+
+    async def aclose(self) -> None:
+        """Close every pooled connection"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    async def _acquire(self) -> None:
+        if self._semaphore.locked():
+            self._stats["saturated_waits"] += 1
+        await self._semaphore.acquire()
+        self._stats["requests"] += 1
+        self._stats["in_flight"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+
+    def _release(self) -> None:
+        self._stats["in_flight"] -= 1
+        self._semaphore.release()
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        # httpcore emits connect events only when a new connection is opened
+        if event == "connection.connect_tcp.complete":
+            self._stats["new_connections"] += 1
+
+
+# Connections belong to an event loop, so "process-wide" means one pool per running loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ClientPool]" = weakref.WeakKeyDictionary()
+_pool_settings: Dict[str, Any] = {}
+
+
+def configure_client_pool(**settings: Any) -> None:
+    """Set ClientPool arguments for pools created from now on"""
+    _pool_settings.clear()
+    _pool_settings.update(settings)
+
+
+def get_client_pool() -> ClientPool:
+    """The shared pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in _pools:
+        _pools[loop] = ClientPool(**_pool_settings)
+    return _pools[loop]
+
+
+async def close_client_pool() -> None:
+    """Close the running loop's pool, e.g. on application shutdown"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
@@ -0,0 +1,159 @@
+"""
+Context Packing
+Fits the most useful research into a per-section prompt token budget
+"""
+
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timezone
+import json
+import math
+import re
+import structlog
+from pydantic import BaseModel, Field
+
+logger = structlog.get_logger()
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Keys in research_data that hold lists of research items
+ITEM_KEYS = ("items", "articles", "signals", "sources")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local approximation of BPE token count
+
+    Each punctuation mark is one token and each word is one token per
+    started six characters; no vocabulary is loaded. It is a heuristic,
+    not a measured bound, so budgets should leave some headroom.
+    """
+    return sum(1 + (len(match) - 1) // 6 for match in _TOKEN_PATTERN.findall(text))
+
+
+class PackedContext(BaseModel):
+    """Research selected for one prompt"""
+    text: str
+    tokens_used: int
+    token_budget: int
+    items_used: int
+    items_dropped: int
+    dropped_ids: List[str] = Field(default_factory=list)
+    dropped_fields: List[str] = Field(default_factory=list)  # non-item fields that did not fit
+
+
+class ContextPacker:
+    """
+    Ranks research once and packs it per section:
+    - Items are scored by relevance_score blended with recency
+    - Non-item fields (headline, notes, ...) are kept ahead of items,
+      all or none; if they exceed the budget they are reported as dropped
+    - Packing is greedy by score, skipping items that no longer fit
+    """
+
+    def __init__(
+        self,
+        research_data: Dict[str, Any],
+        recency_half_life_hours: float = 48.0,
+        recency_weight: float = 0.3,
+        now: Optional[datetime] = None,
+    ):
+        self.research_data = research_data
+        self.recency_half_life_hours = recency_half_life_hours
+        self.recency_weight = recency_weight
+        self.now = now or datetime.now(timezone.utc)
+        self._ranked: Optional[List[Tuple[float, str, str, int]]] = None
+        self._fields: Optional[Tuple[str, int]] = None
+
+    def pack(self, token_budget: int) -> PackedContext:
+        """Select the best research that fits in `token_budget` tokens"""
+        fields_text, fields_tokens = self._render_fields()
+        lines = []
+        used = 0
+        dropped_fields: List[str] = []
+        if fields_text and fields_tokens <= token_budget:
+            lines.append(fields_text)
+            used = fields_tokens
+        elif fields_text:
+            dropped_fields = sorted(k for k in self.research_data if k not in ITEM_KEYS)
+            logger.warning(
+                "context_fields_dropped",
+                fields=dropped_fields,
+                field_tokens=fields_tokens,
+                token_budget=token_budget,
+            )
+
+        ranked = self._rank()
+        dropped = []
+        for _, item_id, line, tokens in ranked:
+            if used + tokens <= token_budget:
+                lines.append(line)
+                used += tokens
+            else:
+                dropped.append(item_id)
+
+        return PackedContext(
+            text="\n".join(lines),
+            tokens_used=used,
+            token_budget=token_budget,
+            items_used=len(ranked) - len(dropped),
+            items_dropped=len(dropped),
+            dropped_ids=dropped,
+            dropped_fields=dropped_fields,
+        )
+
+    def _render_fields(self) -> Tuple[str, int]:
+        if self._fields is None:
+            fields = {k: v for k, v in self.research_data.items() if k not in ITEM_KEYS}
+            text = json.dumps(fields, sort_keys=True, default=str) if fields else ""
+            self._fields = (text, estimate_tokens(text))
+        return self._fields
+
+    def _rank(self) -> List[Tuple[float, str, str, int]]:
+        """(score, id, rendered line, tokens), best first"""
+        if self._ranked is None:
+            ranked = []
+            for key in ITEM_KEYS:
+                for index, item in enumerate(self.research_data.get(key) or []):
+                    if not isinstance(item, dict):
+                        item = {"content": str(item)}
+                    item_id = str(item.get("id") or item.get("url") or f"{key}[{index}]")
+                    line = _render_item(item)
+                    ranked.append((self._score(item), item_id, line, estimate_tokens(line)))
+            ranked.sort(key=lambda r: r[0], reverse=True)
+            self._ranked = ranked
+        return self._ranked
+
+    def _score(self, item: Dict[str, Any]) -> float:
+        relevance = float(item.get("relevance_score", 0.5))
+        published = _parse_time(
+            item.get("published_at") or item.get("published") or item.get("detected_at")
+        )
+        if published is None:
+            recency = 0.5
+        else:
+            age_hours = max(0.0, (self.now - published).total_seconds() / 3600)
+            recency = math.pow(0.5, age_hours / self.recency_half_life_hours)
+        return (1 - self.recency_weight) * relevance + self.recency_weight * recency
+
+
+def _render_item(item: Dict[str, Any]) -> str:
+    title = item.get("title") or item.get("topic") or ""
+    source = item.get("source", "")
+    body = item.get("summary") or item.get("content") or item.get("description") or ""
+    head = f"- {title}" + (f" ({source})" if source else "")
+    return f"{head}: {body}" if body else head
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,358 @@
+"""
+LLM Providers
+Common interface over OpenAI, Anthropic and a deterministic local fake
+"""
+
+from typing import Dict, Any, Optional, List, AsyncIterator
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import json
+import os
+import time
+import httpx
+import structlog
+from pydantic import BaseModel, Field
+
+from src.execution.llm.client_pool import get_client_pool
+
+logger = structlog.get_logger()
+
+
+class GenerationRequest(BaseModel):
+    """A single prompt to complete"""
+    prompt: str
+    model: str
+    temperature: float = 0.7
+    max_tokens: int = 1024
+    system: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class GenerationResult(BaseModel):
+    """A completed generation"""
+    text: str
+    model: str
+    provider: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_seconds: float = 0.0
+    finish_reason: str = "stop"
+
+
+class ProviderError(Exception):
+    """A provider call failed"""
+
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        """Rate limits, server errors and transport failures are worth retrying"""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class LLMProvider(ABC):
+    """
+    Base class for LLM backends
+
+    Providers that can complete several prompts in one call set
+    supports_batching and override generate_batch; the default
+    implementation fans out to generate concurrently.
+    """
+
+    name: str = "base"
+    supports_batching: bool = False
+    max_batch_size: int = 1
+
+    @abstractmethod
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        """Complete one prompt"""
+
+    async def generate_batch(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """Complete several prompts, results in request order"""
+        return list(await asyncio.gather(*(self.generate(r) for r in requests)))
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        """Yield text chunks as they are produced (whole text if unsupported)"""
+        result = await self.generate(request)
+        yield result.text
+
+    async def close(self) -> None:
+        """Release network resources"""
+
+
+class _HTTPProvider(LLMProvider):
+    """Shared plumbing for JSON-over-HTTP providers"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        timeout_seconds: float = 60.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self._client = client
+        self.logger = logger.bind(component=f"{self.name}_provider")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """An injected client, else the shared keep-alive client for base_url's host"""
+        if self._client is not None:
+            return self._client
+        return get_client_pool().client(self.base_url)
+
+    async def _post(self, path: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            response = await self.client.post(
+                f"{self.base_url}{path}", json=payload, headers=headers, timeout=self.timeout_seconds
+            )
+        except httpx.HTTPError as e:
+            raise ProviderError(self.name, f"transport error: {e}") from e
+        if response.status_code >= 400:
+            raise ProviderError(
+                self.name, f"HTTP {response.status_code}: {response.text[:200]}", response.status_code
+            )
+        return response.json()
+
+    async def _stream_events(
+        self, path: str, payload: Dict[str, Any], headers: Dict[str, str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """POST with stream=true and yield each server-sent JSON event"""
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}{path}",
+                json={**payload, "stream": True},
+                headers=headers,
+                timeout=self.timeout_seconds,
+            ) as response:
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode(errors="replace")
+                    raise ProviderError(
+                        self.name, f"HTTP {response.status_code}: {body[:200]}", response.status_code
+                    )
+                # Read to the end of the body even after [DONE]: a partly read
+                # response closes its connection instead of returning it to the pool
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data != "[DONE]":
+                        yield json.loads(data)
+        except httpx.HTTPError as e:
+            raise ProviderError(self.name, f"transport error: {e}") from e
+
+    async def close(self) -> None:
+        # Injected clients belong to the caller and pooled ones to the pool
+        # (see close_client_pool), so there is nothing to release here
+        return None
+
+
+class OpenAIProvider(_HTTPProvider):
+    """OpenAI Chat Completions API"""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout_seconds: float = 60.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        super().__init__(
+            api_key or os.getenv("OPENAI_API_KEY"),
+            base_url or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1",
+            timeout_seconds,
+            client,
+        )
+
+    def _payload(self, request: GenerationRequest) -> Dict[str, Any]:
+        messages = []
+        if request.system:
+            messages.append({"role": "system", "content": request.system})
+        messages.append({"role": "user", "content": request.prompt})
+        return {
+            "model": request.model,
+            "messages": messages,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+        }
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        started = time.monotonic()
+        data = await self._post("/chat/completions", self._payload(request), self._headers())
+        choice = data["choices"][0]
+        usage = data.get("usage", {})
+        return GenerationResult(
+            text=choice["message"]["content"],
+            model=data.get("model", request.model),
+            provider=self.name,
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            latency_seconds=time.monotonic() - started,
+            finish_reason=choice.get("finish_reason") or "stop",
+        )
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        async for event in self._stream_events(
+            "/chat/completions", self._payload(request), self._headers()
+        ):
+            for choice in event.get("choices", []):
+                text = (choice.get("delta") or {}).get("content")
+                if text:
+                    yield text
+
+
+class AnthropicProvider(_HTTPProvider):
+    """Anthropic Messages API"""
+
+    name = "anthropic"
+    api_version = "2023-06-01"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout_seconds: float = 60.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        super().__init__(
+            api_key or os.getenv("ANTHROPIC_API_KEY"),
+            base_url or os.getenv("ANTHROPIC_BASE_URL") or "https://api.anthropic.com",
+            timeout_seconds,
+            client,
+        )
+
+    def _payload(self, request: GenerationRequest) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": request.model,
+            "messages": [{"role": "user", "content": request.prompt}],
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+        }
+        if request.system:
+            payload["system"] = request.system
+        return payload
+
+    def _headers(self) -> Dict[str, str]:
+        return {"x-api-key": self.api_key or "", "anthropic-version": self.api_version}
+
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        started = time.monotonic()
+        data = await self._post("/v1/messages", self._payload(request), self._headers())
+        usage = data.get("usage", {})
+        return GenerationResult(
+            text="".join(block.get("text", "") for block in data.get("content", [])),
+            model=data.get("model", request.model),
+            provider=self.name,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+            latency_seconds=time.monotonic() - started,
+            finish_reason=data.get("stop_reason") or "stop",
+        )
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        async for event in self._stream_events("/v1/messages", self._payload(request), self._headers()):
+            if event.get("type") == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+
+
+class LocalFakeProvider(LLMProvider):
+    """
+    Deterministic offline provider for tests and local runs
+
+    The same prompt always yields the same text. Prompts in a batch are
+    answered in a single call, and every call is recorded in `calls`.
+    `failures` is a queue of HTTP status codes raised as ProviderError
+    by successive calls (None entries succeed), for exercising retries
+    and failover.
+    """
+
+    name = "fake"
+    supports_batching = True
+
+    def __init__(
+        self,
+        max_batch_size: int = 32,
+        latency_seconds: float = 0.0,
+        name: Optional[str] = None,
+        failures: Optional[List[Optional[int]]] = None,
+    ):
+        self.max_batch_size = max_batch_size
+        self.latency_seconds = latency_seconds
+        if name:
+            self.name = name
+        self.failures: List[Optional[int]] = list(failures or [])
+        self.calls: List[int] = []  # batch size of each call
+
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        return (await self.generate_batch([request]))[0]
+
+    async def generate_batch(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
+        self.calls.append(len(requests))
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        self._maybe_fail()
+        return [self._complete(r) for r in requests]
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        self.calls.append(1)
+        self._maybe_fail()
+        words = self._complete(request).text.split(" ")
+        chunk_size = 8
+        for start in range(0, len(words), chunk_size):
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds / max(1, len(words) // chunk_size))
+            yield " ".join(words[start:start + chunk_size]) + (
+                " " if start + chunk_size < len(words) else ""
+            )
+
+    def _maybe_fail(self) -> None:
+        status_code = self.failures.pop(0) if self.failures else None
+        if status_code is not None:
+            raise ProviderError(self.name, f"injected HTTP {status_code}", status_code)
+
+    def _complete(self, request: GenerationRequest) -> GenerationResult:
+        digest = hashlib.sha256(
+            f"{request.model}|{request.temperature}|{request.prompt}".encode()
+        ).hexdigest()
+        words = min(request.max_tokens, 40 + int(digest[:4], 16) % 80)
+        text = " ".join(f"{request.model}-{digest[i % 56:i % 56 + 8]}" for i in range(words))
+        return GenerationResult(
+            text=text,
+            model=request.model,
+            provider=self.name,
+            input_tokens=len(request.prompt.split()),
+            output_tokens=words,
+            latency_seconds=self.latency_seconds,
+        )
+
+
+def create_provider(name: str, **kwargs: Any) -> LLMProvider:
+    """
+    Build a provider by name
+
+    Args:
+        name: openai, anthropic or fake
+        **kwargs: Provider constructor arguments
+    """
+    providers = {
+        "openai": OpenAIProvider,
+        "anthropic": AnthropicProvider,
+        "fake": LocalFakeProvider,
+    }
+    if name not in providers:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    return providers[name](**kwargs)
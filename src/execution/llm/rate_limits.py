@@ -0,0 +1,164 @@
+"""
+Provider Rate Limits
+Per-provider concurrency caps and request/token rate limits shared by all agents
+"""
+
+from typing import Dict, Any, Optional, List, AsyncIterator
+from contextlib import asynccontextmanager
+import asyncio
+import time
+import weakref
+import structlog
+
+from src.execution.llm.context_packing import estimate_tokens
+from src.execution.llm.providers import GenerationRequest, GenerationResult, LLMProvider
+
+logger = structlog.get_logger()
+
+
+class _TokenBucket:
+    """Refills continuously at `rate` per second up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.available = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self, amount: float) -> float:
+        """Wait until `amount` is available and consume it; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:  # FIFO: one taker refills and waits at a time
+            while True:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return waited
+                delay = (amount - self.available) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class ProviderLimiter:
+    """
+    Keeps one provider inside its API quota:
+    - A semaphore caps in-flight calls
+    - Optional token buckets enforce requests and tokens per minute
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._requests = (
+            _TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        )
+        self._tokens = (
+            _TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        )
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0, requests: int = 1) -> AsyncIterator[None]:
+        """Hold one concurrency slot after paying the rate limits"""
+        waited = 0.0
+        if self._requests:
+            waited += await self._requests.take(requests)
+        if self._tokens and tokens:
+            waited += await self._tokens.take(tokens)
+        self.throttled_seconds += waited
+        async with self._semaphore:
+            self.in_flight += 1
+            self.calls += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+# Semaphores and locks belong to the event loop that first waits on them,
+# so "process-wide" means one limiter per provider per running loop
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ProviderLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+_limit_settings: Dict[str, Dict[str, Any]] = {}
+
+
+def configure_provider_limits(provider_name: str, **limits: Any) -> None:
+    """Set the limits for a provider (see ProviderLimiter), replacing existing limiters"""
+    _limit_settings[provider_name] = dict(limits)
+    for limiters in list(_limiters.values()):
+        limiters.pop(provider_name, None)
+
+
+def get_provider_limiter(provider_name: str) -> ProviderLimiter:
+    """Shared limiter for a provider in the running event loop, created on first use"""
+    limiters = _limiters.setdefault(asyncio.get_running_loop(), {})
+    if provider_name not in limiters:
+        limiters[provider_name] = ProviderLimiter(**_limit_settings.get(provider_name, {}))
+    return limiters[provider_name]
+
+
+def request_tokens(request: GenerationRequest) -> int:
+    """Tokens a request may consume: estimated prompt size plus the output cap"""
+    return estimate_tokens((request.system or "") + request.prompt) + request.max_tokens
+
+
+class RateLimitedProvider(LLMProvider):
+    """
+    Wraps a provider so every call goes through a ProviderLimiter
+
+    Without an explicit limiter, each call uses the provider's shared
+    limiter for the running event loop, so the wrapper can be created
+    outside a loop and used from several.
+    """
+
+    def __init__(self, provider: LLMProvider, limiter: Optional[ProviderLimiter] = None):
+        self.inner = provider
+        self._limiter = limiter
+        self.name = provider.name
+        self.supports_batching = provider.supports_batching
+        self.max_batch_size = provider.max_batch_size
+
+    @property
+    def limiter(self) -> ProviderLimiter:
+        return self._limiter if self._limiter is not None else get_provider_limiter(self.name)
+
+    async def generate(self, request: GenerationRequest) -> GenerationResult:
+        async with self.limiter.slot(tokens=request_tokens(request)):
+            return await self.inner.generate(request)
+
+    async def generate_batch(self, requests: List[GenerationRequest]) -> List[GenerationResult]:
+        if not self.inner.supports_batching:
+            # Fan out so each request takes its own slot
+            return list(await asyncio.gather(*(self.generate(r) for r in requests)))
+        async with self.limiter.slot(
+            tokens=sum(request_tokens(r) for r in requests), requests=1
+        ):
+            return await self.inner.generate_batch(requests)
+
+    async def stream(self, request: GenerationRequest) -> AsyncIterator[str]:
+        async with self.limiter.slot(tokens=request_tokens(request)):
+            async for chunk in self.inner.stream(request):
+                yield chunk
+
+    async def close(self) -> None:
+        await self.inner.close()
@@ -0,0 +1,71 @@
+"""
+Response Cache
+Content-addressed prompt/response cache with an in-memory LRU over SQLite
+"""
+
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import structlog
+
+from src.common.two_tier_cache import TwoTierCache
+from src.execution.llm.providers import GenerationResult
+
+logger = structlog.get_logger()
+
+
+def _digest(value: Any) -> str:
+    """Stable SHA-256 of a string or JSON-serializable value"""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for generation results:
+    - Keys are hashes of (model, temperature, prompt, research_data)
+    - A bounded in-memory LRU answers hot lookups
+    - An optional SQLite file survives restarts and retried workflows
+    - Entries expire after a TTL; both tiers evict least recently used
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_entries: int = 1024,
+        disk_entries: int = 100_000,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.logger = logger.bind(component="response_cache")
+        self._entries = TwoTierCache(
+            "responses",
+            encode=lambda result: result.model_dump_json(),
+            decode=GenerationResult.model_validate_json,
+            path=path,
+            memory_entries=memory_entries,
+            disk_entries=disk_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str, research_data: Any) -> str:
+        """Content address for a generation request"""
+        return _digest([model, round(temperature, 4), _digest(prompt), _digest(research_data)])
+
+    def get(self, key: str) -> Optional[GenerationResult]:
+        """Look up a result, promoting disk hits into memory"""
+        return self._entries.get(key)
+
+    def set(self, key: str, result: GenerationResult, ttl_seconds: Optional[float] = None) -> None:
+        """Store a result in both tiers"""
+        self._entries.set(key, result, ttl_seconds)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit-rate and size statistics"""
+        return self._entries.metrics()
+
+    def close(self) -> None:
+        """Close the disk tier"""
+        self._entries.close()
@@ -0,0 +1,190 @@
+"""
+Semantic Cache
+Near-duplicate prompt detection with hashed n-gram vectors and an LSH index
+"""
+
+from typing import Dict, Any, Optional, List, Set, Tuple
+import re
+import threading
+import zlib
+import numpy as np
+import structlog
+from pydantic import BaseModel
+
+from src.execution.llm.providers import GenerationResult
+
+logger = structlog.get_logger()
+
+POLICIES = ("reuse", "adapt", "off")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class HashedNgramVectorizer:
+    """
+    Embedding-free text vectors:
+    - Character n-grams of normalized text are hashed into `dim` buckets
+    - Counts are log-scaled and L2-normalized, so dot product is cosine
+    """
+
+    def __init__(self, dim: int = 1024, ngram_range: Tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def transform(self, text: str) -> np.ndarray:
+        text = _WHITESPACE.sub(" ", text.lower()).strip()
+        low, high = self.ngram_range
+        indices = [
+            zlib.crc32(text[i:i + n].encode()) % self.dim
+            for n in range(low, high + 1)
+            for i in range(len(text) - n + 1)
+        ]
+        vector = np.log1p(np.bincount(indices, minlength=self.dim).astype(np.float32))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class LSHIndex:
+    """
+    Random-hyperplane locality-sensitive hashing for cosine similarity
+
+    Each table hashes a vector to the sign pattern of `bits` random
+    projections; vectors sharing a bucket in any table are candidates.
+    """
+
+    def __init__(self, dim: int, num_tables: int = 8, bits: int = 12, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((num_tables, bits, dim)).astype(np.float32)
+        self._weights = 1 << np.arange(bits, dtype=np.int64)
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(num_tables)]
+
+    def signatures(self, vector: np.ndarray) -> List[int]:
+        bits = (self.planes @ vector) > 0  # (tables, bits)
+        return [int(s) for s in bits.astype(np.int64) @ self._weights]
+
+    def add(self, item_id: int, signatures: List[int]) -> None:
+        for table, signature in zip(self._buckets, signatures):
+            table.setdefault(signature, set()).add(item_id)
+
+    def remove(self, item_id: int, signatures: List[int]) -> None:
+        for table, signature in zip(self._buckets, signatures):
+            bucket = table.get(signature)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del table[signature]
+
+    def candidates(self, signatures: List[int]) -> Set[int]:
+        found: Set[int] = set()
+        for table, signature in zip(self._buckets, signatures):
+            found |= table.get(signature, set())
+        return found
+
+
+class SemanticMatch(BaseModel):
+    """A cached result for a near-duplicate prompt"""
+    result: GenerationResult
+    similarity: float
+    prompt: str
+
+
+class SemanticCache:
+    """
+    Reuses generations across near-identical prompts:
+    - Prompts in the same namespace (e.g. model, temperature, section,
+      topic, tone and language) are compared by cosine similarity of
+      hashed n-gram vectors
+    - An LSH index narrows the search to a few candidates
+    - Policy "adapt" (default) hands the prior output to the provider as
+      a draft, "reuse" returns it as-is, "off" disables lookups
+    - Bounded to `max_entries`, overwriting the oldest entry
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        policy: str = "adapt",
+        max_entries: int = 10_000,
+        vectorizer: Optional[HashedNgramVectorizer] = None,
+        num_tables: int = 8,
+        bits: int = 12,
+        seed: int = 0,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown semantic cache policy: {policy}")
+        self.threshold = threshold
+        self.policy = policy
+        self.max_entries = max_entries
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self.index = LSHIndex(self.vectorizer.dim, num_tables, bits, seed)
+        self.logger = logger.bind(component="semantic_cache")
+
+        self._lock = threading.Lock()
+        # Row i of _vectors belongs to _entries[i]; storage doubles up to max_entries
+        self._vectors = np.zeros((min(max_entries, 64), self.vectorizer.dim), dtype=np.float32)
+        self._entries: List[Tuple[str, str, GenerationResult, List[int]]] = []
+        self._next_slot = 0  # oldest entry, overwritten once full
+        self._stats = {"lookups": 0, "hits": 0, "misses": 0, "reused": 0, "adapted": 0}
+        self._similarity_total = 0.0
+
+    def lookup(self, prompt: str, namespace: str = "") -> Optional[SemanticMatch]:
+        """Best cached result above the threshold, if any"""
+        if self.policy == "off":
+            return None
+        vector = self.vectorizer.transform(prompt)
+        signatures = self.index.signatures(vector)
+        with self._lock:
+            self._stats["lookups"] += 1
+            slots = [
+                slot for slot in self.index.candidates(signatures)
+                if self._entries[slot][0] == namespace
+            ]
+            if slots:
+                similarities = self._vectors[slots] @ vector
+                best = int(np.argmax(similarities))
+                similarity = float(similarities[best])
+                if similarity >= self.threshold:
+                    _, cached_prompt, result, _ = self._entries[slots[best]]
+                    self._stats["hits"] += 1
+                    self._stats["reused" if self.policy == "reuse" else "adapted"] += 1
+                    self._similarity_total += similarity
+                    return SemanticMatch(result=result, similarity=similarity, prompt=cached_prompt)
+            self._stats["misses"] += 1
+            return None
+
+    def add(self, prompt: str, result: GenerationResult, namespace: str = "") -> None:
+        """Index a completed generation"""
+        if self.policy == "off":
+            return
+        vector = self.vectorizer.transform(prompt)
+        signatures = self.index.signatures(vector)
+        with self._lock:
+            entry = (namespace, prompt, result, signatures)
+            if len(self._entries) < self.max_entries:
+                slot = len(self._entries)
+                self._entries.append(entry)
+                if slot == len(self._vectors):
+                    grown = np.zeros(
+                        (min(self.max_entries, 2 * slot), self.vectorizer.dim), dtype=np.float32
+                    )
+                    grown[:slot] = self._vectors
+                    self._vectors = grown
+            else:
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % self.max_entries
+                self.index.remove(slot, self._entries[slot][3])
+                self._entries[slot] = entry
+            self._vectors[slot] = vector
+            self.index.add(slot, signatures)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit-rate statistics"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["avg_similarity"] = (
+                self._similarity_total / stats["hits"] if stats["hits"] else 0.0
+            )
+        stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        stats["policy"] = self.policy
+        return stats
@@ -0,0 +1,211 @@
+"""
+LLM Stand-in Server
+Local OpenAI/Anthropic-compatible HTTP API for load and latency testing
+"""
+
+from typing import Dict, Any, Optional, List, AsyncIterator
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import structlog
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src.execution.llm.context_packing import estimate_tokens
+from src.execution.llm.providers import GenerationRequest, LocalFakeProvider
+
+logger = structlog.get_logger()
+
+
+class StandinConfig(BaseModel):
+    """Behaviour of the stand-in API"""
+    latency_distribution: str = "lognormal"  # fixed, uniform or lognormal
+    latency_median_seconds: float = 0.25  # time to first token
+    latency_spread: float = 0.5  # lognormal sigma, or +/- fraction for uniform
+    tokens_per_second: float = 400.0  # output pacing after the first token
+    tokens_per_minute: Optional[float] = None  # 429 once exceeded
+    error_rate_429: float = 0.0
+    error_rate_500: float = 0.0
+    seed: int = 0
+
+
+class _StandinState:
+    """Counters and the token-rate window shared by all requests"""
+
+    def __init__(self, config: StandinConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.fake = LocalFakeProvider(name="standin")
+        self.window_start = time.monotonic()
+        self.window_tokens = 0.0
+        self.stats = {"requests": 0, "streamed": 0, "errors_429": 0, "errors_500": 0, "rate_limited": 0}
+
+    def latency(self) -> float:
+        config = self.config
+        if config.latency_distribution == "fixed":
+            return config.latency_median_seconds
+        if config.latency_distribution == "uniform":
+            spread = config.latency_median_seconds * config.latency_spread
+            return max(0.0, self.rng.uniform(config.latency_median_seconds - spread,
+                                             config.latency_median_seconds + spread))
+        return config.latency_median_seconds * math.exp(self.rng.gauss(0.0, config.latency_spread))
+
+    def admit(self, tokens: int) -> Optional[JSONResponse]:
+        """Error response to return instead of a completion, if any"""
+        self.stats["requests"] += 1
+        roll = self.rng.random()
+        if roll < self.config.error_rate_429:
+            self.stats["errors_429"] += 1
+            return _error(429, "injected rate limit", retry_after=1)
+        if roll < self.config.error_rate_429 + self.config.error_rate_500:
+            self.stats["errors_500"] += 1
+            return _error(500, "injected server error")
+        limit = self.config.tokens_per_minute
+        if limit:
+            now = time.monotonic()
+            if now - self.window_start >= 60:
+                self.window_start, self.window_tokens = now, 0.0
+            if self.window_tokens + tokens > limit:
+                self.stats["rate_limited"] += 1
+                return _error(429, "tokens per minute exceeded",
+                              retry_after=math.ceil(60 - (now - self.window_start)))
+            self.window_tokens += tokens
+        return None
+
+
+def create_app(config: Optional[StandinConfig] = None) -> FastAPI:
+    """
+    Build the stand-in app
+
+    Serves POST /v1/chat/completions (OpenAI) and POST /v1/messages
+    (Anthropic), with or without "stream": true, plus GET /stats.
+    Output text is deterministic per prompt, as with LocalFakeProvider.
+    """
+    state = _StandinState(config or StandinConfig())
+    app = FastAPI(title="LLM Stand-in")
+    app.state.standin = state
+
+    async def complete(payload: Dict[str, Any], prompt: str) -> Any:
+        request = GenerationRequest(
+            prompt=prompt,
+            model=payload.get("model", "standin"),
+            temperature=payload.get("temperature", 0.7),
+            max_tokens=payload.get("max_tokens", 1024),
+        )
+        rejected = state.admit(estimate_tokens(prompt) + request.max_tokens)
+        if rejected is not None:
+            return rejected
+        await asyncio.sleep(state.latency())
+        return await state.fake.generate(request)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(http_request: Request) -> Any:
+        payload = await http_request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+        result = await complete(payload, prompt)
+        if isinstance(result, JSONResponse):
+            return result
+        if payload.get("stream"):
+            state.stats["streamed"] += 1
+            return _sse(
+                ({"choices": [{"index": 0, "delta": {"content": chunk}}]}
+                 async for chunk in _paced(result.text, state.config.tokens_per_second)),
+                done_marker=True,
+            )
+        await asyncio.sleep(result.output_tokens / state.config.tokens_per_second)
+        return {
+            "id": "chatcmpl-standin",
+            "object": "chat.completion",
+            "model": result.model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": result.text},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": result.input_tokens, "completion_tokens": result.output_tokens},
+        }
+
+    @app.post("/v1/messages")
+    async def messages(http_request: Request) -> Any:
+        payload = await http_request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+        result = await complete(payload, prompt)
+        if isinstance(result, JSONResponse):
+            return result
+        if payload.get("stream"):
+            state.stats["streamed"] += 1
+
+            async def events() -> AsyncIterator[Dict[str, Any]]:
+                yield {"type": "message_start", "message": {"model": result.model}}
+                async for chunk in _paced(result.text, state.config.tokens_per_second):
+                    yield {"type": "content_block_delta", "index": 0,
+                           "delta": {"type": "text_delta", "text": chunk}}
+                yield {"type": "message_stop"}
+
+            return _sse(events(), done_marker=False)
+        await asyncio.sleep(result.output_tokens / state.config.tokens_per_second)
+        return {
+            "id": "msg-standin",
+            "type": "message",
+            "model": result.model,
+            "content": [{"type": "text", "text": result.text}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": result.input_tokens, "output_tokens": result.output_tokens},
+        }
+
+    @app.get("/stats")
+    async def stats() -> Dict[str, Any]:
+        return {**state.stats, "config": state.config.model_dump()}
+
+    return app
+
+
+async def _paced(text: str, tokens_per_second: float, words_per_chunk: int = 8) -> AsyncIterator[str]:
+    """Split text into chunks released at the configured token rate"""
+    words = text.split(" ")
+    for start in range(0, len(words), words_per_chunk):
+        chunk: List[str] = words[start:start + words_per_chunk]
+        await asyncio.sleep(len(chunk) / tokens_per_second)
+        yield " ".join(chunk) + (" " if start + words_per_chunk < len(words) else "")
+
+
+def _sse(events: AsyncIterator[Dict[str, Any]], done_marker: bool) -> StreamingResponse:
+    async def body() -> AsyncIterator[bytes]:
+        async for event in events:
+            yield f"data: {json.dumps(event)}\n\n".encode()
+        if done_marker:
+            yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+
+def _error(status_code: int, message: str, retry_after: Optional[int] = None) -> JSONResponse:
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else None
+    return JSONResponse(
+        {"error": {"type": "standin_error", "message": message}}, status_code=status_code, headers=headers
+    )
+
+
+def main() -> None:
+    """Run the stand-in with uvicorn"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    for name, field in StandinConfig.model_fields.items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}",
+            dest=name,
+            type=float if field.annotation in (float, Optional[float]) else type(field.default),
+            default=field.default,
+        )
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    logger.info("standin_server_starting", host=host, port=port, **args)
+    uvicorn.run(create_app(StandinConfig(**args)), host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
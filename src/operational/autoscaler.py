@@ -0,0 +1,342 @@
+"""
+Autoscaler
+Grows and shrinks ResourceScheduler pools based on observed demand
+"""
+
+from typing import Dict, Any, Optional, List
+from abc import ABC, abstractmethod
+from datetime import datetime
+import asyncio
+import math
+import subprocess
+import sys
+import time
+import uuid
+import structlog
+from pydantic import BaseModel, Field
+
+from src.operational.resource_scheduler import Resource, ResourceScheduler
+from src.operational.utilization_recorder import percentile
+
+logger = structlog.get_logger()
+
+
+class ScalingPolicy(BaseModel):
+    """Scaling rules for a single resource_type pool"""
+    resource_type: str
+    min_resources: int = Field(default=1, ge=0)
+    max_resources: int = Field(default=10, ge=1)
+    capacity_per_resource: int = Field(default=1, ge=1)
+    step: int = Field(default=1, ge=1)
+
+    # Scale up when any of these is breached...
+    scale_up_utilization: float = Field(default=0.8, ge=0.0, le=1.0)
+    scale_up_queue_depth: int = Field(default=1, ge=1)
+    scale_up_wait_p95_seconds: float = 5.0
+
+    # ...and down only when utilization falls well below the up threshold
+    scale_down_utilization: float = Field(default=0.3, ge=0.0, le=1.0)
+
+    # Hysteresis: a condition must hold for this many consecutive evaluations
+    scale_up_evaluations: int = Field(default=2, ge=1)
+    scale_down_evaluations: int = Field(default=5, ge=1)
+
+    # Cooldowns after any scaling action
+    scale_up_cooldown_seconds: float = 60.0
+    scale_down_cooldown_seconds: float = 300.0
+
+
+class ScalingDecision(BaseModel):
+    """Outcome of evaluating one pool"""
+    resource_type: str
+    action: str  # scale_up, scale_down, hold
+    delta: int = 0
+    reason: str
+    metrics: Dict[str, Any] = Field(default_factory=dict)
+    decided_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Provisioner(ABC):
+    """Creates and destroys the capacity behind scheduler resources"""
+
+    @abstractmethod
+    async def provision(self, policy: ScalingPolicy, count: int) -> List[Resource]:
+        """Create `count` new resources for a pool"""
+
+    @abstractmethod
+    async def deprovision(self, resources: List[Resource]) -> None:
+        """Tear down resources that were removed from a pool"""
+
+
+class LocalProcessProvisioner(Provisioner):
+    """
+    Provisioner that backs each resource with a local worker process
+
+    Intended for tests and single-box runs; the default command just
+    sleeps so the process lifetime mirrors the resource lifetime.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None):
+        self.command = command or [sys.executable, "-c", "import time; time.sleep(1e9)"]
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self.logger = logger.bind(component="local_process_provisioner")
+
+    async def provision(self, policy: ScalingPolicy, count: int) -> List[Resource]:
+        resources = []
+        for _ in range(count):
+            resource_id = f"{policy.resource_type}_{uuid.uuid4().hex[:8]}"
+            process = subprocess.Popen(
+                self.command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            self.processes[resource_id] = process
+            resources.append(
+                Resource(
+                    resource_id=resource_id,
+                    resource_type=policy.resource_type,
+                    name=f"{policy.resource_type} worker {process.pid}",
+                    capacity=policy.capacity_per_resource,
+                    metadata={"pid": process.pid, "provisioned_by": "autoscaler"},
+                )
+            )
+            self.logger.info("process_spawned", resource_id=resource_id, pid=process.pid)
+        return resources
+
+    async def deprovision(self, resources: List[Resource]) -> None:
+        for resource in resources:
+            process = self.processes.pop(resource.resource_id, None)
+            if process is None:
+                continue
+            process.terminate()
+            try:
+                await asyncio.to_thread(process.wait, 5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            self.logger.info("process_terminated", resource_id=resource.resource_id)
+
+    async def shutdown(self) -> None:
+        """Terminate every process this provisioner started"""
+        await self.deprovision(
+            [
+                Resource(resource_id=rid, resource_type="", name="")
+                for rid in list(self.processes)
+            ]
+        )
+
+
+class Autoscaler:
+    """
+    Watches scheduler pools and scales them through a provisioner:
+    - Scale up on high utilization, queued demand or slow waits
+    - Scale down idle autoscaled resources once demand stays low
+    - Consecutive-evaluation hysteresis and per-direction cooldowns
+    """
+
+    def __init__(
+        self,
+        scheduler: ResourceScheduler,
+        provisioner: Provisioner,
+        policies: List[ScalingPolicy],
+    ):
+        self.scheduler = scheduler
+        self.provisioner = provisioner
+        self.policies: Dict[str, ScalingPolicy] = {p.resource_type: p for p in policies}
+        self.logger = logger.bind(component="autoscaler")
+
+        self._up_streak: Dict[str, int] = {}
+        self._down_streak: Dict[str, int] = {}
+        self._last_scaled_at: Dict[str, float] = {}
+        # Wait samples recorded before the last scaling action don't count as pressure
+        self._wait_cursor: Dict[str, int] = {}
+        self._managed: Dict[str, List[str]] = {p.resource_type: [] for p in policies}
+        self._task: Optional[asyncio.Task] = None
+        self.history: List[ScalingDecision] = []
+
+    def evaluate(self, now: Optional[float] = None) -> List[ScalingDecision]:
+        """
+        Decide what each pool should do; no capacity is changed here
+
+        Each call still advances the per-pool hysteresis streaks, so it
+        counts as one evaluation towards scale_up/scale_down_evaluations.
+
+        Args:
+            now: Monotonic timestamp to evaluate cooldowns against
+
+        Returns:
+            One ScalingDecision per policy
+        """
+        now = time.monotonic() if now is None else now
+        stats = self.scheduler.get_pool_stats()
+        return [
+            self._evaluate_pool(policy, stats.get(policy.resource_type, {}), now)
+            for policy in self.policies.values()
+        ]
+
+    def _evaluate_pool(
+        self, policy: ScalingPolicy, pool: Dict[str, Any], now: float
+    ) -> ScalingDecision:
+        """Apply one policy's thresholds, hysteresis and cooldowns"""
+        resource_type = policy.resource_type
+        resource_count = pool.get("resources", 0)
+        utilization = pool.get("utilization", 0.0)
+        queue_depth = pool.get("queue_depth", 0)
+        wait_p95 = percentile(self._waits_since_scaling(resource_type, pool), 0.95)
+        metrics = {
+            "resources": resource_count,
+            "utilization": round(utilization, 3),
+            "queue_depth": queue_depth,
+            "wait_p95_seconds": round(wait_p95, 3),
+        }
+
+        def decision(action: str, delta: int, reason: str) -> ScalingDecision:
+            return ScalingDecision(
+                resource_type=resource_type,
+                action=action,
+                delta=delta,
+                reason=reason,
+                metrics=metrics,
+            )
+
+        if resource_count < policy.min_resources:
+            return decision("scale_up", policy.min_resources - resource_count, "below_min_resources")
+        if resource_count > policy.max_resources:
+            return decision("scale_down", resource_count - policy.max_resources, "above_max_resources")
+
+        pressure = []
+        if utilization >= policy.scale_up_utilization:
+            pressure.append("utilization")
+        if queue_depth >= policy.scale_up_queue_depth:
+            pressure.append("queue_depth")
+        if wait_p95 >= policy.scale_up_wait_p95_seconds:
+            pressure.append("wait_p95")
+        idle = utilization <= policy.scale_down_utilization and queue_depth == 0
+
+        self._up_streak[resource_type] = self._up_streak.get(resource_type, 0) + 1 if pressure else 0
+        self._down_streak[resource_type] = self._down_streak.get(resource_type, 0) + 1 if idle else 0
+
+        since_last = now - self._last_scaled_at.get(resource_type, -math.inf)
+
+        if pressure:
+            if self._up_streak[resource_type] < policy.scale_up_evaluations:
+                return decision("hold", 0, "scale_up_pending_hysteresis")
+            if since_last < policy.scale_up_cooldown_seconds:
+                return decision("hold", 0, "scale_up_cooldown")
+            # Size the step to the queue so a burst is absorbed in one action
+            per_resource = policy.capacity_per_resource
+            delta = max(policy.step, math.ceil(queue_depth / per_resource))
+            delta = min(delta, policy.max_resources - resource_count)
+            if delta <= 0:
+                return decision("hold", 0, "at_max_resources")
+            return decision("scale_up", delta, "+".join(pressure))
+
+        if idle:
+            if self._down_streak[resource_type] < policy.scale_down_evaluations:
+                return decision("hold", 0, "scale_down_pending_hysteresis")
+            if since_last < policy.scale_down_cooldown_seconds:
+                return decision("hold", 0, "scale_down_cooldown")
+            delta = min(policy.step, resource_count - policy.min_resources)
+            if delta <= 0:
+                return decision("hold", 0, "at_min_resources")
+            return decision("scale_down", delta, "low_utilization")
+
+        return decision("hold", 0, "within_band")
+
+    def _waits_since_scaling(self, resource_type: str, pool: Dict[str, Any]) -> List[float]:
+        """Wait samples recorded after the pool was last scaled"""
+        samples = pool.get("wait_samples", [])
+        fresh = pool.get("wait_sample_count", len(samples)) - self._wait_cursor.get(resource_type, 0)
+        return samples[-fresh:] if fresh > 0 else []
+
+    async def apply(
+        self, decisions: List[ScalingDecision], now: Optional[float] = None
+    ) -> List[ScalingDecision]:
+        """
+        Carry out scaling decisions through the provisioner
+
+        Returns:
+            Decisions that changed capacity
+        """
+        now = time.monotonic() if now is None else now
+        applied = []
+        for decision in decisions:
+            policy = self.policies[decision.resource_type]
+            if decision.action == "scale_up":
+                resources = await self.provisioner.provision(policy, decision.delta)
+                for resource in resources:
+                    await self.scheduler.register_resource(resource)
+                    self._managed[policy.resource_type].append(resource.resource_id)
+            elif decision.action == "scale_down":
+                resources = await self._drain_idle(policy, decision.delta)
+                if not resources:
+                    continue
+                await self.provisioner.deprovision(resources)
+                decision.delta = len(resources)
+            else:
+                continue
+
+            self._last_scaled_at[policy.resource_type] = now
+            self._wait_cursor[policy.resource_type] = self.scheduler.wait_sample_count(policy.resource_type)
+            self._up_streak[policy.resource_type] = 0
+            self._down_streak[policy.resource_type] = 0
+            self.history.append(decision)
+            applied.append(decision)
+            self.logger.info(
+                "pool_scaled",
+                resource_type=decision.resource_type,
+                action=decision.action,
+                delta=decision.delta,
+                reason=decision.reason,
+                **decision.metrics,
+            )
+        return applied
+
+    async def _drain_idle(self, policy: ScalingPolicy, count: int) -> List[Resource]:
+        """Unregister up to `count` idle resources this autoscaler created"""
+        removed = []
+        managed = self._managed[policy.resource_type]
+        # Newest first, so long-lived warm resources are kept
+        registered = self.scheduler.resources
+        for resource_id in reversed(list(managed)):
+            if len(removed) >= count:
+                break
+            if resource_id not in registered:
+                managed.remove(resource_id)
+                continue
+            # Busy resources are skipped atomically, even if another
+            # scheduler sharing the pool allocated them a moment ago
+            resource = await self.scheduler.unregister_resource(resource_id, only_if_idle=True)
+            if resource is None:
+                continue
+            managed.remove(resource_id)
+            removed.append(resource)
+        return removed
+
+    async def run_once(self) -> List[ScalingDecision]:
+        """Evaluate every pool and apply the resulting decisions"""
+        return await self.apply(self.evaluate())
+
+    async def start(self, interval_seconds: float = 10.0) -> None:
+        """Start evaluating pools in the background"""
+        if self._task and not self._task.done():
+            return
+
+        async def _loop() -> None:
+            while True:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    self.logger.error("autoscaler_evaluation_failed", error=str(e))
+                await asyncio.sleep(interval_seconds)
+
+        self._task = asyncio.create_task(_loop())
+        self.logger.info("autoscaler_started", interval_seconds=interval_seconds)
+
+    async def stop(self) -> None:
+        """Stop the background evaluation loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.logger.info("autoscaler_stopped")
@@ -0,0 +1,209 @@
+"""
+Batch Placement
+Packs a batch of heterogeneous tasks onto multi-capacity resources
+"""
+
+from typing import Dict, Any, Optional, List
+import structlog
+from pydantic import BaseModel, Field
+
+from src.operational.resource_scheduler import Resource, ResourceScheduler
+
+logger = structlog.get_logger()
+
+
+class BatchTask(BaseModel):
+    """A task to place, with its estimated resource cost"""
+    task_id: str
+    task_type: str = "generate_content"
+    cost: Dict[str, float] = Field(default_factory=dict)  # e.g. tokens, memory_mb
+    estimated_seconds: Optional[float] = None
+
+
+class TaskPlacement(BaseModel):
+    """Where and when a task runs within the batch plan"""
+    task_id: str
+    resource_id: str
+    wave: int
+    start_offset_seconds: float
+    estimated_seconds: float
+
+
+class BatchPlacement(BaseModel):
+    """Result of packing a batch"""
+    placements: List[TaskPlacement] = Field(default_factory=list)
+    unplaced: List[str] = Field(default_factory=list)
+    makespan_seconds: float = 0.0
+    resource_finish_seconds: Dict[str, float] = Field(default_factory=dict)
+    slot_fragmentation: float = 0.0  # share of slot-time left idle before makespan
+    cost_fragmentation: Dict[str, float] = Field(default_factory=dict)  # unused share of limits
+
+
+class _Wave:
+    """Tasks running side by side on one resource"""
+
+    def __init__(self, start: float):
+        self.start = start
+        self.duration = 0.0
+        self.tasks: List[BatchTask] = []
+        self.used: Dict[str, float] = {}
+
+
+class BatchPlacer:
+    """
+    Plans placement of a whole batch (e.g. a daily run) at once:
+    - Each resource runs up to `capacity` tasks concurrently in waves
+    - Optional per-resource limits (metadata["limits"], e.g. tokens,
+      memory_mb) bound the summed cost of a wave
+    - Longest-first ordering with best-fit wave selection keeps the
+      makespan close to the lower bound
+    """
+
+    def __init__(self, scheduler: ResourceScheduler, default_tokens_per_second: float = 50.0):
+        self.scheduler = scheduler
+        self.default_tokens_per_second = default_tokens_per_second
+        self.logger = logger.bind(component="batch_placer")
+
+    def place(
+        self, tasks: List[BatchTask], requirements: Optional[Dict[str, Any]] = None
+    ) -> BatchPlacement:
+        """
+        Pack tasks onto matching resources
+
+        Args:
+            tasks: Tasks with estimated cost and optional duration
+            requirements: Resource filter, as for allocate_resource
+
+        Returns:
+            BatchPlacement with per-task offsets, makespan and fragmentation
+        """
+        requirements = requirements or {}
+        resources = [
+            r
+            for r in self.scheduler.resources.values()
+            if r.available and r.capacity > 0 and self.scheduler.matches_requirements(r, requirements)
+        ]
+        waves: Dict[str, List[_Wave]] = {r.resource_id: [] for r in resources}
+        durations = {t.task_id: self._duration(t) for t in tasks}
+        result = BatchPlacement()
+
+        # Longest processing time first
+        for task in sorted(tasks, key=lambda t: durations[t.task_id], reverse=True):
+            duration = durations[task.task_id]
+            best = None  # (finish_after, leftover, resource, wave or None)
+            for resource in resources:
+                limits = resource.metadata.get("limits", {})
+                if not _fits({}, task.cost, limits):
+                    continue
+                resource_waves = waves[resource.resource_id]
+                finish = _finish(resource_waves)
+
+                # Join an existing wave if it has a free slot and headroom
+                for wave in resource_waves:
+                    if len(wave.tasks) >= resource.capacity or not _fits(wave.used, task.cost, limits):
+                        continue
+                    grow = max(0.0, duration - wave.duration)
+                    candidate = (finish + grow, _leftover(wave.used, task.cost, limits), resource, wave)
+                    if best is None or candidate[:2] < best[:2]:
+                        best = candidate
+
+                # Or open a new wave at the end of this resource's schedule
+                candidate = (finish + duration, _leftover({}, task.cost, limits), resource, None)
+                if best is None or candidate[:2] < best[:2]:
+                    best = candidate
+
+            if best is None:
+                result.unplaced.append(task.task_id)
+                continue
+
+            _, _, resource, wave = best
+            resource_waves = waves[resource.resource_id]
+            if wave is None:
+                wave = _Wave(start=_finish(resource_waves))
+                resource_waves.append(wave)
+            grow = max(0.0, duration - wave.duration)
+            wave.tasks.append(task)
+            wave.duration = max(wave.duration, duration)
+            for key, value in task.cost.items():
+                wave.used[key] = wave.used.get(key, 0.0) + value
+            if grow:
+                # Later waves on this resource start after the longer wave ends
+                index = resource_waves.index(wave)
+                for later in resource_waves[index + 1:]:
+                    later.start += grow
+
+        self._summarize(result, resources, waves, durations)
+        self.logger.info(
+            "batch_placed",
+            tasks=len(tasks),
+            placed=len(result.placements),
+            unplaced=len(result.unplaced),
+            makespan_seconds=round(result.makespan_seconds, 2),
+            slot_fragmentation=round(result.slot_fragmentation, 3),
+        )
+        return result
+
+    def _duration(self, task: BatchTask) -> float:
+        """Estimated runtime; derived from token count when not given"""
+        if task.estimated_seconds is not None:
+            return task.estimated_seconds
+        return task.cost.get("tokens", 0.0) / self.default_tokens_per_second
+
+    def _summarize(
+        self,
+        result: BatchPlacement,
+        resources: List[Resource],
+        waves: Dict[str, List[_Wave]],
+        durations: Dict[str, float],
+    ) -> None:
+        """Fill in placements, makespan and fragmentation"""
+        busy_time = 0.0
+        cost_used: Dict[str, float] = {}
+        cost_offered: Dict[str, float] = {}
+
+        for resource in resources:
+            limits = resource.metadata.get("limits", {})
+            resource_waves = waves[resource.resource_id]
+            for index, wave in enumerate(resource_waves):
+                for task in wave.tasks:
+                    duration = durations[task.task_id]
+                    busy_time += duration
+                    result.placements.append(
+                        TaskPlacement(
+                            task_id=task.task_id,
+                            resource_id=resource.resource_id,
+                            wave=index,
+                            start_offset_seconds=wave.start,
+                            estimated_seconds=duration,
+                        )
+                    )
+                for key, limit in limits.items():
+                    cost_used[key] = cost_used.get(key, 0.0) + wave.used.get(key, 0.0)
+                    cost_offered[key] = cost_offered.get(key, 0.0) + limit
+            result.resource_finish_seconds[resource.resource_id] = _finish(resource_waves)
+
+        result.makespan_seconds = max(result.resource_finish_seconds.values(), default=0.0)
+        slot_time = sum(r.capacity for r in resources) * result.makespan_seconds
+        result.slot_fragmentation = 1 - busy_time / slot_time if slot_time else 0.0
+        result.cost_fragmentation = {
+            key: 1 - cost_used[key] / offered for key, offered in cost_offered.items() if offered
+        }
+
+
+def _finish(waves: List[_Wave]) -> float:
+    return waves[-1].start + waves[-1].duration if waves else 0.0
+
+
+def _fits(used: Dict[str, float], cost: Dict[str, float], limits: Dict[str, float]) -> bool:
+    return all(used.get(key, 0.0) + cost.get(key, 0.0) <= limit for key, limit in limits.items())
+
+
+def _leftover(used: Dict[str, float], cost: Dict[str, float], limits: Dict[str, float]) -> float:
+    """Normalized headroom left after adding `cost`; smaller is a tighter fit"""
+    if not limits:
+        return 0.0
+    return sum(
+        (limit - used.get(key, 0.0) - cost.get(key, 0.0)) / limit
+        for key, limit in limits.items()
+        if limit
+    )
@@ -0,0 +1,174 @@
+"""
+Streaming Content Pipeline
+Overlaps content generation with QA review and email formatting, section by section
+"""
+
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+import asyncio
+import html
+import time
+import structlog
+
+from src.execution.agents.content_agent import (
+    DEFAULT_SECTIONS, ContentAgent, ContentChunk, ContentSection
+)
+from src.operational.workflow_engine import TaskFailedError, Workflow, WorkflowEngine, WorkflowTask
+
+logger = structlog.get_logger()
+
+SectionStage = Callable[[ContentSection], Awaitable[Dict[str, Any]]]
+
+
+async def default_qa_stage(section: ContentSection) -> Dict[str, Any]:
+    """Basic structural checks on a finished section"""
+    issues = []
+    if not section.content.strip():
+        issues.append("empty_content")
+    if section.word_count < 20:
+        issues.append("too_short")
+    return {"section_type": section.section_type, "passed": not issues, "issues": issues}
+
+
+async def default_format_stage(section: ContentSection) -> Dict[str, Any]:
+    """Render a section as an HTML email block"""
+    paragraphs = "".join(
+        f"<p>{html.escape(p.strip())}</p>" for p in section.content.split("\n\n") if p.strip()
+    )
+    return {
+        "section_type": section.section_type,
+        "html": f"<section><h2>{html.escape(section.title)}</h2>{paragraphs}</section>",
+    }
+
+
+class StreamingContentPipeline:
+    """
+    Runs generate -> qa_review -> format_email per section:
+    - Consumes ContentAgent.stream_content as sections complete
+    - QA and formatting for a section start while others still generate
+    - Reports time-to-first-section alongside total latency
+    - With stream_chunks, sections stream from the provider and the
+      time to the first chunk is reported as well
+    """
+
+    def __init__(
+        self,
+        agent: ContentAgent,
+        qa_stage: Optional[SectionStage] = None,
+        format_stage: Optional[SectionStage] = None,
+        stream_chunks: bool = False,
+    ):
+        self.agent = agent
+        self.stream_chunks = stream_chunks
+        self.qa_stage = qa_stage or default_qa_stage
+        self.format_stage = format_stage or default_format_stage
+        self.logger = logger.bind(component="content_pipeline")
+
+    async def run(
+        self, topic_id: str, research_data: Dict[str, Any], config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Generate, review and format every section of a newsletter
+
+        Returns:
+            Sections, QA results and HTML in section order, plus
+            time_to_first_chunk_seconds, time_to_first_section_seconds
+            and total_seconds
+        """
+        started = time.monotonic()
+        first_chunk_at: Optional[float] = None
+        first_section_at: Optional[float] = None
+        processing: List[asyncio.Task] = []
+
+        async def process(section: ContentSection) -> Dict[str, Any]:
+            qa = await self.qa_stage(section)
+            formatted = await self.format_stage(section)
+            return {"section": section, "qa": qa, "formatted": formatted}
+
+        try:
+            async for item in self.agent.stream_content(
+                topic_id, research_data, config, include_chunks=self.stream_chunks
+            ):
+                if first_chunk_at is None:
+                    first_chunk_at = time.monotonic() - started
+                if isinstance(item, ContentChunk):
+                    continue
+                if first_section_at is None:
+                    first_section_at = time.monotonic() - started
+                processing.append(asyncio.create_task(process(item)))
+
+            outcomes = await asyncio.gather(*processing)
+        finally:
+            # Generation or a stage failed: don't leave sections processing in the background
+            unfinished = [t for t in processing if not t.done()]
+            for t in unfinished:
+                t.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        order = {
+            spec["section_type"]: i
+            for i, spec in enumerate(config.get("content_sections") or DEFAULT_SECTIONS)
+        }
+        outcomes.sort(key=lambda o: order.get(o["section"].section_type, len(order)))
+        total = time.monotonic() - started
+
+        self.logger.info(
+            "content_pipeline_completed",
+            topic_id=topic_id,
+            sections=len(outcomes),
+            time_to_first_chunk_seconds=round(first_chunk_at or 0.0, 3),
+            time_to_first_section_seconds=round(first_section_at or 0.0, 3),
+            total_seconds=round(total, 3),
+        )
+        return {
+            "topic_id": topic_id,
+            "sections": [o["section"].model_dump() for o in outcomes],
+            "qa": [o["qa"] for o in outcomes],
+            "qa_passed": all(o["qa"].get("passed", True) for o in outcomes),
+            "html": "\n".join(o["formatted"]["html"] for o in outcomes),
+            "time_to_first_chunk_seconds": first_chunk_at or 0.0,
+            "time_to_first_section_seconds": first_section_at or 0.0,
+            "total_seconds": total,
+        }
+
+    def register(self, engine: WorkflowEngine) -> None:
+        """
+        Route a content_generation workflow through this pipeline
+
+        generate_content does the streamed generation, QA and formatting;
+        qa_review and format_email then publish the results produced
+        incrementally upstream instead of starting from scratch.
+        """
+        engine.register_handler("generate_content", self._generate_handler)
+        engine.register_handler("qa_review", self._qa_handler)
+        engine.register_handler("format_email", self._format_handler)
+
+    async def _generate_handler(self, workflow: Workflow, task: WorkflowTask) -> Dict[str, Any]:
+        upstream = _upstream_output(workflow, task)
+        research_data = (
+            task.input_data.get("research_data")
+            or upstream.get("research_data")
+            or workflow.metadata.get("research_data", {})
+        )
+        config = workflow.metadata.get("content_config", {})
+        return await self.run(workflow.topic_id or "", research_data, config)
+
+    async def _qa_handler(self, workflow: Workflow, task: WorkflowTask) -> Dict[str, Any]:
+        upstream = _upstream_output(workflow, task)
+        if not upstream.get("qa_passed", True):
+            # QA is deterministic: fail without retries so nothing downstream is sent
+            failed = [q["section_type"] for q in upstream.get("qa", []) if not q.get("passed", True)]
+            self.logger.warning("content_qa_failed", topic_id=upstream.get("topic_id"), sections=failed)
+            raise TaskFailedError(f"QA failed for sections: {', '.join(failed)}")
+        return upstream
+
+    async def _format_handler(self, workflow: Workflow, task: WorkflowTask) -> Dict[str, Any]:
+        upstream = _upstream_output(workflow, task)
+        return {"topic_id": upstream.get("topic_id"), "html": upstream.get("html", "")}
+
+
+def _upstream_output(workflow: Workflow, task: WorkflowTask) -> Dict[str, Any]:
+    """Merged output_data of the tasks `task` depends on"""
+    merged: Dict[str, Any] = {}
+    for upstream in workflow.tasks:
+        if upstream.task_id in task.dependencies:
+            merged.update(upstream.output_data)
+    return merged
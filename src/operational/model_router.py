@@ -0,0 +1,220 @@
+"""
+Model Router
+Chooses which model-backed resource serves a content task, trading off cost and latency
+"""
+
+from typing import Dict, Any, Optional, List, Set
+from datetime import datetime
+import math
+import structlog
+from pydantic import BaseModel, Field
+
+from src.operational.resource_scheduler import ResourceScheduler
+
+logger = structlog.get_logger()
+
+
+class ModelProfile(BaseModel):
+    """Static pricing plus runtime-learned behaviour of one model"""
+    model: str
+    quality_tier: int = Field(default=2, ge=1, le=3)  # 1 basic, 2 standard, 3 premium
+    cost_per_1k_input_tokens: float = 0.0
+    cost_per_1k_output_tokens: float = 0.0
+
+    # Priors until real observations arrive
+    expected_latency_seconds: float = 5.0
+    expected_output_tokens: int = 500
+
+    # Learned at runtime (EWMA)
+    latency_mean: Optional[float] = None
+    latency_var: float = 0.0
+    output_tokens_mean: Optional[float] = None
+    observations: int = 0
+    last_observed_at: Optional[datetime] = None
+
+    def latency_p95(self) -> float:
+        """Approximate p95 latency assuming roughly normal latencies"""
+        if self.latency_mean is None:
+            return self.expected_latency_seconds
+        return self.latency_mean + 1.645 * math.sqrt(self.latency_var)
+
+    def output_tokens(self) -> float:
+        """Expected output tokens per request"""
+        if self.output_tokens_mean is None:
+            return float(self.expected_output_tokens)
+        return self.output_tokens_mean
+
+    def estimate_cost(self, input_tokens: int) -> float:
+        """Expected cost of a request with `input_tokens` of prompt"""
+        return (
+            input_tokens / 1000 * self.cost_per_1k_input_tokens
+            + self.output_tokens() / 1000 * self.cost_per_1k_output_tokens
+        )
+
+
+class RoutingDecision(BaseModel):
+    """Which model and resource a task was routed to, and why"""
+    model: str
+    resource_id: str
+    estimated_cost: float
+    estimated_latency_seconds: float
+    meets_slo: bool
+    reason: str
+    alternatives: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+class ModelRouter:
+    """
+    Routing layer over model-backed scheduler resources:
+    - Learns per-model latency and output size from completed calls
+    - Filters models by task quality tier and topic token budget
+    - Picks the cheapest model whose learned p95 latency meets the SLO
+    - Falls back to the fastest eligible model when none do, or when a
+      model's resources are saturated
+    """
+
+    def __init__(
+        self,
+        scheduler: ResourceScheduler,
+        profiles: List[ModelProfile],
+        resource_type: str = "llm",
+        smoothing: float = 0.2,
+    ):
+        self.scheduler = scheduler
+        self.profiles: Dict[str, ModelProfile] = {p.model: p for p in profiles}
+        self.resource_type = resource_type
+        self.smoothing = smoothing
+        self.topic_budgets: Dict[str, int] = {}
+        self.topic_tokens_used: Dict[str, int] = {}
+        self.logger = logger.bind(component="model_router")
+
+    def set_topic_budget(self, topic_id: str, max_tokens: int) -> None:
+        """Cap the tokens a topic may spend per run"""
+        self.topic_budgets[topic_id] = max_tokens
+        self.topic_tokens_used.setdefault(topic_id, 0)
+
+    def remaining_budget(self, topic_id: Optional[str]) -> Optional[int]:
+        """Tokens left for a topic, or None if it has no budget"""
+        if topic_id is None or topic_id not in self.topic_budgets:
+            return None
+        return self.topic_budgets[topic_id] - self.topic_tokens_used.get(topic_id, 0)
+
+    async def route(
+        self,
+        task_type: str,
+        requirements: Dict[str, Any],
+        topic_id: Optional[str] = None,
+    ) -> Optional[RoutingDecision]:
+        """
+        Choose a model and allocate one of its resources
+
+        Args:
+            task_type: Task being scheduled (e.g. generate_content)
+            requirements: May contain quality_tier, latency_slo_seconds
+                and input_tokens
+            topic_id: Topic whose token budget applies
+
+        Returns:
+            RoutingDecision, or None if no eligible model has free capacity
+        """
+        quality_tier = requirements.get("quality_tier", 1)
+        slo = requirements.get("latency_slo_seconds", math.inf)
+        input_tokens = requirements.get("input_tokens", 0)
+        remaining = self.remaining_budget(topic_id)
+
+        free_models = self._models_with_free_capacity()
+        candidates = []
+        for model, profile in self.profiles.items():
+            if profile.quality_tier < quality_tier:
+                continue
+            if remaining is not None and input_tokens + profile.output_tokens() > remaining:
+                continue
+            if model not in free_models:
+                # Saturated models would only queue; let the next one take it
+                continue
+            candidates.append((model, profile.estimate_cost(input_tokens), profile.latency_p95()))
+
+        if not candidates:
+            self.logger.warning(
+                "no_eligible_model",
+                task_type=task_type,
+                topic_id=topic_id,
+                quality_tier=quality_tier,
+                remaining_budget=remaining,
+            )
+            return None
+
+        within_slo = sorted((c for c in candidates if c[2] <= slo), key=lambda c: (c[1], c[2]))
+        fallback = sorted(candidates, key=lambda c: (c[2], c[1]))
+        ordered = within_slo + [c for c in fallback if c not in within_slo]
+
+        for model, cost, latency in ordered:
+            resource_id = await self.scheduler.allocate_resource(
+                task_type, {"resource_type": self.resource_type, "model": model}
+            )
+            if resource_id is None:
+                continue
+            meets_slo = latency <= slo
+            decision = RoutingDecision(
+                model=model,
+                resource_id=resource_id,
+                estimated_cost=round(cost, 6),
+                estimated_latency_seconds=round(latency, 3),
+                meets_slo=meets_slo,
+                reason="cheapest_within_slo" if meets_slo else "fastest_fallback",
+                alternatives=[
+                    {"model": m, "estimated_cost": round(c, 6), "estimated_latency_seconds": round(l, 3)}
+                    for m, c, l in ordered
+                    if m != model
+                ],
+            )
+            self.logger.info(
+                "model_routed",
+                task_type=task_type,
+                topic_id=topic_id,
+                model=model,
+                resource_id=resource_id,
+                reason=decision.reason,
+            )
+            return decision
+
+        return None
+
+    async def record_outcome(
+        self,
+        decision: RoutingDecision,
+        latency_seconds: float,
+        input_tokens: int,
+        output_tokens: int,
+        topic_id: Optional[str] = None,
+    ) -> None:
+        """Learn from a finished call, charge the topic budget and release the resource"""
+        profile = self.profiles[decision.model]
+        alpha = self.smoothing
+        if profile.latency_mean is None:
+            profile.latency_mean = latency_seconds
+            profile.output_tokens_mean = float(output_tokens)
+        else:
+            diff = latency_seconds - profile.latency_mean
+            profile.latency_mean += alpha * diff
+            profile.latency_var = (1 - alpha) * (profile.latency_var + alpha * diff * diff)
+            profile.output_tokens_mean += alpha * (output_tokens - profile.output_tokens_mean)
+        profile.observations += 1
+        profile.last_observed_at = datetime.utcnow()
+
+        if topic_id is not None:
+            self.topic_tokens_used[topic_id] = (
+                self.topic_tokens_used.get(topic_id, 0) + input_tokens + output_tokens
+            )
+
+        await self.scheduler.release_resource(decision.resource_id)
+
+    def _models_with_free_capacity(self) -> Set[str]:
+        """Models with at least one resource that can take another task, from one snapshot"""
+        return {
+            resource.metadata.get("model")
+            for resource in self.scheduler.state.snapshot().values()
+            if resource.resource_type == self.resource_type
+            and resource.available
+            and resource.current_load < resource.capacity
+        }
@@ -0,0 +1,220 @@
+"""
+Personalization Planner
+Generates one content variant per (topic, tone, language) segment and fans it out to subscribers
+"""
+
+from typing import Dict, Any, Optional, List, Tuple
+import asyncio
+import re
+import structlog
+from pydantic import BaseModel, Field
+
+from src.execution.agents.content_agent import ContentAgent, GeneratedContent
+
+logger = structlog.get_logger()
+
+_MERGE_FIELD = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+_LITERAL_BRACES = "{{lbrace}}"  # merge field that renders as a literal "{{"
+
+
+class Subscriber(BaseModel):
+    """A recipient and their subscriber_preferences"""
+    subscriber_id: str
+    email: str
+    name: Optional[str] = None
+    preferred_topics: List[str] = Field(default_factory=list)
+    tone: str = "professional"
+    language: str = "zh-TW"
+    frequency: str = "weekly"
+    merge_fields: Dict[str, str] = Field(default_factory=dict)  # extra per-recipient values
+
+
+class ContentVariant(BaseModel):
+    """One piece of content to generate, shared by a segment of subscribers"""
+    variant_id: str
+    topic_id: str
+    tone: str
+    language: str
+    subscriber_ids: List[str] = Field(default_factory=list)
+
+
+class PersonalizationPlan(BaseModel):
+    """Variants to generate and who receives each"""
+    variants: List[ContentVariant] = Field(default_factory=list)
+    subscriber_count: int = 0
+    delivery_count: int = 0
+
+    @property
+    def variant_count(self) -> int:
+        return len(self.variants)
+
+    @property
+    def fanout_ratio(self) -> float:
+        """Deliveries served per generated variant"""
+        return self.delivery_count / self.variant_count if self.variant_count else 0.0
+
+
+class Delivery(BaseModel):
+    """A rendered newsletter for one recipient"""
+    subscriber_id: str
+    email: str
+    variant_id: str
+    topic_id: str
+    body: str
+
+
+class PersonalizationPlanner:
+    """
+    Keeps generation cost proportional to segments, not audience size:
+    - Subscribers are grouped into (topic, tone, language) variants
+    - Each variant is generated once through the ContentAgent
+    - Per recipient only merge fields ({{name}}, {{email}}, ...) are
+      substituted into the variant's pre-rendered body
+    """
+
+    def __init__(self, agent: ContentAgent, max_concurrency: int = 4):
+        self.agent = agent
+        self.max_concurrency = max_concurrency
+        self.logger = logger.bind(component="personalization_planner")
+
+    def plan(
+        self,
+        subscribers: List[Subscriber],
+        topic_ids: Optional[List[str]] = None,
+        frequency: Optional[str] = None,
+    ) -> PersonalizationPlan:
+        """
+        Group subscribers into content variants
+
+        Args:
+            subscribers: Recipients with their preferences
+            topic_ids: Only plan these topics (default: every preferred topic)
+            frequency: Only include subscribers on this schedule
+
+        Returns:
+            PersonalizationPlan with variants in first-seen order
+        """
+        variants: Dict[Tuple[str, str, str], ContentVariant] = {}
+        recipients = set()
+        deliveries = 0
+        for subscriber in subscribers:
+            if frequency and subscriber.frequency != frequency:
+                continue
+            for topic_id in subscriber.preferred_topics:
+                if topic_ids is not None and topic_id not in topic_ids:
+                    continue
+                key = (topic_id, subscriber.tone, subscriber.language)
+                if key not in variants:
+                    variants[key] = ContentVariant(
+                        variant_id=":".join(key),
+                        topic_id=topic_id,
+                        tone=subscriber.tone,
+                        language=subscriber.language,
+                    )
+                variants[key].subscriber_ids.append(subscriber.subscriber_id)
+                recipients.add(subscriber.subscriber_id)
+                deliveries += 1
+
+        plan = PersonalizationPlan(
+            variants=list(variants.values()),
+            subscriber_count=len(recipients),
+            delivery_count=deliveries,
+        )
+        self.logger.info(
+            "personalization_planned",
+            variant_count=plan.variant_count,
+            subscriber_count=plan.subscriber_count,
+            delivery_count=plan.delivery_count,
+        )
+        return plan
+
+    async def generate(
+        self,
+        plan: PersonalizationPlan,
+        research_by_topic: Dict[str, Dict[str, Any]],
+        base_config: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, GeneratedContent]:
+        """Generate every variant once, keyed by variant_id"""
+        base_config = base_config or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def generate_variant(variant: ContentVariant) -> GeneratedContent:
+            config = {**base_config, "tone": variant.tone, "language": variant.language}
+            async with semaphore:
+                return await self.agent.generate_content(
+                    variant.topic_id, research_by_topic.get(variant.topic_id, {}), config
+                )
+
+        contents = await asyncio.gather(*(generate_variant(v) for v in plan.variants))
+        return {v.variant_id: c for v, c in zip(plan.variants, contents)}
+
+    async def run(
+        self,
+        subscribers: List[Subscriber],
+        research_by_topic: Dict[str, Dict[str, Any]],
+        base_config: Optional[Dict[str, Any]] = None,
+        frequency: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Plan, generate and render newsletters for a set of subscribers
+
+        Returns:
+            deliveries plus variant_count, subscriber_count,
+            delivery_count and fanout_ratio
+        """
+        plan = self.plan(subscribers, list(research_by_topic), frequency)
+        contents = await self.generate(plan, research_by_topic, base_config)
+        by_id = {s.subscriber_id: s for s in subscribers}
+
+        deliveries = []
+        for variant in plan.variants:
+            template = render_template(contents[variant.variant_id])
+            for subscriber_id in variant.subscriber_ids:
+                subscriber = by_id[subscriber_id]
+                deliveries.append(
+                    Delivery(
+                        subscriber_id=subscriber_id,
+                        email=subscriber.email,
+                        variant_id=variant.variant_id,
+                        topic_id=variant.topic_id,
+                        body=apply_merge_fields(template, subscriber),
+                    )
+                )
+
+        return {
+            "deliveries": deliveries,
+            "variant_count": plan.variant_count,
+            "subscriber_count": plan.subscriber_count,
+            "delivery_count": plan.delivery_count,
+            "fanout_ratio": plan.fanout_ratio,
+        }
+
+
+def render_template(content: GeneratedContent) -> str:
+    """
+    Render a variant once, leaving merge fields for each recipient
+
+    Generated text is escaped, so "{{...}}" written by the model is kept
+    literally rather than filled with subscriber data.
+    """
+    parts = ["Hi {{name}},"]
+    for section in content.sections:
+        parts.append(f"{_escape(section.title)}\n\n{_escape(section.content)}")
+    parts.append("You are receiving this because {{email}} subscribed to " + _escape(content.topic_id) + ".")
+    return "\n\n".join(parts)
+
+
+def apply_merge_fields(template: str, subscriber: Subscriber) -> str:
+    """Substitute {{field}} placeholders; unknown fields are left as-is"""
+    values = {
+        "name": subscriber.name or subscriber.email.split("@")[0],
+        "email": subscriber.email,
+        "subscriber_id": subscriber.subscriber_id,
+        **subscriber.merge_fields,
+        "lbrace": "{{",
+    }
+    return _MERGE_FIELD.sub(lambda m: values.get(m.group(1), m.group(0)), template)
+
+
+def _escape(text: str) -> str:
+    return text.replace("{{", _LITERAL_BRACES)
@@ -3,8 +3,14 @@ Resource Scheduler
 Allocates and manages resources (AI agents, compute) across workflows
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Deque, Mapping, Tuple
+from abc import ABC, abstractmethod
+from collections import deque, defaultdict
 from datetime import datetime
+from types import MappingProxyType
+import asyncio
+import threading
+import time
 from pydantic import BaseModel
 import structlog
 
@@ -22,33 +28,329 @@ class Resource(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
+class SchedulerStateBackend(ABC):
+    """
+    Storage for scheduler resources
+
+    Every method must be atomic with respect to other threads (and, for
+    shared backends, other processes). Allocation is a conditional
+    increment: it only succeeds if the resource still has free capacity
+    at the moment of the write.
+    """
+
+    @abstractmethod
+    def put(self, resource: Resource) -> None:
+        """
+        Insert a resource, or update an existing one's description
+
+        The load of an existing resource is kept: other schedulers may
+        hold allocations against it.
+        """
+
+    @abstractmethod
+    def remove(self, resource_id: str, only_if_idle: bool = False) -> Optional[Resource]:
+        """Delete a resource, optionally only when it has no load"""
+
+    @abstractmethod
+    def get(self, resource_id: str) -> Optional[Resource]:
+        """Read one resource"""
+
+    @abstractmethod
+    def snapshot(self) -> Dict[str, Resource]:
+        """Copies of all resources, read at one point in time"""
+
+    @abstractmethod
+    def try_acquire(self, resource_id: str) -> bool:
+        """Increment load if the resource is available and below capacity"""
+
+    @abstractmethod
+    def release(self, resource_id: str) -> bool:
+        """Decrement load, never below zero"""
+
+
+class InMemoryStateBackend(SchedulerStateBackend):
+    """Process-local state guarded by a lock, safe for thread pools"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resources: Dict[str, Resource] = {}
+
+    def put(self, resource: Resource) -> None:
+        stored = resource.model_copy(deep=True)
+        with self._lock:
+            existing = self._resources.get(resource.resource_id)
+            if existing is not None:
+                stored.current_load = existing.current_load
+            self._resources[resource.resource_id] = stored
+
+    def remove(self, resource_id: str, only_if_idle: bool = False) -> Optional[Resource]:
+        with self._lock:
+            resource = self._resources.get(resource_id)
+            if resource is None or (only_if_idle and resource.current_load > 0):
+                return None
+            return self._resources.pop(resource_id)
+
+    def get(self, resource_id: str) -> Optional[Resource]:
+        with self._lock:
+            resource = self._resources.get(resource_id)
+            return resource.model_copy(deep=True) if resource else None
+
+    def snapshot(self) -> Dict[str, Resource]:
+        with self._lock:
+            return {rid: resource.model_copy(deep=True) for rid, resource in self._resources.items()}
+
+    def try_acquire(self, resource_id: str) -> bool:
+        with self._lock:
+            resource = self._resources.get(resource_id)
+            if resource is None or not resource.available:
+                return False
+            if resource.current_load >= resource.capacity:
+                return False
+            resource.current_load += 1
+            return True
+
+    def release(self, resource_id: str) -> bool:
+        with self._lock:
+            resource = self._resources.get(resource_id)
+            if resource is None:
+                return False
+            resource.current_load = max(0, resource.current_load - 1)
+            return True
+
+
 class ResourceScheduler:
     """Manages resource allocation for workflow tasks"""
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        state: Optional[SchedulerStateBackend] = None,
+        wait_sample_window_seconds: float = 300.0,
+        poll_interval_seconds: float = 0.5,
+        recorder: Optional[Any] = None,
+    ):
         self.logger = logger.bind(component="resource_scheduler")
-        self.resources: Dict[str, Resource] = {}
-    
+        self.state = state or InMemoryStateBackend()
+        self.wait_sample_window_seconds = wait_sample_window_seconds
+        # Releases in other processes can't wake local waiters, so they poll
+        self.poll_interval_seconds = poll_interval_seconds
+        # Optional UtilizationRecorder that receives every wait sample
+        self.recorder = recorder
+
+        # Demand tracking used by the autoscaler
+        self._stats_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed = asyncio.Event()
+        self._waiting: Dict[str, int] = defaultdict(int)
+        self._wait_samples: Dict[str, Deque[Tuple[float, float]]] = defaultdict(deque)
+        self._wait_counts: Dict[str, int] = defaultdict(int)  # samples ever recorded
+
+    @property
+    def resources(self) -> Mapping[str, Resource]:
+        """
+        Point-in-time, read-only view of all registered resources
+
+        The Resource objects are copies: changing them does not affect
+        the scheduler. Use register_resource/unregister_resource and
+        allocate/release to change state.
+        """
+        return MappingProxyType(self.state.snapshot())
+
     async def register_resource(self, resource: Resource) -> None:
         """Register a new resource"""
-        self.resources[resource.resource_id] = resource
+        self.state.put(resource)
         self.logger.info("resource_registered", resource_id=resource.resource_id)
-    
+        self._notify()
+
+    async def unregister_resource(
+        self, resource_id: str, only_if_idle: bool = False
+    ) -> Optional[Resource]:
+        """
+        Remove a resource from the pool
+
+        Args:
+            resource_id: Resource to remove
+            only_if_idle: Atomically refuse if the resource has load
+
+        Returns:
+            The removed resource, or None if nothing was removed
+        """
+        resource = self.state.remove(resource_id, only_if_idle=only_if_idle)
+        if resource:
+            resource.available = False
+            if self.recorder is not None:
+                self.recorder.forget_resource(resource_id)
+            self.logger.info("resource_unregistered", resource_id=resource_id)
+        return resource
+
     async def allocate_resource(
         self, task_type: str, requirements: Dict[str, Any]
     ) -> Optional[str]:
         """Allocate a resource for a task"""
-        # Find available resource matching requirements
-        for resource in self.resources.values():
-            if (resource.available and 
-                resource.current_load < resource.capacity):
-                resource.current_load += 1
+        # Find available resource matching requirements, then claim it with
+        # a conditional increment; if another thread or process won the
+        # race for the last slot, move on to the next candidate
+        for resource in self.state.snapshot().values():
+            if not self.matches_requirements(resource, requirements):
+                continue
+            if (resource.available and
+                resource.current_load < resource.capacity and
+                self.state.try_acquire(resource.resource_id)):
                 self.logger.info("resource_allocated", resource_id=resource.resource_id)
                 return resource.resource_id
         return None
-    
+
+    async def acquire_resource(
+        self,
+        task_type: str,
+        requirements: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Allocate a resource, waiting until one frees up
+
+        Callers waiting here are counted as queued demand for their
+        resource_type, and their wait time is sampled on success.
+
+        Returns:
+            Allocated resource ID, or None if the timeout expired
+        """
+        self._loop = asyncio.get_running_loop()
+        resource_type = requirements.get("resource_type", "any")
+        started = time.monotonic()
+
+        resource_id = await self.allocate_resource(task_type, requirements)
+        if resource_id:
+            self._record_wait(resource_type, 0.0)
+            return resource_id
+
+        with self._stats_lock:
+            self._waiting[resource_type] += 1
+        try:
+            while True:
+                changed = self._changed
+                resource_id = await self.allocate_resource(task_type, requirements)
+                if resource_id:
+                    self._record_wait(resource_type, time.monotonic() - started)
+                    return resource_id
+
+                wait = self.poll_interval_seconds
+                if timeout is not None:
+                    remaining = timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        return None
+                    wait = min(wait, remaining)
+                try:
+                    await asyncio.wait_for(changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._stats_lock:
+                self._waiting[resource_type] -= 1
+
     async def release_resource(self, resource_id: str) -> None:
         """Release an allocated resource"""
-        if resource_id in self.resources:
-            self.resources[resource_id].current_load -= 1
+        if self.state.release(resource_id):
             self.logger.info("resource_released", resource_id=resource_id)
+            self._notify()
+
+    @staticmethod
+    def matches_requirements(resource: Resource, requirements: Dict[str, Any]) -> bool:
+        """
+        Check resource_type and the metadata keys named in requirements
+
+        Every key other than resource_type must be present in the
+        resource metadata with an equal value; a resource without the
+        key (e.g. no "model") does not match.
+        """
+        for key, value in requirements.items():
+            if key == "resource_type":
+                if resource.resource_type != value:
+                    return False
+            elif key not in resource.metadata or resource.metadata[key] != value:
+                return False
+        return True
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize each resource_type pool
+
+        Returns:
+            Mapping of resource_type to capacity, load, utilization,
+            queue depth, recent wait-time samples (seconds, oldest first)
+            and the running count of wait samples recorded
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        for resource in self.state.snapshot().values():
+            pool = stats.setdefault(
+                resource.resource_type,
+                {"resources": 0, "capacity": 0, "current_load": 0},
+            )
+            pool["resources"] += 1
+            if resource.available:
+                pool["capacity"] += resource.capacity
+                pool["current_load"] += resource.current_load
+
+        now = time.monotonic()
+        with self._stats_lock:
+            for resource_type in set(self._waiting) | set(self._wait_samples):
+                stats.setdefault(
+                    resource_type, {"resources": 0, "capacity": 0, "current_load": 0}
+                )
+
+            for resource_type, pool in stats.items():
+                pool["utilization"] = (
+                    pool["current_load"] / pool["capacity"] if pool["capacity"] else 0.0
+                )
+                pool["queue_depth"] = self._waiting.get(resource_type, 0)
+                pool["wait_samples"] = self._recent_waits(resource_type, now)
+                pool["wait_sample_count"] = self._wait_counts.get(resource_type, 0)
+
+        return stats
+
+    def _record_wait(self, resource_type: str, wait_seconds: float) -> None:
+        """Store a wait-time sample for a resource_type"""
+        now = time.monotonic()
+        with self._stats_lock:
+            samples = self._wait_samples[resource_type]
+            samples.append((now, wait_seconds))
+            self._drop_expired_waits(samples, now)
+            self._wait_counts[resource_type] += 1
+        if self.recorder is not None:
+            self.recorder.record_wait(resource_type, wait_seconds)
+
+    def wait_sample_count(self, resource_type: str) -> int:
+        """Number of wait samples recorded for a resource_type so far"""
+        with self._stats_lock:
+            return self._wait_counts.get(resource_type, 0)
+
+    def _recent_waits(self, resource_type: str, now: float) -> List[float]:
+        """Drop expired wait samples and return the rest"""
+        samples = self._wait_samples.get(resource_type)
+        if not samples:
+            return []
+        self._drop_expired_waits(samples, now)
+        return [wait for _, wait in samples]
+
+    def _drop_expired_waits(self, samples: Deque[Tuple[float, float]], now: float) -> None:
+        cutoff = now - self.wait_sample_window_seconds
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+
+    def _notify(self) -> None:
+        """Wake up callers waiting in acquire_resource, from any thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            same_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            same_loop = False
+        if same_loop:
+            self._wake()
+        else:
+            loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        """Release current waiters and arm a fresh event for the next ones"""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
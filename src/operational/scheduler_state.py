@@ -0,0 +1,131 @@
+"""
+Scheduler State
+SQLite-backed resource state shared by several orchestrator processes
+"""
+
+from typing import Dict, Optional
+import json
+import sqlite3
+import threading
+
+from src.operational.resource_scheduler import Resource, SchedulerStateBackend
+
+
+class SQLiteStateBackend(SchedulerStateBackend):
+    """
+    State shared through a local SQLite database
+
+    Several orchestrator processes pointing at the same file share one
+    resource pool. Allocation is a single conditional UPDATE, which
+    SQLite applies atomically across connections, so two processes can
+    never both take the last free slot.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resources (
+                resource_id TEXT PRIMARY KEY,
+                resource_type TEXT NOT NULL,
+                name TEXT NOT NULL,
+                capacity INTEGER NOT NULL,
+                current_load INTEGER NOT NULL DEFAULT 0,
+                available INTEGER NOT NULL DEFAULT 1,
+                metadata TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        """One autocommit connection per thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_resource(row: tuple) -> Resource:
+        resource_id, resource_type, name, capacity, current_load, available, metadata = row
+        return Resource(
+            resource_id=resource_id,
+            resource_type=resource_type,
+            name=name,
+            capacity=capacity,
+            current_load=current_load,
+            available=bool(available),
+            metadata=json.loads(metadata),
+        )
+
+    def put(self, resource: Resource) -> None:
+        self._conn().execute(
+            """
+            INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(resource_id) DO UPDATE SET
+                resource_type = excluded.resource_type,
+                name = excluded.name,
+                capacity = excluded.capacity,
+                available = excluded.available,
+                metadata = excluded.metadata
+            """,
+            (
+                resource.resource_id,
+                resource.resource_type,
+                resource.name,
+                resource.capacity,
+                resource.current_load,
+                int(resource.available),
+                json.dumps(resource.metadata, default=str),
+            ),
+        )
+
+    def remove(self, resource_id: str, only_if_idle: bool = False) -> Optional[Resource]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            resource = self.get(resource_id)
+            if resource is None or (only_if_idle and resource.current_load > 0):
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute("DELETE FROM resources WHERE resource_id = ?", (resource_id,))
+            conn.execute("COMMIT")
+            return resource
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, resource_id: str) -> Optional[Resource]:
+        row = self._conn().execute(
+            "SELECT * FROM resources WHERE resource_id = ?", (resource_id,)
+        ).fetchone()
+        return self._row_to_resource(row) if row else None
+
+    def snapshot(self) -> Dict[str, Resource]:
+        rows = self._conn().execute("SELECT * FROM resources ORDER BY rowid").fetchall()
+        return {row[0]: self._row_to_resource(row) for row in rows}
+
+    def try_acquire(self, resource_id: str) -> bool:
+        cursor = self._conn().execute(
+            """
+            UPDATE resources SET current_load = current_load + 1
+            WHERE resource_id = ? AND available = 1 AND current_load < capacity
+            """,
+            (resource_id,),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, resource_id: str) -> bool:
+        cursor = self._conn().execute(
+            """
+            UPDATE resources SET current_load = MAX(current_load - 1, 0)
+            WHERE resource_id = ?
+            """,
+            (resource_id,),
+        )
+        return cursor.rowcount == 1
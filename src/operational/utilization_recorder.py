@@ -0,0 +1,328 @@
+"""
+Utilization Recorder
+Keeps per-resource and per-pool utilization history in fixed-size ring buffers
+"""
+
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime
+import asyncio
+import math
+import threading
+import time
+import structlog
+from pydantic import BaseModel
+
+logger = structlog.get_logger()
+
+# name -> (bucket width in seconds, number of buckets kept)
+DEFAULT_RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "1s": (1, 600),  # last 10 minutes
+    "1m": (60, 1440),  # last 24 hours
+    "1h": (3600, 720),  # last 30 days
+}
+
+
+class SeriesPoint(BaseModel):
+    """One aggregated bucket of a time series"""
+    timestamp: datetime
+    avg: float
+    max: float
+    count: int
+
+
+class _RingSeries:
+    """
+    Fixed-size bucketed series at one resolution
+
+    Buckets are addressed by absolute bucket index modulo the ring size,
+    so recording is O(1) and stale buckets are reset lazily on reuse.
+    """
+
+    __slots__ = ("width", "size", "index", "total", "peak", "count", "last", "updated")
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.size = size
+        self.index = [-1] * size
+        self.total = [0.0] * size
+        self.peak = [0.0] * size
+        self.count = [0] * size
+        self.last = 0.0
+        self.updated = 0.0
+
+    def add(self, value: float, now: float) -> None:
+        bucket = int(now // self.width)
+        pos = bucket % self.size
+        if self.index[pos] != bucket:
+            self.index[pos] = bucket
+            self.total[pos] = 0.0
+            self.peak[pos] = value
+            self.count[pos] = 0
+        self.total[pos] += value
+        self.count[pos] += 1
+        if value > self.peak[pos]:
+            self.peak[pos] = value
+        self.last = value
+        self.updated = max(self.updated, now)
+
+    def points(self, since: float, now: float) -> List[SeriesPoint]:
+        first = max(int(since // self.width), int(now // self.width) - self.size + 1)
+        last = int(now // self.width)
+        points = []
+        for bucket in range(first, last + 1):
+            pos = bucket % self.size
+            if self.index[pos] != bucket or self.count[pos] == 0:
+                continue
+            points.append(
+                SeriesPoint(
+                    timestamp=datetime.utcfromtimestamp(bucket * self.width),
+                    avg=self.total[pos] / self.count[pos],
+                    max=self.peak[pos],
+                    count=self.count[pos],
+                )
+            )
+        return points
+
+
+class UtilizationRecorder:
+    """
+    Time-series history for ResourceScheduler pools:
+    - Samples per-resource and per-type utilization and queue length
+    - Records every wait time reported by the scheduler
+    - Answers range queries and saturation reports
+    - Exports the latest values in Prometheus text format
+    - Drops a resource's series when it is unregistered, and any series
+      not updated for `stale_after_seconds`, so churn (e.g. autoscaled
+      resources with fresh ids) does not grow memory without bound
+    """
+
+    METRICS = ("utilization", "queue_length", "wait_seconds")
+
+    def __init__(
+        self,
+        resolutions: Optional[Dict[str, Tuple[int, int]]] = None,
+        stale_after_seconds: float = 86400.0,
+    ):
+        self.resolutions = resolutions or DEFAULT_RESOLUTIONS
+        self.stale_after_seconds = stale_after_seconds
+        self.logger = logger.bind(component="utilization_recorder")
+        self._lock = threading.Lock()
+        # (scope, key, metric) -> resolution name -> ring
+        self._series: Dict[Tuple[str, str, str], Dict[str, _RingSeries]] = {}
+        self._resource_types: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(
+        self, scope: str, key: str, metric: str, value: float, now: Optional[float] = None
+    ) -> None:
+        """
+        Add one observation to every resolution
+
+        Args:
+            scope: "resource" or "type"
+            key: resource_id or resource_type
+            metric: utilization, queue_length or wait_seconds
+            value: Observed value
+            now: Unix timestamp (defaults to the current time)
+        """
+        now = time.time() if now is None else now
+        series_key = (scope, key, metric)
+        with self._lock:
+            rings = self._series.get(series_key)
+            if rings is None:
+                rings = {
+                    name: _RingSeries(width, size)
+                    for name, (width, size) in self.resolutions.items()
+                }
+                self._series[series_key] = rings
+            for ring in rings.values():
+                ring.add(value, now)
+
+    def record_wait(self, resource_type: str, wait_seconds: float) -> None:
+        """Record how long a caller waited for a resource of this type"""
+        self.record("type", resource_type, "wait_seconds", wait_seconds)
+
+    def sample(self, scheduler: Any, now: Optional[float] = None) -> None:
+        """Record current utilization and queue length from a scheduler"""
+        now = time.time() if now is None else now
+        for resource in scheduler.resources.values():
+            self._resource_types[resource.resource_id] = resource.resource_type
+            utilization = resource.current_load / resource.capacity if resource.capacity else 0.0
+            self.record("resource", resource.resource_id, "utilization", utilization, now)
+        for resource_type, pool in scheduler.get_pool_stats().items():
+            self.record("type", resource_type, "utilization", pool["utilization"], now)
+            self.record("type", resource_type, "queue_length", pool["queue_depth"], now)
+        self.prune(now)
+
+    def forget_resource(self, resource_id: str) -> None:
+        """Drop the per-resource series of a resource that left the pool"""
+        with self._lock:
+            for series_key in [k for k in self._series if k[0] == "resource" and k[1] == resource_id]:
+                del self._series[series_key]
+            self._resource_types.pop(resource_id, None)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Drop series with no observations for stale_after_seconds
+
+        Returns:
+            Number of series removed
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.stale_after_seconds
+        with self._lock:
+            stale = [k for k, rings in self._series.items() if next(iter(rings.values())).updated < cutoff]
+            for series_key in stale:
+                del self._series[series_key]
+            live = {key for scope, key, _ in self._series if scope == "resource"}
+            for resource_id in [r for r in self._resource_types if r not in live]:
+                del self._resource_types[resource_id]
+        return len(stale)
+
+    def query(
+        self,
+        metric: str,
+        key: str,
+        scope: str = "type",
+        resolution: str = "1m",
+        window_seconds: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> List[SeriesPoint]:
+        """
+        Read a series at one resolution
+
+        Args:
+            metric: utilization, queue_length or wait_seconds
+            key: resource_id or resource_type
+            scope: "resource" or "type"
+            resolution: One of the configured resolutions (1s, 1m, 1h)
+            window_seconds: How far back to look (defaults to the full ring)
+
+        Returns:
+            Non-empty buckets, oldest first
+        """
+        if resolution not in self.resolutions:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        now = time.time() if now is None else now
+        width, size = self.resolutions[resolution]
+        since = now - (window_seconds if window_seconds is not None else width * size)
+        with self._lock:
+            rings = self._series.get((scope, key, metric))
+            if rings is None:
+                return []
+            return rings[resolution].points(since, now)
+
+    def saturation_report(
+        self,
+        resolution: str = "1m",
+        window_seconds: float = 3600,
+        threshold: float = 0.9,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize how close each pool ran to its capacity
+
+        Returns:
+            Per resource_type: average and peak utilization, the share of
+            buckets at or above `threshold`, peak queue length and the
+            p95 of bucket-average wait times
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            types = sorted({key for scope, key, _ in self._series if scope == "type"})
+
+        report: Dict[str, Dict[str, Any]] = {}
+        for resource_type in types:
+            utilization = self.query("utilization", resource_type, "type", resolution, window_seconds, now)
+            queue = self.query("queue_length", resource_type, "type", resolution, window_seconds, now)
+            waits = self.query("wait_seconds", resource_type, "type", resolution, window_seconds, now)
+            report[resource_type] = {
+                "avg_utilization": _mean([p.avg for p in utilization]),
+                "peak_utilization": max((p.max for p in utilization), default=0.0),
+                "saturated_fraction": (
+                    sum(1 for p in utilization if p.max >= threshold) / len(utilization)
+                    if utilization
+                    else 0.0
+                ),
+                "peak_queue_length": max((p.max for p in queue), default=0.0),
+                "wait_p95_seconds": percentile([p.avg for p in waits], 0.95),
+                "buckets": len(utilization),
+            }
+        return report
+
+    def render_prometheus(self) -> str:
+        """Latest values in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            series = self._series
+            for metric in self.METRICS:
+                name = f"newsletter_pool_{metric}"
+                rows = [
+                    (key, rings)
+                    for (scope, key, m), rings in series.items()
+                    if scope == "type" and m == metric
+                ]
+                if rows:
+                    lines.append(f"# HELP {name} Latest {metric.replace('_', ' ')} per resource type")
+                    lines.append(f"# TYPE {name} gauge")
+                    for key, rings in sorted(rows):
+                        value = next(iter(rings.values())).last
+                        lines.append(f'{name}{{resource_type="{_escape(key)}"}} {value}')
+
+            rows = [
+                (key, rings)
+                for (scope, key, m), rings in series.items()
+                if scope == "resource" and m == "utilization"
+            ]
+            if rows:
+                lines.append("# HELP newsletter_resource_utilization Latest utilization per resource")
+                lines.append("# TYPE newsletter_resource_utilization gauge")
+                for key, rings in sorted(rows):
+                    value = next(iter(rings.values())).last
+                    resource_type = self._resource_types.get(key, "")
+                    lines.append(
+                        f'newsletter_resource_utilization{{resource_id="{_escape(key)}",'
+                        f'resource_type="{_escape(resource_type)}"}} {value}'
+                    )
+        return "\n".join(lines) + "\n"
+
+    async def start(self, scheduler: Any, interval_seconds: float = 1.0) -> None:
+        """Sample a scheduler in the background"""
+        if self._task and not self._task.done():
+            return
+
+        async def _loop() -> None:
+            while True:
+                try:
+                    self.sample(scheduler)
+                except Exception as e:
+                    self.logger.error("utilization_sample_failed", error=str(e))
+                await asyncio.sleep(interval_seconds)
+
+        self._task = asyncio.create_task(_loop())
+
+    async def stop(self) -> None:
+        """Stop background sampling"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a small sample"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -3,7 +3,7 @@ Workflow Engine
 Orchestrates multi-step content generation and distribution workflows
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from datetime import datetime
 from enum import Enum
 import asyncio
@@ -64,6 +64,13 @@ class Workflow(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+TaskHandler = Callable[[Workflow, WorkflowTask], Awaitable[Dict[str, Any]]]
+
+
+class TaskFailedError(Exception):
+    """Raised by a task handler for a failure that retrying would not fix"""
+
+
 class WorkflowEngine:
     """
     Orchestrates complex multi-step workflows:
@@ -76,6 +83,16 @@ class WorkflowEngine:
         self.logger = logger.bind(component="workflow_engine")
         self.workflows: Dict[str, Workflow] = {}
         self.running_workflows: set = set()
+        self.task_handlers: Dict[str, TaskHandler] = {}
+
+    def register_handler(self, task_type: str, handler: TaskHandler) -> None:
+        """
+        Dispatch tasks of `task_type` to a real implementation
+
+        Task types without a handler keep the simulated execution.
+        """
+        self.task_handlers[task_type] = handler
+        self.logger.info("task_handler_registered", task_type=task_type)
 
     async def create_workflow(
         self, workflow_type: str, topic_id: Optional[str] = None, **kwargs
@@ -270,6 +287,9 @@ class WorkflowEngine:
                 if not ready_tasks:
                     if failed_tasks:
                         # Some tasks failed and blocked downstream tasks
+                        for task in workflow.tasks:
+                            if task.status == TaskStatus.PENDING:
+                                task.status = TaskStatus.SKIPPED
                         break
                     # All tasks are either running or waiting
                     await asyncio.sleep(1)
@@ -345,15 +365,19 @@ class WorkflowEngine:
         )
         
         try:
-            # Simulate task execution (replace with actual implementation)
-            await asyncio.sleep(1)  # Simulate work
-            
-            # In production, this would dispatch to actual services/agents
-            result = {
-                "status": "success",
-                "task_type": task.task_type,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
+            handler = self.task_handlers.get(task.task_type)
+            if handler:
+                result = await handler(workflow, task)
+            else:
+                # Simulate task execution (replace with actual implementation)
+                await asyncio.sleep(1)  # Simulate work
+                
+                # In production, this would dispatch to actual services/agents
+                result = {
+                    "status": "success",
+                    "task_type": task.task_type,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
             
             task.status = TaskStatus.COMPLETED
             task.completed_at = datetime.utcnow()
@@ -366,7 +390,7 @@ class WorkflowEngine:
             task.completed_at = datetime.utcnow()
             
             # Retry logic
-            if task.retry_count < task.max_retries:
+            if task.retry_count < task.max_retries and not isinstance(e, TaskFailedError):
                 task.retry_count += 1
                 task.status = TaskStatus.PENDING
                 self.logger.warning(
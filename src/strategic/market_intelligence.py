@@ -3,14 +3,40 @@ Market Intelligence Engine
 Scans market trends, identifies opportunities, and provides strategic insights
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, AsyncIterator, Set, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 import asyncio
+import re
+import time
+import numpy as np
 import structlog
 from pydantic import BaseModel, Field
 
+from .scan_state import SourceHealth, SourceWatermark, WatermarkStore
+from .online_clustering import OnlineTopicClusterer
+from .signal_dedup import NearDuplicateIndex
+from .topic_clustering import TopicClusterer
+from .trend_engine import TrendEngine
+from .source_fetchers import FetchPool, SourceFetcher, SourceItem, default_fetchers
+
 logger = structlog.get_logger()
 
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9+#.-]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "how", "in",
+    "into", "is", "it", "its", "new", "of", "on", "or", "that", "the", "this", "to", "was",
+    "what", "when", "why", "will", "with", "you", "your",
+}
+_POSITIVE = {
+    "launch", "launches", "growth", "grows", "record", "breakthrough", "wins", "raises", "funding",
+    "improves", "boost", "surge", "success", "best", "faster", "opens", "expands",
+}
+_NEGATIVE = {
+    "layoffs", "lawsuit", "breach", "fails", "failure", "decline", "drops", "ban", "bans", "outage",
+    "risk", "warns", "fraud", "cuts", "loss", "losses", "slump", "crisis",
+}
+
 
 class MarketSignal(BaseModel):
     """Market signal detected from scanning"""
@@ -36,6 +62,23 @@ class TopicOpportunity(BaseModel):
     supporting_signals: List[MarketSignal]
     recommended_action: str  # create, monitor, ignore
     reasoning: str
+    cluster_id: Optional[str] = None  # stable id of the signal cluster
+
+
+class MarketScanResult(BaseModel):
+    """Outcome of one incremental market scan"""
+    signals: List[MarketSignal] = Field(default_factory=list)
+    new: int = 0
+    updated: int = 0
+    skipped: int = 0
+    duplicates: int = 0  # merged into a signal from another source
+    sources: Dict[str, Dict[str, int]] = Field(default_factory=dict)  # per-source counts
+    sources_used: List[str] = Field(default_factory=list)
+    sources_skipped: List[str] = Field(default_factory=list)  # not configured or circuit open
+    sources_timed_out: List[str] = Field(default_factory=list)  # partial results kept
+    sources_failed: List[str] = Field(default_factory=list)
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    duration_seconds: float = 0.0
 
 
 class MarketIntelligenceEngine:
@@ -47,10 +90,24 @@ class MarketIntelligenceEngine:
     - Competitive landscape changes
     """
 
+    TRENDED_SIGNAL_LIMIT = 100_000
+
     def __init__(
         self,
         scan_interval_hours: int = 24,
         enabled_sources: Optional[List[str]] = None,
+        fetchers: Optional[Dict[str, SourceFetcher]] = None,
+        fetch_pool: Optional[FetchPool] = None,
+        watermarks: Optional[WatermarkStore] = None,
+        source_timeout_seconds: float = 30.0,
+        source_timeouts: Optional[Dict[str, float]] = None,
+        failure_threshold: int = 3,
+        breaker_cooldown_seconds: float = 900.0,
+        dedup_index: Optional[NearDuplicateIndex] = None,
+        topic_clusterer: Optional[TopicClusterer] = None,
+        online_clusterer: Optional[OnlineTopicClusterer] = None,
+        trend_engine: Optional[TrendEngine] = None,
+        trend_resolution: str = "day",
     ):
         self.scan_interval_hours = scan_interval_hours
         self.enabled_sources = enabled_sources or [
@@ -59,6 +116,29 @@ class MarketIntelligenceEngine:
             "hackernews",
             "rss_feeds",
         ]
+        self.fetchers = fetchers if fetchers is not None else default_fetchers()
+        # One connection pool and validator cache shared by every source
+        self.fetch_pool = fetch_pool or FetchPool()
+        # Per-source cursors, so each scan only processes new content
+        self.watermarks = watermarks or WatermarkStore()
+        # Deadlines bound a scan by the slowest allowed source, not the slowest source
+        self.source_timeout_seconds = source_timeout_seconds
+        self.source_timeouts = source_timeouts or {}
+        # Circuit breakers skip sources that keep failing until a probe succeeds
+        self.failure_threshold = failure_threshold
+        self.breaker_cooldown_seconds = breaker_cooldown_seconds
+        self.source_health: Dict[str, SourceHealth] = {}
+        # The same story from several sources becomes one signal
+        self.dedup_index = dedup_index or NearDuplicateIndex()
+        # Similar topics ("AI in Healthcare", "Healthcare AI") form one cluster
+        self.topic_clusterer = topic_clusterer or TopicClusterer()
+        # Optional persistent clusters: per-scan cost depends only on new signals
+        self.online_clusterer = online_clusterer
+        # Signal time series per cluster; growth trends come from these
+        self.trend_engine = trend_engine or TrendEngine()
+        self.trend_resolution = trend_resolution
+        # Signals already in the trend series, so re-analysing a scan does not count them twice
+        self._trended: "OrderedDict[str, None]" = OrderedDict()
         self.logger = logger.bind(component="market_intelligence")
 
     async def scan_market(self) -> List[MarketSignal]:
@@ -66,103 +146,213 @@ class MarketIntelligenceEngine:
         Perform comprehensive market scan across all enabled sources
         
         Returns:
-            List of detected market signals
+            List of market signals new or updated since the last scan
+        """
+        return (await self.run_scan()).signals
+
+    async def run_scan(self) -> MarketScanResult:
+        """
+        Scan every enabled source from its watermark onwards
+
+        Returns:
+            MarketScanResult with the new/updated signals and
+            new, updated and skipped counts overall and per source
         """
         self.logger.info("starting_market_scan", sources=self.enabled_sources)
-        
-        # Run all scanners in parallel
-        scan_tasks = []
-        if "news_api" in self.enabled_sources:
-            scan_tasks.append(self._scan_news_api())
-        if "reddit" in self.enabled_sources:
-            scan_tasks.append(self._scan_reddit())
-        if "hackernews" in self.enabled_sources:
-            scan_tasks.append(self._scan_hackernews())
-        if "rss_feeds" in self.enabled_sources:
-            scan_tasks.append(self._scan_rss_feeds())
-
-        results = await asyncio.gather(*scan_tasks, return_exceptions=True)
-        
-        # Flatten and filter signals
-        signals = []
-        for result in results:
-            if isinstance(result, list):
-                signals.extend(result)
-            elif isinstance(result, Exception):
-                self.logger.error("scan_failed", error=str(result))
-        
+        started = time.monotonic()
+        result = MarketScanResult(started_at=datetime.utcnow())
+
+        async for batch in self.stream_scan(result):
+            result.signals.extend(batch)
+
+        result.duration_seconds = time.monotonic() - started
         self.logger.info(
             "market_scan_completed",
-            total_signals=len(signals),
-            sources=self.enabled_sources,
+            total_signals=len(result.signals),
+            new=result.new,
+            updated=result.updated,
+            skipped=result.skipped,
+            duplicates=result.duplicates,
+            sources_used=result.sources_used,
+            sources_skipped=result.sources_skipped,
+            sources_timed_out=result.sources_timed_out,
+            sources_failed=result.sources_failed,
+            fetch_stats=self.fetch_pool.metrics(),
         )
-        
-        return signals
+        return result
 
-    async def _scan_news_api(self) -> List[MarketSignal]:
-        """Scan news sources for trending topics"""
-        self.logger.debug("scanning_news_api")
-        
-        # TODO: Implement actual News API integration
-        # For now, return mock data
-        return [
-            MarketSignal(
-                signal_id="news_001",
-                signal_type="trend",
-                source="news_api",
-                topic="AI in Healthcare",
-                keywords=["AI", "healthcare", "medical", "diagnosis"],
-                sentiment=0.7,
-                relevance_score=0.85,
-                metadata={"article_count": 42, "growth_rate": "15%"},
-            )
-        ]
+    async def stream_scan(
+        self, result: Optional[MarketScanResult] = None, max_buffered_batches: int = 16
+    ) -> AsyncIterator[List[MarketSignal]]:
+        """
+        Scan all enabled sources, yielding signal batches as they arrive
 
-    async def _scan_reddit(self) -> List[MarketSignal]:
-        """Scan Reddit for emerging discussions"""
-        self.logger.debug("scanning_reddit")
-        
-        # TODO: Implement Reddit API integration
-        return [
-            MarketSignal(
-                signal_id="reddit_001",
-                signal_type="opportunity",
-                source="reddit",
-                topic="AI Tools for Product Managers",
-                keywords=["AI", "product management", "tools", "automation"],
-                sentiment=0.6,
-                relevance_score=0.78,
-                metadata={"upvotes": 1250, "comment_count": 180},
+        Each source runs concurrently and pushes a batch per page into a
+        bounded queue, so fast sources are not held back by slow ones and
+        producers pause while the consumer is behind. A batch's items are
+        recorded in the watermark when it is handed to the consumer, so
+        stopping early leaves unread items for the next scan.
+
+        A source past its deadline is cut off, keeping the batches it has
+        already delivered; sources with an open circuit are skipped.
+
+        Args:
+            result: Optional MarketScanResult receiving the counts
+            max_buffered_batches: Batches held before producers wait
+        """
+        result = result if result is not None else MarketScanResult()
+        reported: Set[str] = set()  # signal ids yielded by this scan
+        queue: "asyncio.Queue[Optional[Tuple[str, List[SourceItem], List[MarketSignal]]]]" = asyncio.Queue(
+            maxsize=max_buffered_batches
+        )
+
+        async def produce(source: str) -> None:
+            health = self.source_health.setdefault(source, SourceHealth(source=source))
+            error = None
+            if source not in self.fetchers:
+                self.logger.debug("source_not_configured", source=source)
+                outcome = "skipped"
+            elif not health.allow(time.monotonic()):
+                self.logger.info("source_circuit_open", source=source, last_error=health.last_error)
+                outcome = "skipped"
+            else:
+                timeout = self.source_timeouts.get(source, self.source_timeout_seconds)
+                try:
+                    await self._scan_source(source, queue, result, timeout, reported)
+                    outcome = "used"
+                except asyncio.TimeoutError:
+                    outcome, error = "timed_out", f"no complete result within {timeout}s"
+                    self.logger.warning("scan_timed_out", source=source, timeout_seconds=timeout)
+                except Exception as e:
+                    outcome, error = "failed", str(e)
+                    self.logger.error("scan_failed", source=source, error=error)
+            was_open = health.state == "open"
+            health.record(
+                outcome, time.monotonic(), self.failure_threshold, self.breaker_cooldown_seconds, error
             )
-        ]
+            if health.state == "open" and not was_open:
+                self.logger.warning(
+                    "source_circuit_opened",
+                    source=source,
+                    consecutive_failures=health.consecutive_failures,
+                    cooldown_seconds=self.breaker_cooldown_seconds,
+                )
+            getattr(result, f"sources_{outcome}").append(source)
+            await queue.put(None)  # this source is done
 
-    async def _scan_hackernews(self) -> List[MarketSignal]:
-        """Scan Hacker News for tech trends"""
-        self.logger.debug("scanning_hackernews")
-        
-        # TODO: Implement Hacker News API integration
-        return [
-            MarketSignal(
-                signal_id="hn_001",
-                signal_type="trend",
-                source="hackernews",
-                topic="Cloud Cost Optimization",
-                keywords=["cloud", "cost", "optimization", "finops"],
-                sentiment=0.5,
-                relevance_score=0.72,
-                metadata={"points": 320, "comments": 145},
+        tasks = [asyncio.create_task(produce(source)) for source in self.enabled_sources]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                batch = await queue.get()
+                if batch is None:
+                    remaining -= 1
+                    continue
+                source, items, signals = batch
+                self.watermarks.advance(source, items)
+                yield signals
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.watermarks.save()
+
+    async def _scan_source(
+        self,
+        source: str,
+        queue: "asyncio.Queue[Any]",
+        result: MarketScanResult,
+        timeout: float,
+        reported: Set[str],
+    ) -> None:
+        """
+        Fetch a source past its watermark and queue the fresh items page by page
+
+        Raises asyncio.TimeoutError once the source has spent `timeout`
+        seconds fetching; time spent waiting on a full queue is not counted.
+        """
+        counts = result.sources.setdefault(source, {"new": 0, "updated": 0, "skipped": 0})
+        watermark = self.watermarks.get(source)
+        pages = self.fetchers[source].pages(
+            self.fetch_pool, since=watermark.cursor, seen_ids=watermark.seen.keys()
+        )
+        budget = timeout
+        try:
+            while True:
+                if budget <= 0:
+                    raise asyncio.TimeoutError()
+                started = time.monotonic()
+                try:
+                    page = await asyncio.wait_for(pages.__anext__(), budget)
+                except StopAsyncIteration:
+                    break
+                budget -= time.monotonic() - started
+                await self._queue_page(source, page, watermark, counts, queue, result, reported)
+        finally:
+            await pages.aclose()
+
+    async def _queue_page(
+        self,
+        source: str,
+        page: List[SourceItem],
+        watermark: SourceWatermark,
+        counts: Dict[str, int],
+        queue: "asyncio.Queue[Any]",
+        result: MarketScanResult,
+        reported: Set[str],
+    ) -> None:
+        """
+        Classify one page against the watermark and queue its fresh, distinct items
+
+        A duplicate of a story first reported by an earlier scan is merged
+        into that signal, which is queued again so the story still shows
+        up in this scan.
+        """
+        fresh = []
+        for item in page:
+            status = watermark.classify(item)
+            counts[status] += 1
+            setattr(result, status, getattr(result, status) + 1)
+            if status != "skipped":
+                fresh.append(item)
+        signals = []
+        for item in fresh:
+            signal = self._item_to_signal(item)
+            canonical, similarity = self.dedup_index.match_or_add(
+                f"{signal.topic} {' '.join(signal.keywords)}", signal
             )
-        ]
+            if similarity is None or canonical.signal_id == signal.signal_id:
+                signals.append(signal)  # new story, or an edit of one already reported
+                reported.add(signal.signal_id)
+                continue
+            _merge_duplicate(canonical, signal, similarity)
+            result.duplicates += 1
+            if canonical.signal_id not in reported:
+                signals.append(canonical)
+                reported.add(canonical.signal_id)
+        if fresh:
+            await queue.put((source, fresh, signals))
 
-    async def _scan_rss_feeds(self) -> List[MarketSignal]:
-        """Scan RSS feeds from curated sources"""
-        self.logger.debug("scanning_rss_feeds")
-        
-        # TODO: Implement RSS feed parsing
-        return []
+    def _item_to_signal(self, item: SourceItem) -> MarketSignal:
+        """Turn a fetched item into a MarketSignal"""
+        text = f"{item.title} {item.summary}"
+        return MarketSignal(
+            signal_id=f"{item.source}_{item.item_id}",
+            signal_type="opportunity" if item.source == "reddit" else "trend",
+            source=item.source,
+            topic=item.title,
+            keywords=_extract_keywords(f"{item.title} {' '.join(item.tags)}"),
+            sentiment=_estimate_sentiment(text),
+            relevance_score=item.relevance_score,
+            metadata={
+                "url": item.url,
+                "published_at": item.published_at.isoformat() if item.published_at else None,
+                **item.engagement,
+            },
+        )
 
     async def identify_opportunities(
-        self, signals: List[MarketSignal], existing_topics: List[str]
+        self, signals: List[MarketSignal], existing_topics: List[str], limit: Optional[int] = None
     ) -> List[TopicOpportunity]:
         """
         Analyze signals to identify new topic opportunities
@@ -170,6 +360,7 @@ class MarketIntelligenceEngine:
         Args:
             signals: Market signals from scanning
             existing_topics: List of currently covered topics
+            limit: Keep only the best `limit` opportunities
             
         Returns:
             List of identified opportunities with recommendations
@@ -182,71 +373,168 @@ class MarketIntelligenceEngine:
         
         # Group signals by topic
         topic_clusters = self._cluster_signals_by_topic(signals)
-        
-        # Evaluate each cluster
+        return await self._rank_opportunities(topic_clusters, existing_topics, limit)
+
+    async def identify_opportunities_stream(
+        self,
+        batches: AsyncIterator[List[MarketSignal]],
+        existing_topics: List[str],
+        limit: Optional[int] = None,
+    ) -> List[TopicOpportunity]:
+        """
+        identify_opportunities over signal batches, e.g. from stream_scan
+
+        With an online clusterer each batch is assigned to the persistent
+        clusters as it arrives; otherwise batches are collected and
+        clustered once the stream ends.
+        """
+        if self.online_clusterer is None:
+            signals: List[MarketSignal] = []
+            async for batch in batches:
+                signals.extend(batch)
+            return await self.identify_opportunities(signals, existing_topics, limit)
+
+        groups: Dict[str, List[MarketSignal]] = {}
+        signal_count = 0
+        async for batch in batches:
+            self._assign_online(groups, batch)
+            signal_count += len(batch)
+        self.logger.info(
+            "analyzing_opportunities",
+            signal_count=signal_count,
+            existing_topic_count=len(existing_topics),
+        )
+        return await self._rank_opportunities(self._online_clusters(groups), existing_topics, limit)
+
+    async def _rank_opportunities(
+        self,
+        topic_clusters: Dict[str, Tuple[str, List[MarketSignal]]],
+        existing_topics: List[str],
+        limit: Optional[int] = None,
+    ) -> List[TopicOpportunity]:
+        """
+        Score every cluster at once and keep the viable opportunities, best first
+
+        Clusters are plain (label, signals) groups keyed by cluster id and
+        are scored with array operations; trend labels and TopicOpportunity
+        objects are produced only for the clusters that pass the confidence
+        cut (and the top `limit`, if given).
+        """
+        covered = set(existing_topics)
+        candidates = [
+            (cluster_id, label, signals)
+            for cluster_id, (label, signals) in topic_clusters.items()
+            if label not in covered
+        ]
+        strength, confidence = _score_clusters([signals for _, _, signals in candidates])
+        ranked = np.minimum(confidence, 1.0)  # the score reported on TopicOpportunity
+        
+        # Rank by confidence score; ties keep cluster order
+        viable = np.flatnonzero(ranked >= 0.6)
+        if limit is not None and len(viable) > limit:
+            viable = viable[np.argpartition(-ranked[viable], max(limit - 1, 0))[:limit]]
+        viable = viable[np.lexsort((viable, -ranked[viable]))]
+        
+        self._record_trends(topic_clusters)
+        selected = viable.tolist()
+        growth_trends = self.trend_engine.labels(
+            [candidates[i][0] for i in selected], self.trend_resolution
+        )
         opportunities = []
-        for topic, cluster_signals in topic_clusters.items():
-            if topic in existing_topics:
-                continue  # Skip topics we already cover
-            
-            opportunity = await self._evaluate_topic_opportunity(
-                topic, cluster_signals
-            )
-            
-            if opportunity.confidence_score >= 0.6:
-                opportunities.append(opportunity)
-        
-        # Rank by confidence score
-        opportunities.sort(key=lambda x: x.confidence_score, reverse=True)
+        for i, growth_trend in zip(selected, growth_trends):
+            cluster_id, label, signals = candidates[i]
+            opportunities.append(self._build_opportunity(
+                label, signals, float(strength[i]), float(confidence[i]), growth_trend, cluster_id
+            ))
         
         self.logger.info(
             "opportunities_identified",
             count=len(opportunities),
-            high_confidence=len([o for o in opportunities if o.confidence_score >= 0.8]),
+            high_confidence=int((ranked[viable] >= 0.8).sum()),
+            clusters_scored=len(candidates),
         )
         
         return opportunities
 
     def _cluster_signals_by_topic(
         self, signals: List[MarketSignal]
-    ) -> Dict[str, List[MarketSignal]]:
-        """Group signals by related topics"""
-        clusters: Dict[str, List[MarketSignal]] = {}
-        
+    ) -> Dict[str, Tuple[str, List[MarketSignal]]]:
+        """Group signals by related topics: stable cluster id -> (label, signals)"""
+        if self.online_clusterer is not None:
+            groups: Dict[str, List[MarketSignal]] = {}
+            self._assign_online(groups, signals)
+            return self._online_clusters(groups)
+
+        clusters = self.topic_clusterer.cluster(
+            [f"{s.topic} {' '.join(s.keywords)}" for s in signals],
+            labels=[s.topic for s in signals],
+        )
+        return {c.cluster_id: (c.label, [signals[i] for i in c.members]) for c in clusters}
+
+    def _assign_online(self, groups: Dict[str, List[MarketSignal]], signals: List[MarketSignal]) -> None:
+        """Assign signals to persistent clusters, O(clusters sharing a term) each"""
         for signal in signals:
-            topic = signal.topic
-            if topic not in clusters:
-                clusters[topic] = []
-            clusters[topic].append(signal)
-        
+            cluster_id = self.online_clusterer.assign(
+                f"{signal.topic} {' '.join(signal.keywords)}", label=signal.topic
+            )
+            groups.setdefault(cluster_id, []).append(signal)
+
+    def _online_clusters(
+        self, groups: Dict[str, List[MarketSignal]]
+    ) -> Dict[str, Tuple[str, List[MarketSignal]]]:
+        """(label, signals) per assigned cluster, following merges made meanwhile"""
+        online = self.online_clusterer
+        clusters: Dict[str, Tuple[str, List[MarketSignal]]] = {}
+        for cluster_id, signals in groups.items():
+            current = online.resolve(cluster_id)
+            if current in clusters:
+                clusters[current][1].extend(signals)
+            else:
+                clusters[current] = (online.centroids[current].label, list(signals))
+        online.save()
         return clusters
 
+    def _record_trends(self, topic_clusters: Dict[str, Tuple[str, List[MarketSignal]]]) -> None:
+        """
+        Add signals not seen before to the trend series of their cluster
+
+        Every cluster is recorded, ranked or not, so a topic that only
+        later makes the cut still has its history.
+        """
+        topic_ids: List[str] = []
+        fresh: List[MarketSignal] = []
+        for cluster_id, (_, signals) in topic_clusters.items():
+            new = [s for s in signals if s.signal_id not in self._trended]
+            topic_ids.extend([cluster_id] * len(new))
+            fresh.extend(new)
+            self._trended.update(dict.fromkeys(s.signal_id for s in new))
+        while len(self._trended) > self.TRENDED_SIGNAL_LIMIT:
+            self._trended.popitem(last=False)
+        self.trend_engine.record(
+            topic_ids, [_signal_timestamp(s) for s in fresh], [s.sentiment for s in fresh]
+        )
+
     async def _evaluate_topic_opportunity(
-        self, topic: str, signals: List[MarketSignal]
+        self, topic: str, signals: List[MarketSignal], growth_trend: str = "stable"
     ) -> TopicOpportunity:
         """Evaluate a topic cluster to determine if it's a viable opportunity"""
-        
-        # Calculate aggregate metrics
-        avg_sentiment = sum(s.sentiment for s in signals) / len(signals)
-        avg_relevance = sum(s.relevance_score for s in signals) / len(signals)
-        signal_strength = len(signals) / 10.0  # Normalize by expected signal count
-        
-        # Determine growth trend (simplified logic)
-        if signal_strength > 0.8:
-            growth_trend = "emerging"
-        elif signal_strength > 0.5:
-            growth_trend = "growing"
-        else:
-            growth_trend = "stable"
+        strength, confidence = _score_clusters([signals])
+        return self._build_opportunity(topic, signals, float(strength[0]), float(confidence[0]), growth_trend)
+
+    def _build_opportunity(
+        self,
+        topic: str,
+        signals: List[MarketSignal],
+        signal_strength: float,
+        confidence_score: float,
+        growth_trend: str,
+        cluster_id: Optional[str] = None,
+    ) -> TopicOpportunity:
+        """TopicOpportunity for a scored signal cluster"""
         
         # Estimate market size (simplified)
         market_size_estimate = int(signal_strength * 10000)
         
-        # Calculate confidence score
-        confidence_score = (avg_relevance * 0.5) + (signal_strength * 0.3) + (
-            (avg_sentiment + 1) / 2 * 0.2  # Normalize sentiment to 0-1
-        )
-        
         # Determine recommendation
         if confidence_score >= 0.8:
             recommended_action = "create"
@@ -268,6 +556,7 @@ class MarketIntelligenceEngine:
             supporting_signals=signals,
             recommended_action=recommended_action,
             reasoning=reasoning,
+            cluster_id=cluster_id,
         )
 
     def _infer_audience(self, signals: List[MarketSignal]) -> List[str]:
@@ -352,3 +641,79 @@ class MarketIntelligenceEngine:
         )
         
         return min(health, 1.0)
+
+
+def _score_clusters(clusters: List[List[MarketSignal]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Signal strength and (uncapped) confidence of every cluster, computed together"""
+    sizes = np.fromiter((len(signals) for signals in clusters), dtype=np.int64, count=len(clusters))
+    total = int(sizes.sum())
+    owners = np.repeat(np.arange(len(clusters)), sizes)
+    sentiment = np.fromiter((s.sentiment for signals in clusters for s in signals), dtype=float, count=total)
+    relevance = np.fromiter((s.relevance_score for signals in clusters for s in signals), dtype=float, count=total)
+    
+    counts = np.maximum(sizes, 1)
+    avg_sentiment = np.bincount(owners, weights=sentiment, minlength=len(clusters)) / counts
+    avg_relevance = np.bincount(owners, weights=relevance, minlength=len(clusters)) / counts
+    signal_strength = sizes / 10.0  # Normalize by expected signal count
+    
+    confidence = (avg_relevance * 0.5) + (signal_strength * 0.3) + (
+        (avg_sentiment + 1) / 2 * 0.2  # Normalize sentiment to 0-1
+    )
+    return signal_strength, confidence
+
+
+def _merge_duplicate(canonical: MarketSignal, duplicate: MarketSignal, similarity: float) -> None:
+    """Fold a near-duplicate into the signal first reporting the story"""
+    metadata = canonical.metadata
+    provenance = metadata.setdefault(
+        "provenance",
+        [{"source": canonical.source, "signal_id": canonical.signal_id, "url": metadata.get("url")}],
+    )
+    count = len(provenance)
+    provenance.append({
+        "source": duplicate.source,
+        "signal_id": duplicate.signal_id,
+        "url": duplicate.metadata.get("url"),
+        "similarity": round(similarity, 3),
+    })
+    metadata["sources"] = sorted({p["source"] for p in provenance})
+    canonical.relevance_score = max(canonical.relevance_score, duplicate.relevance_score)
+    canonical.sentiment = (canonical.sentiment * count + duplicate.sentiment) / (count + 1)
+    canonical.keywords = canonical.keywords + [k for k in duplicate.keywords if k not in canonical.keywords]
+
+
+def _extract_keywords(text: str, limit: int = 8) -> List[str]:
+    """Distinct non-stopword terms, in order of appearance"""
+    keywords: List[str] = []
+    for word in _WORD.findall(text):
+        word = word.strip(".-")
+        if len(word) < 2 or word.lower() in _STOPWORDS or word in keywords:
+            continue
+        keywords.append(word)
+        if len(keywords) == limit:
+            break
+    return keywords
+
+
+def _estimate_sentiment(text: str) -> float:
+    """Lexicon polarity in [-1, 1]; 0 when no sentiment words appear"""
+    words = [w.lower() for w in _WORD.findall(text)]
+    positive = sum(w in _POSITIVE for w in words)
+    negative = sum(w in _NEGATIVE for w in words)
+    if not positive and not negative:
+        return 0.0
+    return (positive - negative) / (positive + negative)
+
+
+def _signal_timestamp(signal: MarketSignal) -> float:
+    """Unix time a signal was published, falling back to when it was detected"""
+    published = signal.metadata.get("published_at")
+    moment = signal.detected_at
+    if published:
+        try:
+            moment = datetime.fromisoformat(published)
+        except (TypeError, ValueError):
+            pass
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)  # detected_at is naive UTC
+    return moment.timestamp()
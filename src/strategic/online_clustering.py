@@ -0,0 +1,440 @@
+"""
+Online Topic Clustering
+Incremental assignment of signals to persistent topic centroids
+"""
+
+from typing import Dict, Any, Optional, List, Set, Tuple
+from collections import Counter
+from datetime import datetime, timedelta
+import hashlib
+import math
+import sqlite3
+import numpy as np
+import structlog
+from pydantic import BaseModel, Field
+
+from .topic_clustering import TfidfVectorizer
+
+logger = structlog.get_logger()
+
+SparseVector = Dict[int, float]
+
+
+class MemberSample(BaseModel):
+    """A recent member kept for relabelling and splits"""
+    label: str
+    vector: SparseVector
+
+
+class TopicCentroid(BaseModel):
+    """Running state of one online cluster"""
+    cluster_id: str
+    label: str
+    label_score: float = 0.0
+    count: int = 0
+    total: SparseVector = Field(default_factory=dict)  # sum of member vectors
+    norm2: float = 0.0  # squared norm of total
+    sample: List[MemberSample] = Field(default_factory=list)  # recent members
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @property
+    def cohesion(self) -> float:
+        """Norm of the mean member vector: 1 when identical, near 0 when unrelated"""
+        return math.sqrt(self.norm2) / self.count if self.count else 0.0
+
+
+class OnlineTopicClusterer:
+    """
+    Topic clusters that persist across scans:
+    - Each signal is assigned to the most similar centroid through an
+      inverted index of centroid terms, so cost depends on clusters
+      sharing its terms (at most k), not on history size
+    - Below `threshold` the signal founds a new cluster
+    - Every `maintenance_interval` assignments, clusters whose centroids
+      converge are merged, incoherent ones are split in two and clusters
+      idle for `idle_ttl_seconds` expire with their aliases and terms
+    - State (vocabulary, document frequencies, centroids, merged-id
+      aliases) is kept in a SQLite file at `path`; save() only writes
+      what changed since the previous save
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = 0.45,
+        merge_threshold: float = 0.8,
+        split_cohesion: float = 0.4,
+        min_split_size: int = 8,
+        sample_size: int = 32,
+        maintenance_interval: int = 1000,
+        top_terms: int = 3,
+        idle_ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        compact_fraction: float = 0.25,
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.merge_threshold = merge_threshold
+        self.split_cohesion = split_cohesion
+        self.min_split_size = min_split_size
+        self.sample_size = sample_size
+        self.maintenance_interval = maintenance_interval
+        self.top_terms = top_terms
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.compact_fraction = compact_fraction
+        self.vectorizer = TfidfVectorizer()
+        self.document_frequency: Counter = Counter()
+        self.documents = 0
+        self.centroids: Dict[str, TopicCentroid] = {}
+        self.aliases: Dict[str, str] = {}  # merged cluster id -> surviving id
+        self._postings: Dict[int, Dict[str, float]] = {}  # column -> cluster -> weight
+        self._since_maintenance = 0
+        self._stats = {"assigned": 0, "created": 0, "merged": 0, "split": 0, "expired": 0}
+        # Changes since the last save
+        self._dirty: Set[str] = set()  # cluster ids written or deleted
+        self._dirty_columns: Set[int] = set()
+        self._dirty_aliases: Set[str] = set()
+        self._rewrite = False  # columns were renumbered
+        self.logger = logger.bind(component="online_clustering")
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+            self._load()
+
+    def assign(self, text: str, label: Optional[str] = None) -> str:
+        """
+        Add one document and return the id of its cluster
+
+        Args:
+            text: Text to vectorize (e.g. topic plus keywords)
+            label: Label candidate for the cluster; defaults to the text
+        """
+        label = label if label is not None else text
+        vector = self._vectorize(text)
+        cluster_id, similarity = self._nearest(vector)
+        if cluster_id is None or similarity < self.threshold:
+            cluster_id = "topic_" + hashlib.sha1(f"{label}|{self.documents}".encode()).hexdigest()[:12]
+            self.centroids[cluster_id] = TopicCentroid(cluster_id=cluster_id, label=label)
+            self._dirty.add(cluster_id)
+            self._stats["created"] += 1
+            similarity = 1.0
+        self._add(self.centroids[cluster_id], vector, label, similarity)
+        self._stats["assigned"] += 1
+        self._since_maintenance += 1
+        if self._since_maintenance >= self.maintenance_interval:
+            self.maintain()
+        return cluster_id
+
+    def resolve(self, cluster_id: str) -> str:
+        """Current id of a cluster that may since have been merged"""
+        while cluster_id in self.aliases:
+            cluster_id = self.aliases[cluster_id]
+        return cluster_id
+
+    def terms(self, cluster_id: str) -> List[str]:
+        centroid = self.centroids[self.resolve(cluster_id)]
+        top = sorted(centroid.total.items(), key=lambda kv: -kv[1])[: self.top_terms]
+        return [self.vectorizer.vocabulary[col] for col, _ in top]
+
+    def maintain(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Merge converged clusters, split incoherent ones and expire idle ones"""
+        self._since_maintenance = 0
+        merged = self._merge_converged()
+        split = self._split_incoherent()
+        expired = self.expire(now)
+        if merged or split or expired:
+            self.logger.info(
+                "clusters_maintained",
+                merged=merged,
+                split=split,
+                expired=expired,
+                clusters=len(self.centroids),
+            )
+        return {"merged": merged, "split": split, "expired": expired}
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop clusters not updated for idle_ttl_seconds, with their aliases
+
+        Once a `compact_fraction` of the vocabulary is used by no remaining
+        cluster, the vocabulary is renumbered without those terms.
+        """
+        if self.idle_ttl_seconds is None:
+            return 0
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=self.idle_ttl_seconds)
+        idle = [c for c in self.centroids.values() if c.updated_at < cutoff]
+        for centroid in idle:
+            self._unindex(centroid)
+            del self.centroids[centroid.cluster_id]
+            self._dirty.add(centroid.cluster_id)
+        if idle:
+            gone = {c.cluster_id for c in idle}
+            for alias in [a for a in self.aliases if self.resolve(a) in gone]:
+                del self.aliases[alias]
+                self._dirty_aliases.add(alias)
+            self._stats["expired"] += len(idle)
+            self._compact()
+        return len(idle)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self._stats, "clusters": len(self.centroids), "vocabulary": len(self.vectorizer.vocabulary)}
+
+    def save(self) -> None:
+        """Write the changes since the previous save in one transaction"""
+        conn = self._conn
+        if conn is None:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._rewrite:
+                for table in ("vocabulary", "centroids", "aliases"):
+                    conn.execute(f"DELETE FROM {table}")
+                self._dirty.update(self.centroids)
+                self._dirty_columns = set(range(len(self.vectorizer.vocabulary)))
+                self._dirty_aliases.update(self.aliases)
+            conn.executemany(
+                "INSERT OR REPLACE INTO vocabulary VALUES (?, ?, ?)",
+                [
+                    (col, self.vectorizer.vocabulary[col], self.document_frequency[col])
+                    for col in self._dirty_columns
+                ],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO centroids VALUES (?, ?)",
+                [
+                    (cid, self.centroids[cid].model_dump_json())
+                    for cid in self._dirty
+                    if cid in self.centroids
+                ],
+            )
+            conn.executemany(
+                "DELETE FROM centroids WHERE cluster_id = ?",
+                [(cid,) for cid in self._dirty if cid not in self.centroids],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO aliases VALUES (?, ?)",
+                [(a, self.aliases[a]) for a in self._dirty_aliases if a in self.aliases],
+            )
+            conn.executemany(
+                "DELETE FROM aliases WHERE cluster_id = ?",
+                [(a,) for a in self._dirty_aliases if a not in self.aliases],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('documents', ?)", (self.documents,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._dirty.clear()
+        self._dirty_columns.clear()
+        self._dirty_aliases.clear()
+        self._rewrite = False
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _load(self) -> None:
+        conn = self._conn
+        for col, token, df in conn.execute("SELECT col, token, df FROM vocabulary ORDER BY col"):
+            self.vectorizer.column(token)
+            if df:
+                self.document_frequency[col] = df
+        row = conn.execute("SELECT value FROM meta WHERE key = 'documents'").fetchone()
+        self.documents = row[0] if row else 0
+        self.aliases = dict(conn.execute("SELECT cluster_id, target FROM aliases"))
+        for (data,) in conn.execute("SELECT data FROM centroids"):
+            centroid = TopicCentroid.model_validate_json(data)
+            self.centroids[centroid.cluster_id] = centroid
+            self._index(centroid)
+
+    def _compact(self) -> None:
+        """Renumber the vocabulary to the terms still used by a cluster, if enough are unused"""
+        live: Set[int] = set()
+        for centroid in self.centroids.values():
+            live.update(centroid.total)
+            for member in centroid.sample:
+                live.update(member.vector)
+        vocabulary = self.vectorizer.vocabulary
+        if len(vocabulary) - len(live) < self.compact_fraction * len(vocabulary):
+            return
+        vectorizer = TfidfVectorizer()
+        mapping = {col: vectorizer.column(vocabulary[col]) for col in sorted(live)}
+        self.document_frequency = Counter(
+            {mapping[col]: df for col, df in self.document_frequency.items() if col in mapping}
+        )
+        for centroid in self.centroids.values():
+            centroid.total = {mapping[col]: w for col, w in centroid.total.items()}
+            for member in centroid.sample:
+                member.vector = {mapping[col]: w for col, w in member.vector.items()}
+        self.vectorizer = vectorizer
+        self._postings = {}
+        for centroid in self.centroids.values():
+            self._index(centroid)
+        self._rewrite = True
+        self.logger.info("vocabulary_compacted", dropped=len(vocabulary) - len(live), kept=len(live))
+
+    def _vectorize(self, text: str) -> SparseVector:
+        """TF-IDF vector with IDF over every document seen so far"""
+        counts = Counter(self.vectorizer.column(t) for t in self.vectorizer.tokens(text))
+        self.documents += 1
+        self.document_frequency.update(counts.keys())
+        self._dirty_columns.update(counts.keys())
+        vector = {
+            col: (1.0 + math.log(tf)) * (math.log((1.0 + self.documents) / (1.0 + self.document_frequency[col])) + 1.0)
+            for col, tf in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {col: w / norm for col, w in vector.items()} if norm else {}
+
+    def _nearest(self, vector: SparseVector) -> Tuple[Optional[str], float]:
+        scores: Dict[str, float] = {}
+        for col, weight in vector.items():
+            for cluster_id, total in self._postings.get(col, {}).items():
+                scores[cluster_id] = scores.get(cluster_id, 0.0) + weight * total
+        best, best_similarity = None, 0.0
+        for cluster_id, dot in scores.items():
+            similarity = dot / math.sqrt(self.centroids[cluster_id].norm2)
+            if similarity > best_similarity:
+                best, best_similarity = cluster_id, similarity
+        return best, best_similarity
+
+    def _add(self, centroid: TopicCentroid, vector: SparseVector, label: str, similarity: float) -> None:
+        dot = _dot(vector, centroid.total)
+        centroid.norm2 += 2 * dot + sum(w * w for w in vector.values())
+        self._apply(centroid, vector)
+        centroid.count += 1
+        self._dirty.add(centroid.cluster_id)
+        centroid.sample = (centroid.sample + [MemberSample(label=label, vector=vector)])[-self.sample_size:]
+        centroid.updated_at = datetime.utcnow()
+        if similarity > centroid.label_score:
+            centroid.label, centroid.label_score = label, similarity
+
+    def _apply(self, centroid: TopicCentroid, vector: SparseVector, sign: float = 1.0) -> None:
+        """Add (or subtract) a vector to the centroid total, keeping postings in step"""
+        for col, weight in vector.items():
+            value = centroid.total.get(col, 0.0) + sign * weight
+            if value > 1e-9:
+                centroid.total[col] = value
+                self._postings.setdefault(col, {})[centroid.cluster_id] = value
+            else:
+                centroid.total.pop(col, None)
+                self._postings.get(col, {}).pop(centroid.cluster_id, None)
+
+    def _index(self, centroid: TopicCentroid) -> None:
+        for col, value in centroid.total.items():
+            self._postings.setdefault(col, {})[centroid.cluster_id] = value
+
+    def _unindex(self, centroid: TopicCentroid) -> None:
+        for col in centroid.total:
+            self._postings.get(col, {}).pop(centroid.cluster_id, None)
+
+    def _merge_converged(self) -> int:
+        merged = 0
+        for cluster_id in sorted(self.centroids, key=lambda c: -self.centroids[c].count):
+            centroid = self.centroids.get(cluster_id)
+            if centroid is None or not centroid.norm2:
+                continue
+            # Candidates share one of this centroid's strongest terms
+            top = sorted(centroid.total.items(), key=lambda kv: -kv[1])[: self.top_terms]
+            candidates = {c for col, _ in top for c in self._postings.get(col, {}) if c != cluster_id}
+            for other_id in candidates:
+                other = self.centroids[other_id]
+                dot = _dot(centroid.total, other.total)
+                if dot / math.sqrt(centroid.norm2 * other.norm2) < self.merge_threshold:
+                    continue
+                keep, drop = (centroid, other) if centroid.count >= other.count else (other, centroid)
+                self._merge(keep, drop, dot)
+                merged += 1
+                if drop is centroid:
+                    break
+        self._stats["merged"] += merged
+        return merged
+
+    def _merge(self, keep: TopicCentroid, drop: TopicCentroid, dot: float) -> None:
+        self._unindex(drop)
+        self._apply(keep, drop.total)
+        keep.norm2 += 2 * dot + drop.norm2
+        keep.count += drop.count
+        keep.sample = (keep.sample + drop.sample)[-self.sample_size:]
+        keep.updated_at = max(keep.updated_at, drop.updated_at)
+        del self.centroids[drop.cluster_id]
+        self.aliases[drop.cluster_id] = keep.cluster_id
+        self._dirty.update((keep.cluster_id, drop.cluster_id))
+        self._dirty_aliases.add(drop.cluster_id)
+
+    def _split_incoherent(self) -> int:
+        split = 0
+        for centroid in list(self.centroids.values()):
+            if centroid.count < 2 * self.min_split_size or centroid.cohesion >= self.split_cohesion:
+                continue
+            if len(centroid.sample) < 2 * (self.min_split_size // 2):
+                continue
+            moved = _two_means([member.vector for member in centroid.sample])
+            if len(moved) < self.min_split_size // 2 or len(moved) == len(centroid.sample):
+                continue
+            self._split(centroid, set(moved))
+            split += 1
+        self._stats["split"] += split
+        return split
+
+    def _split(self, parent: TopicCentroid, moved: Set[int]) -> None:
+        """Move the sampled members at `moved` into a new cluster"""
+        child_id = "topic_" + hashlib.sha1(f"{parent.cluster_id}|split|{self.documents}".encode()).hexdigest()[:12]
+        child = TopicCentroid(cluster_id=child_id, label=parent.label)
+        self.centroids[child_id] = child
+        for index in sorted(moved):
+            member = parent.sample[index]
+            self._apply(parent, member.vector, sign=-1.0)
+            self._add(child, member.vector, member.label, 0.0)
+        parent.count -= len(moved)
+        parent.sample = [m for i, m in enumerate(parent.sample) if i not in moved]
+        parent.norm2 = sum(w * w for w in parent.total.values())
+        self._dirty.add(parent.cluster_id)
+        for centroid in (parent, child):
+            self._relabel(centroid)
+
+    def _relabel(self, centroid: TopicCentroid) -> None:
+        """Label a centroid with its sampled member closest to the centre"""
+        scores = [_dot(member.vector, centroid.total) for member in centroid.sample]
+        best = int(np.argmax(scores))
+        centroid.label = centroid.sample[best].label
+        centroid.label_score = scores[best] / (math.sqrt(centroid.norm2) or 1.0)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS vocabulary (col INTEGER PRIMARY KEY, token TEXT NOT NULL, df INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS centroids (cluster_id TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS aliases (cluster_id TEXT PRIMARY KEY, target TEXT NOT NULL);
+"""
+
+
+def _dot(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(col, 0.0) for col, weight in a.items())
+
+
+def _two_means(vectors: List[SparseVector], iterations: int = 5) -> List[int]:
+    """Indices of the smaller side of a 2-means split of sparse unit vectors"""
+    columns = sorted({col for v in vectors for col in v})
+    position = {col: i for i, col in enumerate(columns)}
+    dense = np.zeros((len(vectors), len(columns)))
+    for row, vector in enumerate(vectors):
+        for col, weight in vector.items():
+            dense[row, position[col]] = weight
+    mean = dense.mean(axis=0)
+    first = int(np.argmin(dense @ mean))  # least typical member
+    second = int(np.argmin(dense @ dense[first]))  # most unlike it
+    centers = dense[[first, second]]
+    assignment = np.zeros(len(vectors), dtype=int)
+    for _ in range(iterations):
+        assignment = np.argmax(dense @ centers.T, axis=1)
+        for side in (0, 1):
+            if (assignment == side).any():
+                centers[side] = dense[assignment == side].mean(axis=0)
+    smaller = int(np.bincount(assignment, minlength=2).argmin())
+    return [int(i) for i in np.flatnonzero(assignment == smaller)]
@@ -0,0 +1,149 @@
+"""
+Scan State
+Per-source watermarks and health kept between market scans
+"""
+
+from typing import Dict, Optional, List
+from collections import OrderedDict
+from datetime import datetime, timezone
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import structlog
+from pydantic import BaseModel, Field
+
+from .source_fetchers import SourceItem
+
+logger = structlog.get_logger()
+
+
+class SourceWatermark(BaseModel):
+    """How far a source has been read"""
+    source: str
+    cursor: Optional[datetime] = None  # newest published_at seen
+    seen: Dict[str, str] = Field(default_factory=dict)  # item_id -> content digest, oldest first
+    updated_at: Optional[datetime] = None
+
+    def classify(self, item: SourceItem) -> str:
+        """new, updated or skipped relative to this watermark"""
+        digest = item_digest(item)
+        previous = self.seen.get(item.item_id)
+        if previous is not None:
+            return "skipped" if previous == digest else "updated"
+        if self.cursor and item.published_at and _aware(item.published_at) < self.cursor:
+            return "skipped"  # older than the watermark and no longer tracked
+        return "new"
+
+
+class WatermarkStore:
+    """
+    Watermarks for every source:
+    - Kept in memory, and in a JSON file when `path` is given
+    - Each source remembers its newest timestamp plus digests of the last
+      `max_tracked` items, so edits to recent items count as updates
+    """
+
+    def __init__(self, path: Optional[str] = None, max_tracked: int = 5000):
+        self.path = path
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._watermarks: Dict[str, SourceWatermark] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for source, data in json.load(f).items():
+                    self._watermarks[source] = SourceWatermark.model_validate(data)
+
+    def get(self, source: str) -> SourceWatermark:
+        with self._lock:
+            return self._watermarks.get(source, SourceWatermark(source=source)).model_copy(deep=True)
+
+    def advance(self, source: str, items: List[SourceItem]) -> SourceWatermark:
+        """Record items as processed and move the cursor forward"""
+        with self._lock:
+            current = self._watermarks.get(source, SourceWatermark(source=source))
+            seen = OrderedDict(current.seen)
+            cursor = current.cursor
+            for item in items:
+                seen.pop(item.item_id, None)
+                seen[item.item_id] = item_digest(item)
+                if item.published_at is not None:
+                    published = _aware(item.published_at)
+                    cursor = published if cursor is None else max(cursor, published)
+            while len(seen) > self.max_tracked:
+                seen.popitem(last=False)
+            watermark = SourceWatermark(
+                source=source, cursor=cursor, seen=dict(seen), updated_at=datetime.now(timezone.utc)
+            )
+            self._watermarks[source] = watermark
+            return watermark
+
+    def save(self) -> None:
+        """Write all watermarks atomically"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {s: w.model_dump(mode="json") for s, w in self._watermarks.items()}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+class SourceHealth(BaseModel):
+    """
+    Circuit breaker and outcome history of one source:
+    - closed: scanned normally
+    - open: skipped until retry_at after failure_threshold failures in a row
+    - half_open: the next scan is a probe; success closes, failure reopens
+    """
+    source: str
+    state: str = "closed"
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    last_error: Optional[str] = None
+    retry_at: float = 0.0  # monotonic time an open breaker may probe again
+    history: List[str] = Field(default_factory=list)  # recent outcomes, oldest first
+
+    def allow(self, now: float) -> bool:
+        """Whether the source should be scanned now"""
+        if self.state == "open" and now >= self.retry_at:
+            self.state = "half_open"
+        return self.state != "open"
+
+    def record(
+        self,
+        outcome: str,
+        now: float,
+        failure_threshold: int,
+        cooldown_seconds: float,
+        error: Optional[str] = None,
+        max_history: int = 50,
+    ) -> None:
+        """Apply one scan outcome: used, skipped, timed_out or failed"""
+        self.history = (self.history + [outcome])[-max_history:]
+        if outcome == "used":
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.state = "closed"
+        elif outcome in ("timed_out", "failed"):
+            self.failures += 1
+            self.timeouts += outcome == "timed_out"
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.state == "half_open" or self.consecutive_failures >= failure_threshold:
+                self.state = "open"
+                self.retry_at = now + cooldown_seconds
+
+
+def item_digest(item: SourceItem) -> str:
+    """Digest of the item content that matters for newsletters"""
+    return hashlib.sha1(f"{item.title}\n{item.summary}\n{item.url or ''}".encode()).hexdigest()[:16]
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
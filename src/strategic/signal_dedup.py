@@ -0,0 +1,152 @@
+"""
+Signal Deduplication
+MinHash/LSH detection of the same story reported by several sources
+"""
+
+from typing import Dict, Any, Optional, List, Set, Tuple
+from collections import OrderedDict
+import re
+import time
+import zlib
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_MERSENNE = np.uint64((1 << 31) - 1)
+
+
+class MinHasher:
+    """
+    MinHash signatures over character shingles:
+    - Text is lowercased and tokenized; tokens are sorted so word order
+      ("Healthcare AI" / "AI in Healthcare") does not matter
+    - Each padded token contributes its character `shingle_size`-grams
+    - Matching signature positions estimate Jaccard similarity
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 4, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        # a * crc32 + b stays below 2**63, so the universal hash never overflows
+        self.a = rng.integers(1, int(_MERSENNE), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_MERSENNE), num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def shingles(self, text: str) -> Set[str]:
+        n = self.shingle_size
+        found: Set[str] = set()
+        for token in sorted(set(_TOKEN.findall(text.lower()))):
+            padded = f"^{token}$"
+            found.update(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+        return found
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MERSENNE, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((np.outer(hashes, self.a) + self.b) % _MERSENNE).min(axis=0)
+
+
+class NearDuplicateIndex:
+    """
+    Banded LSH over MinHash signatures:
+    - Signatures are split into `bands`; entries sharing any band bucket
+      are candidates, verified by estimated Jaccard >= threshold
+    - Insert and lookup cost depends on bucket sizes, not index size
+    - Holds at most `max_entries` added within the last `ttl_seconds`,
+      evicting the oldest, so a story only merges with recent coverage
+    - Entries carry an arbitrary payload returned on a match
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 4,
+        max_entries: int = 50_000,
+        ttl_seconds: Optional[float] = 3 * 24 * 3600,
+        seed: int = 0,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size, seed=seed)
+        # entry id -> (signature, band keys, payload, added at), oldest first
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, List[bytes], Any, float]]" = OrderedDict()
+        self._buckets: Dict[bytes, List[int]] = {}
+        self._next_id = 0
+        self._stats = {"lookups": 0, "duplicates": 0, "candidates_checked": 0, "evicted": 0}
+
+    def match_or_add(
+        self, text: str, payload: Any, now: Optional[float] = None
+    ) -> Tuple[Any, Optional[float]]:
+        """
+        Find a near-duplicate of `text`, or index it with `payload`
+
+        Returns:
+            (matched payload, similarity) for a duplicate,
+            (payload, None) when the text was added as a new entry
+        """
+        now = time.time() if now is None else now
+        if self.ttl_seconds is not None:
+            while self._entries and next(iter(self._entries.values()))[3] <= now - self.ttl_seconds:
+                self._evict_oldest()
+        signature = self.hasher.signature(text)
+        keys = self._band_keys(signature)
+        match = self._best_match(signature, keys)
+        self._stats["lookups"] += 1
+        if match is not None:
+            self._stats["duplicates"] += 1
+            return match
+        self._insert(signature, keys, payload, now)
+        return payload, None
+
+    def metrics(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["entries"] = len(self._entries)
+        stats["buckets"] = len(self._buckets)
+        lookups = stats["lookups"]
+        stats["duplicate_rate"] = stats["duplicates"] / lookups if lookups else 0.0
+        stats["avg_candidates"] = stats["candidates_checked"] / lookups if lookups else 0.0
+        return stats
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [bytes([band]) + rows.tobytes() for band, rows in enumerate(np.split(signature, self.bands))]
+
+    def _best_match(self, signature: np.ndarray, keys: List[bytes]) -> Optional[Tuple[Any, float]]:
+        candidates = {entry_id for key in keys for entry_id in self._buckets.get(key, ())}
+        if not candidates:
+            return None
+        self._stats["candidates_checked"] += len(candidates)
+        ids = list(candidates)
+        stacked = np.stack([self._entries[i][0] for i in ids])
+        similarities = (stacked == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._entries[ids[best]][2], float(similarities[best])
+
+    def _insert(self, signature: np.ndarray, keys: List[bytes], payload: Any, now: float) -> None:
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (signature, keys, payload, now)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(entry_id)
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        old_id, (_, old_keys, _, _) = self._entries.popitem(last=False)
+        for key in old_keys:
+            bucket = self._buckets[key]
+            bucket.remove(old_id)
+            if not bucket:
+                del self._buckets[key]
+        self._stats["evicted"] += 1
@@ -0,0 +1,534 @@
+"""
+Source Fetchers
+Pooled, conditional-GET fetchers for news, Reddit, Hacker News and RSS sources
+"""
+
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable, Collection, Tuple
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import copy
+import json
+import math
+import os
+import feedparser
+import httpx
+import structlog
+from pydantic import BaseModel, Field
+
+from src.common.two_tier_cache import TwoTierCache
+
+logger = structlog.get_logger()
+
+Parser = Callable[[httpx.Response], Any]
+
+
+class SourceItem(BaseModel):
+    """One story/post/entry as fetched from a source"""
+    source: str
+    item_id: str
+    title: str
+    url: Optional[str] = None
+    summary: str = ""
+    published_at: Optional[datetime] = None
+    relevance_score: float = Field(default=0.5, ge=0.0, le=1.0)
+    engagement: Dict[str, float] = Field(default_factory=dict)
+    tags: List[str] = Field(default_factory=list)
+
+
+class FetchResponse(BaseModel):
+    """Parsed payload of a conditional GET"""
+    url: str
+    payload: Any = None
+    not_modified: bool = False
+    status_code: int = 200
+
+
+class ValidatorCache:
+    """
+    ETag / Last-Modified validators plus the parsed payload per URL:
+    - A 304 answer is served from the stored payload, skipping the
+      download and the parse
+    - Kept in memory, or in a SQLite file when `path` is given
+    - Bounded: URLs not fetched for ttl_seconds expire, and both tiers
+      evict the least recently fetched URLs past max_entries
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self._entries = TwoTierCache(
+            "validator_entries",
+            encode=lambda entry: json.dumps(entry, default=str),
+            decode=lambda encoded: tuple(json.loads(encoded)),
+            path=path,
+            memory_entries=max_entries,
+            disk_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+    def get(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Any]]:
+        """(etag, last_modified, payload) for a URL, if cached and not expired"""
+        return self._entries.get(url)
+
+    def set(self, url: str, etag: Optional[str], last_modified: Optional[str], payload: Any) -> None:
+        self._entries.set(url, (etag, last_modified, payload))
+
+    def touch(self, url: str) -> None:
+        """Mark a URL as fetched now (a 304 confirmed its validators)"""
+        self._entries.touch(url)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        self._entries.close()
+
+
+class FetchPool:
+    """
+    One shared HTTP client for every source:
+    - Keep-alive connections bounded by max_connections
+    - A semaphore per source caps its concurrent requests
+    - GETs are conditional when the ValidatorCache has validators
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ValidatorCache] = None,
+        max_connections: int = 50,
+        source_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 4,
+        timeout_seconds: float = 15.0,
+        user_agent: str = "ai-newsletter-platform/0.1",
+    ):
+        self.client = client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": user_agent},
+        )
+        self.cache = cache if cache is not None else ValidatorCache()
+        self.source_concurrency = source_concurrency or {}
+        self.default_concurrency = default_concurrency
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.logger = logger.bind(component="fetch_pool")
+
+    async def fetch(
+        self,
+        source: str,
+        url: str,
+        parse: Parser,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> FetchResponse:
+        """
+        GET `url` for `source`, parsing the body only when it changed
+
+        Raises:
+            httpx.HTTPError: On transport failures and non-2xx/304 answers
+        """
+        key = str(httpx.URL(url, params=params))
+        cached = self.cache.get(key)
+        request_headers = dict(headers or {})
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        stats = self._stats.setdefault(
+            source, {"requests": 0, "not_modified": 0, "downloaded_bytes": 0, "errors": 0}
+        )
+        async with self._semaphore(source):
+            stats["requests"] += 1
+            try:
+                response = await self.client.get(key, headers=request_headers)
+                if response.status_code == 304 and cached is not None:
+                    stats["not_modified"] += 1
+                    self.cache.touch(key)
+                    # Callers own the payload they get back; the cached one must stay intact
+                    payload = copy.deepcopy(cached[2])
+                    return FetchResponse(url=key, payload=payload, not_modified=True, status_code=304)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                stats["errors"] += 1
+                raise
+
+        stats["downloaded_bytes"] += len(response.content)
+        payload = parse(response)
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if etag or last_modified:
+            self.cache.set(key, etag, last_modified, copy.deepcopy(payload))
+        return FetchResponse(url=key, payload=payload, status_code=response.status_code)
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """Requests, 304s, bytes downloaded and errors per source"""
+        return {source: dict(stats) for source, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        self.cache.close()
+
+    def _semaphore(self, source: str) -> asyncio.Semaphore:
+        if source not in self._semaphores:
+            self._semaphores[source] = asyncio.Semaphore(
+                self.source_concurrency.get(source, self.default_concurrency)
+            )
+        return self._semaphores[source]
+
+
+class SourceFetcher(ABC):
+    """Fetches the current items of one market source"""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def fetch(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> List[SourceItem]:
+        """
+        Current items, newest first where the source orders them
+
+        Args:
+            pool: Shared FetchPool
+            since: Watermark timestamp; sources that can filter server-side
+                only return newer items
+            seen_ids: Items already processed, which need not be fetched
+                again where a source costs one request per item
+        """
+
+    async def pages(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> AsyncIterator[List[SourceItem]]:
+        """
+        Items in batches, each yielded as soon as it has been fetched
+
+        Sources made of several requests override this so callers can
+        start on the first batch while the rest are still in flight.
+        """
+        yield await self.fetch(pool, since=since, seen_ids=seen_ids)
+
+
+class NewsAPIFetcher(SourceFetcher):
+    """newsapi.org top headlines for a query"""
+
+    name = "news_api"
+
+    def __init__(
+        self,
+        api_key: str,
+        query: str = "technology OR artificial intelligence",
+        base_url: str = "https://newsapi.org/v2",
+        page_size: int = 50,
+    ):
+        self.api_key = api_key
+        self.query = query
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+
+    async def fetch(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> List[SourceItem]:
+        # No server-side "from": a URL that changes every scan would
+        # never be answered with a 304, so `since` is applied here
+        response = await pool.fetch(
+            self.name,
+            f"{self.base_url}/everything",
+            lambda r: r.json().get("articles", []),
+            params={"q": self.query, "pageSize": self.page_size, "sortBy": "publishedAt"},
+            headers={"X-Api-Key": self.api_key},
+        )
+        items = [
+            SourceItem(
+                source=self.name,
+                item_id=article.get("url") or article.get("title", ""),
+                title=article.get("title") or "",
+                url=article.get("url"),
+                summary=article.get("description") or "",
+                published_at=_parse_datetime(article.get("publishedAt")),
+                relevance_score=0.6,
+                tags=[(article.get("source") or {}).get("name", "")] if article.get("source") else [],
+            )
+            for article in response.payload or []
+            if article.get("title")
+        ]
+        if since is None:
+            return items
+        since = _aware(since)
+        return [i for i in items if i.published_at is None or _aware(i.published_at) >= since]
+
+
+class RedditFetcher(SourceFetcher):
+    """Hot posts of a set of subreddits"""
+
+    name = "reddit"
+
+    def __init__(
+        self,
+        subreddits: Optional[List[str]] = None,
+        base_url: str = "https://www.reddit.com",
+        limit: int = 50,
+    ):
+        self.subreddits = subreddits or ["technology", "artificial", "MachineLearning"]
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+
+    async def fetch(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> List[SourceItem]:
+        return [item async for page in self.pages(pool, since, seen_ids) for item in page]
+
+    async def pages(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> AsyncIterator[List[SourceItem]]:
+        """One batch per subreddit, in completion order; failed subreddits are logged and skipped"""
+        tasks = [asyncio.ensure_future(self._fetch_subreddit(pool, subreddit)) for subreddit in self.subreddits]
+        try:
+            for next_response in asyncio.as_completed(tasks):
+                subreddit, response = await next_response
+                if isinstance(response, Exception):
+                    logger.warning("reddit_subreddit_failed", subreddit=subreddit, error=str(response))
+                    continue
+                yield [self._to_item(post) for post in response.payload or []]
+        finally:
+            _cancel(tasks)
+
+    async def _fetch_subreddit(self, pool: FetchPool, subreddit: str) -> Tuple[str, Any]:
+        """(subreddit, response or the exception it failed with)"""
+        try:
+            response = await pool.fetch(
+                self.name,
+                f"{self.base_url}/r/{subreddit}/hot.json",
+                lambda r: [child.get("data", {}) for child in r.json()["data"]["children"]],
+                params={"limit": self.limit},
+            )
+        except Exception as e:
+            return subreddit, e
+        return subreddit, response
+
+    def _to_item(self, post: Dict[str, Any]) -> SourceItem:
+        ups = float(post.get("ups", 0))
+        return SourceItem(
+            source=self.name,
+            item_id=str(post.get("id") or post.get("name")),
+            title=post.get("title", ""),
+            url=post.get("url"),
+            summary=(post.get("selftext") or "")[:500],
+            published_at=_from_timestamp(post.get("created_utc")),
+            relevance_score=_engagement_score(ups, 5000),
+            engagement={"upvotes": ups, "comments": float(post.get("num_comments", 0))},
+            tags=[post.get("subreddit", "")],
+        )
+
+
+class HackerNewsFetcher(SourceFetcher):
+    """Top stories from the Hacker News Firebase API"""
+
+    name = "hackernews"
+
+    def __init__(
+        self,
+        base_url: str = "https://hacker-news.firebaseio.com/v0",
+        limit: int = 30,
+        page_size: int = 10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+        self.page_size = page_size
+
+    async def fetch(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> List[SourceItem]:
+        return [item async for page in self.pages(pool, since, seen_ids) for item in page]
+
+    async def pages(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> AsyncIterator[List[SourceItem]]:
+        """Stories in batches of `page_size`, in completion order"""
+        top = await pool.fetch(self.name, f"{self.base_url}/topstories.json", lambda r: r.json())
+        seen = set(seen_ids)
+        ids = [i for i in (top.payload or [])[: self.limit] if str(i) not in seen]
+        # The per-source semaphore bounds these item requests
+        tasks = [
+            asyncio.ensure_future(pool.fetch(self.name, f"{self.base_url}/item/{i}.json", lambda r: r.json()))
+            for i in ids
+        ]
+        page: List[SourceItem] = []
+        try:
+            for next_story in asyncio.as_completed(tasks):
+                try:
+                    story = await next_story
+                except Exception:
+                    continue
+                item = self._to_item(story.payload)
+                if item is not None:
+                    page.append(item)
+                if len(page) >= self.page_size:
+                    yield page
+                    page = []
+            if page:
+                yield page
+        finally:
+            _cancel(tasks)
+
+    def _to_item(self, data: Any) -> Optional[SourceItem]:
+        if not data or data.get("type") != "story" or not data.get("title"):
+            return None
+        points = float(data.get("score", 0))
+        return SourceItem(
+            source=self.name,
+            item_id=str(data["id"]),
+            title=data["title"],
+            url=data.get("url"),
+            published_at=_from_timestamp(data.get("time")),
+            relevance_score=_engagement_score(points, 500),
+            engagement={"points": points, "comments": float(data.get("descendants", 0))},
+        )
+
+
+class RSSFetcher(SourceFetcher):
+    """Entries of curated RSS/Atom feeds"""
+
+    name = "rss_feeds"
+
+    def __init__(self, feed_urls: List[str]):
+        self.feed_urls = feed_urls
+
+    async def fetch(
+        self,
+        pool: FetchPool,
+        since: Optional[datetime] = None,
+        seen_ids: Collection[str] = (),
+    ) -> List[SourceItem]:
+        responses = await asyncio.gather(
+            *(pool.fetch(self.name, url, _parse_feed) for url in self.feed_urls),
+            return_exceptions=True,
+        )
+        items = []
+        for url, response in zip(self.feed_urls, responses):
+            if isinstance(response, Exception):
+                logger.warning("rss_feed_failed", url=url, error=str(response))
+                continue
+            for entry in response.payload or []:
+                items.append(
+                    SourceItem(
+                        source=self.name,
+                        item_id=entry["id"],
+                        title=entry["title"],
+                        url=entry.get("link"),
+                        summary=entry.get("summary", "")[:500],
+                        published_at=_parse_datetime(entry.get("published")),
+                        tags=entry.get("tags", []),
+                    )
+                )
+        return items
+
+
+def default_fetchers() -> Dict[str, SourceFetcher]:
+    """
+    Fetchers configured from the environment
+
+    news_api needs NEWS_API_KEY; RSS_FEEDS and REDDIT_SUBREDDITS are
+    comma-separated overrides of the defaults.
+    """
+    feeds = os.getenv("RSS_FEEDS")
+    subreddits = os.getenv("REDDIT_SUBREDDITS")
+    fetchers: Dict[str, SourceFetcher] = {
+        "reddit": RedditFetcher([s.strip() for s in subreddits.split(",")] if subreddits else None),
+        "hackernews": HackerNewsFetcher(),
+        "rss_feeds": RSSFetcher(
+            [f.strip() for f in feeds.split(",")]
+            if feeds
+            else ["https://techcrunch.com/feed/", "https://www.wired.com/feed/rss"]
+        ),
+    }
+    if os.getenv("NEWS_API_KEY"):
+        fetchers["news_api"] = NewsAPIFetcher(os.environ["NEWS_API_KEY"])
+    return fetchers
+
+
+def _parse_feed(response: httpx.Response) -> List[Dict[str, Any]]:
+    """feedparser entries reduced to JSON-serializable dicts"""
+    parsed = feedparser.parse(response.content)
+    entries = []
+    for entry in parsed.entries:
+        if not entry.get("title"):
+            continue
+        entries.append(
+            {
+                "id": entry.get("id") or entry.get("link") or entry["title"],
+                "title": entry["title"],
+                "link": entry.get("link"),
+                "summary": entry.get("summary", ""),
+                "published": entry.get("published") or entry.get("updated"),
+                "tags": [t.get("term", "") for t in entry.get("tags", [])],
+            }
+        )
+    return entries
+
+
+def _cancel(tasks: List["asyncio.Future[Any]"]) -> None:
+    """Stop requests nobody will read, e.g. when a consumer stops early"""
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+
+
+def _engagement_score(value: float, scale: float) -> float:
+    """Map an engagement count onto 0-1 on a log scale"""
+    return min(1.0, math.log1p(max(value, 0.0)) / math.log1p(scale))
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _from_timestamp(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(float(value), tz=timezone.utc)
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """ISO-8601 or RFC 822 (RSS) timestamps"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
@@ -85,13 +85,12 @@ class StrategicPlanner:
         )
         
         # Gather inputs
-        market_signals = await self.market_intelligence.scan_market()
         portfolio_metrics = await self.portfolio_manager.get_portfolio_metrics()
         existing_topics = await self.portfolio_manager.list_topics()
         
-        # Identify opportunities
-        opportunities = await self.market_intelligence.identify_opportunities(
-            market_signals,
+        # Identify opportunities, clustering signals as each source delivers them
+        opportunities = await self.market_intelligence.identify_opportunities_stream(
+            self.market_intelligence.stream_scan(),
             [t.name for t in existing_topics],
         )
         
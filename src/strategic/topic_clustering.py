@@ -0,0 +1,228 @@
+"""
+Topic Clustering
+Vectorized sparse TF-IDF clustering of market signals into topics
+"""
+
+from typing import Dict, Optional, List
+import hashlib
+import re
+import numpy as np
+import structlog
+from pydantic import BaseModel, Field
+
+logger = structlog.get_logger()
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "how", "in",
+    "into", "is", "it", "its", "new", "of", "on", "or", "that", "the", "this", "to", "was",
+    "what", "when", "why", "will", "with", "you", "your",
+}
+
+
+class TopicCluster(BaseModel):
+    """A group of documents about the same topic"""
+    cluster_id: str  # derived from the top terms, so stable across runs
+    label: str  # the member text closest to the centroid
+    terms: List[str]  # highest-weighted centroid terms
+    members: List[int] = Field(default_factory=list)  # document indices
+
+
+class SparseMatrix(BaseModel):
+    """Row-sorted COO matrix of L2-normalized TF-IDF rows"""
+    model_config = {"arbitrary_types_allowed": True}
+
+    rows: np.ndarray
+    cols: np.ndarray
+    vals: np.ndarray
+    n_rows: int
+    n_cols: int
+
+    @property
+    def keys(self) -> np.ndarray:
+        """Sorted row * n_cols + col, for vectorized lookups"""
+        return self.rows * self.n_cols + self.cols
+
+    @property
+    def indptr(self) -> np.ndarray:
+        return np.searchsorted(self.rows, np.arange(self.n_rows + 1))
+
+
+class TfidfVectorizer:
+    """
+    Sparse TF-IDF rows over the batch vocabulary:
+    - Lowercased, stopwords dropped, simple plural folding
+    - Sublinear term frequency, smoothed IDF over the batch
+    - Rows are L2-normalized, so row dot products are cosines
+    """
+
+    def __init__(self) -> None:
+        self.vocabulary: List[str] = []  # column -> token
+        self._columns: Dict[str, int] = {}
+
+    def tokens(self, text: str) -> List[str]:
+        found = []
+        for token in _TOKEN.findall(text.lower()):
+            if token in _STOPWORDS or len(token) < 2:
+                continue
+            if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "is", "us")):
+                token = token[:-1]
+            found.append(token)
+        return found
+
+    def transform(self, texts: List[str]) -> SparseMatrix:
+        rows: List[int] = []
+        cols: List[int] = []
+        for i, text in enumerate(texts):
+            for token in self.tokens(text):
+                rows.append(i)
+                cols.append(self.column(token))
+        n, n_cols = len(texts), max(1, len(self.vocabulary))
+        keys, counts = np.unique(
+            np.asarray(rows, dtype=np.int64) * n_cols + np.asarray(cols, dtype=np.int64),
+            return_counts=True,
+        )
+        row_idx, col_idx = keys // n_cols, keys % n_cols
+        df = np.bincount(col_idx, minlength=n_cols)
+        vals = (1.0 + np.log(counts)) * (np.log((1.0 + n) / (1.0 + df[col_idx])) + 1.0)
+        norms = np.sqrt(np.bincount(row_idx, weights=vals ** 2, minlength=n))
+        vals = vals / norms[row_idx]
+        return SparseMatrix(rows=row_idx, cols=col_idx, vals=vals, n_rows=n, n_cols=n_cols)
+
+    def column(self, token: str) -> int:
+        column = self._columns.get(token)
+        if column is None:
+            column = len(self.vocabulary)
+            self._columns[token] = column
+            self.vocabulary.append(token)
+        return column
+
+
+class TopicClusterer:
+    """
+    Approximate single-link clustering for large signal batches:
+    - Candidate pairs come from term blocking: within each term's
+      posting list every row is compared with its next `window` rows,
+      so cost is O(window * nnz) dot products, never all pairs
+    - Candidates with cosine >= threshold are linked; linked rows
+      form connected components
+    - Vocabulary, weights, dot products and components are NumPy
+      array operations over the non-zeros
+    - Cluster ids hash the top centroid terms, so the same topic keeps
+      its id across scans; the label is the member text closest to
+      the centroid
+    """
+
+    def __init__(self, threshold: float = 0.45, window: int = 2, top_terms: int = 3):
+        self.threshold = threshold
+        self.window = window
+        self.top_terms = top_terms
+
+    def cluster(self, texts: List[str], labels: Optional[List[str]] = None) -> List[TopicCluster]:
+        """
+        Group texts by topic
+
+        Args:
+            texts: Text vectorized per document (e.g. topic plus keywords)
+            labels: Candidate label per document; defaults to the text
+
+        Returns:
+            Clusters ordered by size, then id
+        """
+        labels = labels if labels is not None else texts
+        if not texts:
+            return []
+        vectorizer = TfidfVectorizer()
+        matrix = vectorizer.transform(texts)
+        components = self._components(matrix)
+        return self._describe(matrix, components, labels, vectorizer.vocabulary)
+
+    def _components(self, matrix: SparseMatrix) -> np.ndarray:
+        """Connected-component id per row from verified posting-list neighbours"""
+        order = np.lexsort((matrix.rows, matrix.cols))
+        cols, rows = matrix.cols[order], matrix.rows[order]
+        sources, targets = [], []
+        for offset in range(1, self.window + 1):
+            same_term = cols[offset:] == cols[:-offset]
+            sources.append(rows[:-offset][same_term])
+            targets.append(rows[offset:][same_term])
+        a, b = np.concatenate(sources), np.concatenate(targets)
+        linked = pair_dots(matrix, a, b) >= self.threshold
+        return _connected_components(matrix.n_rows, a[linked], b[linked])
+
+    def _describe(
+        self,
+        matrix: SparseMatrix,
+        components: np.ndarray,
+        labels: List[str],
+        vocabulary: List[str],
+    ) -> List[TopicCluster]:
+        # Centroids as (component, column) -> summed weight
+        component_keys = components[matrix.rows] * matrix.n_cols + matrix.cols
+        centroid_keys, inverse = np.unique(component_keys, return_inverse=True)
+        centroid_vals = np.bincount(inverse, weights=matrix.vals)
+        centroid_components = centroid_keys // matrix.n_cols
+
+        # Top terms: sort by component, then weight descending
+        order = np.lexsort((-centroid_vals, centroid_components))
+        ranked_components = centroid_components[order]
+        firsts = np.flatnonzero(np.r_[True, ranked_components[1:] != ranked_components[:-1]])
+        rank = np.arange(len(order)) - np.repeat(firsts, np.diff(np.r_[firsts, len(order)]))
+        top = order[rank < self.top_terms]
+        terms: Dict[int, List[str]] = {}
+        for component, key in zip(centroid_components[top], centroid_keys[top]):
+            terms.setdefault(int(component), []).append(vocabulary[int(key % matrix.n_cols)])
+
+        # Label: the member scoring highest against its centroid
+        scores = np.bincount(matrix.rows, weights=matrix.vals * centroid_vals[inverse], minlength=matrix.n_rows)
+        by_component = np.lexsort((np.arange(matrix.n_rows), -scores, components))
+        ordered_components = components[by_component]
+        heads = by_component[np.r_[True, ordered_components[1:] != ordered_components[:-1]]]
+
+        clusters: Dict[str, TopicCluster] = {}
+        members: Dict[int, List[int]] = {}
+        for row, component in enumerate(components.tolist()):
+            members.setdefault(component, []).append(row)
+        for head in heads.tolist():
+            component = int(components[head])
+            cluster_terms = terms.get(component) or [labels[head].lower()]
+            cluster_id = "topic_" + hashlib.sha1("|".join(sorted(cluster_terms)).encode()).hexdigest()[:12]
+            if cluster_id in clusters:
+                # Same top terms means the same topic
+                clusters[cluster_id].members.extend(members[component])
+                continue
+            clusters[cluster_id] = TopicCluster(
+                cluster_id=cluster_id, label=labels[head], terms=cluster_terms, members=members[component]
+            )
+        return sorted(clusters.values(), key=lambda c: (-len(c.members), c.cluster_id))
+
+
+def pair_dots(matrix: SparseMatrix, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Dot products of rows a[i] and b[i], vectorized over the non-zeros of a"""
+    if len(a) == 0:
+        return np.zeros(0)
+    keys, indptr = matrix.keys, matrix.indptr
+    lengths = indptr[a + 1] - indptr[a]
+    pair = np.repeat(np.arange(len(a)), lengths)
+    nonzero = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + indptr[a][pair]
+    lookup = b[pair] * matrix.n_cols + matrix.cols[nonzero]
+    positions = np.minimum(np.searchsorted(keys, lookup), len(keys) - 1)
+    found = keys[positions] == lookup
+    products = np.where(found, matrix.vals[nonzero] * matrix.vals[positions], 0.0)
+    return np.bincount(pair, weights=products, minlength=len(a))
+
+
+def _connected_components(n: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Smallest row index of each row's component, by label propagation"""
+    labels = np.arange(n)
+    if len(sources) == 0:
+        return labels
+    while True:
+        joined = np.minimum(labels[sources], labels[targets])
+        updated = labels.copy()
+        np.minimum.at(updated, sources, joined)
+        np.minimum.at(updated, targets, joined)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
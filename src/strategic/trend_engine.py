@@ -0,0 +1,270 @@
+"""
+Trend Engine
+Per-topic signal time series with vectorized growth and anomaly scores
+"""
+
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
+import time
+import numpy as np
+import structlog
+from pydantic import BaseModel
+
+logger = structlog.get_logger()
+
+DEFAULT_RESOLUTIONS: Dict[str, Tuple[float, int]] = {
+    "hour": (3600.0, 48),  # bucket width in seconds, buckets kept
+    "day": (86400.0, 30),
+    "week": (7 * 86400.0, 26),
+}
+
+
+class TopicTrend(BaseModel):
+    """Trend of one topic at one resolution"""
+    topic_id: str
+    resolution: str
+    label: str  # emerging, growing, stable, declining
+    growth: float  # EWMA of per-bucket log growth
+    acceleration: float  # change in growth over the last bucket
+    zscore: float  # latest bucket against the rest of the window
+    latest_count: float
+    ewma_count: float
+    avg_sentiment: float
+
+
+class TrendTable(BaseModel):
+    """Trend statistics for every topic at one resolution, as aligned arrays"""
+    model_config = {"arbitrary_types_allowed": True}
+
+    resolution: str
+    topic_ids: List[str]
+    growth: np.ndarray
+    acceleration: np.ndarray
+    zscore: np.ndarray
+    latest_count: np.ndarray
+    ewma_count: np.ndarray
+    avg_sentiment: np.ndarray
+    labels: np.ndarray
+
+
+class _Ring:
+    """Count and sentiment buckets for all topics at one resolution"""
+
+    def __init__(self, width: float, size: int, capacity: int):
+        self.width = width
+        self.size = size
+        self.counts = np.zeros((capacity, size))
+        self.sentiment = np.zeros((capacity, size))
+        self.head: Optional[int] = None  # absolute index of the newest bucket
+
+    def grow(self, capacity: int) -> None:
+        for name in ("counts", "sentiment"):
+            old = getattr(self, name)
+            new = np.zeros((capacity, self.size))
+            new[: old.shape[0]] = old
+            setattr(self, name, new)
+
+    def advance(self, bucket: int) -> None:
+        """Move the head forward, clearing the buckets it passes"""
+        if self.head is None:
+            self.head = bucket
+            return
+        if bucket <= self.head:
+            return
+        if bucket - self.head >= self.size:
+            self.counts[:] = 0.0
+            self.sentiment[:] = 0.0
+        else:
+            cleared = np.arange(self.head + 1, bucket + 1) % self.size
+            self.counts[:, cleared] = 0.0
+            self.sentiment[:, cleared] = 0.0
+        self.head = bucket
+
+    def add(self, rows: np.ndarray, timestamps: np.ndarray, sentiments: np.ndarray, now: float) -> None:
+        buckets = np.floor(timestamps / self.width).astype(np.int64)
+        self.advance(int(max(buckets.max(), np.floor(now / self.width))))
+        keep = buckets > self.head - self.size  # older events fell out of the window
+        slots = buckets[keep] % self.size
+        np.add.at(self.counts, (rows[keep], slots), 1.0)
+        np.add.at(self.sentiment, (rows[keep], slots), sentiments[keep])
+
+    def window(self, rows: Union[slice, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Counts and sentiment sums of the given topic rows, oldest bucket first"""
+        order = np.arange(self.head - self.size + 1, self.head + 1) % self.size
+        return self.counts[rows][:, order], self.sentiment[rows][:, order]
+
+
+class TrendEngine:
+    """
+    Sliding-window trends per topic:
+    - Ring buffers of signal counts and sentiment at several resolutions
+      (hourly, daily, weekly by default), all topics in one array
+    - Growth is the EWMA of per-bucket log growth; acceleration is its
+      change over the last bucket; z-scores compare the latest bucket
+      with the rest of the window
+    - Statistics for every topic are computed together with array
+      operations, so ranking thousands of topics takes milliseconds
+    """
+
+    def __init__(
+        self,
+        resolutions: Optional[Dict[str, Tuple[float, int]]] = None,
+        alpha: float = 0.3,
+        emerging_zscore: float = 3.0,
+        emerging_growth: float = 0.5,
+        growth_threshold: float = 0.05,
+        min_count: float = 3.0,
+        initial_capacity: int = 256,
+    ):
+        self.resolutions = resolutions or DEFAULT_RESOLUTIONS
+        self.alpha = alpha
+        self.emerging_zscore = emerging_zscore
+        self.emerging_growth = emerging_growth
+        self.growth_threshold = growth_threshold
+        self.min_count = min_count
+        self.topic_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._capacity = initial_capacity
+        self._rings = {
+            name: _Ring(width, size, initial_capacity) for name, (width, size) in self.resolutions.items()
+        }
+
+    def record(
+        self,
+        topic_ids: Sequence[str],
+        timestamps: Sequence[float],
+        sentiments: Optional[Sequence[float]] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Add signals to the topic series
+
+        Args:
+            topic_ids: Topic of each signal
+            timestamps: Unix time of each signal
+            sentiments: Sentiment of each signal, default 0
+            now: Current time; buckets up to it are opened even when empty
+        """
+        if not len(topic_ids):
+            return
+        known = {topic_id: self._row(topic_id) for topic_id in dict.fromkeys(topic_ids)}
+        rows = np.fromiter(map(known.__getitem__, topic_ids), dtype=np.int64, count=len(topic_ids))
+        stamps = np.asarray(timestamps, dtype=float)
+        values = np.zeros(len(rows)) if sentiments is None else np.asarray(sentiments, dtype=float)
+        now = time.time() if now is None else now
+        for ring in self._rings.values():
+            ring.add(rows, stamps, values, now)
+
+    def table(self, resolution: str = "day", now: Optional[float] = None) -> TrendTable:
+        """Statistics and labels for every topic at one resolution"""
+        ring = self._rings[resolution]
+        n = len(self.topic_ids)
+        if ring.head is None or n == 0:
+            empty = np.zeros(0)
+            return TrendTable(
+                resolution=resolution, topic_ids=[], growth=empty, acceleration=empty, zscore=empty,
+                latest_count=empty, ewma_count=empty, avg_sentiment=empty, labels=np.array([], dtype=object),
+            )
+        if now is not None:
+            ring.advance(int(np.floor(now / ring.width)))
+        stats = self._statistics(ring, *ring.window(slice(0, n)))
+        return TrendTable(resolution=resolution, topic_ids=list(self.topic_ids), **stats)
+
+    def labels(
+        self, topic_ids: Sequence[str], resolution: str = "day", now: Optional[float] = None
+    ) -> List[str]:
+        """
+        Label of each given topic, computing statistics for those topics only
+
+        Topics without signals are "stable".
+        """
+        ring = self._rings[resolution]
+        rows = [self._rows.get(topic_id) for topic_id in topic_ids]
+        known = np.array([row for row in rows if row is not None], dtype=np.int64)
+        if ring.head is None or not len(known):
+            return ["stable"] * len(rows)
+        if now is not None:
+            ring.advance(int(np.floor(now / ring.width)))
+        computed = iter(self._statistics(ring, *ring.window(known))["labels"].tolist())
+        return [next(computed) if row is not None else "stable" for row in rows]
+
+    def trend(self, topic_id: str, resolution: str = "day", now: Optional[float] = None) -> Optional[TopicTrend]:
+        """Trend of a single topic, or None if it has no signals"""
+        if topic_id not in self._rows:
+            return None
+        table = self.table(resolution, now)
+        row = self._rows[topic_id]
+        return TopicTrend(
+            topic_id=topic_id,
+            resolution=resolution,
+            label=str(table.labels[row]),
+            growth=float(table.growth[row]),
+            acceleration=float(table.acceleration[row]),
+            zscore=float(table.zscore[row]),
+            latest_count=float(table.latest_count[row]),
+            ewma_count=float(table.ewma_count[row]),
+            avg_sentiment=float(table.avg_sentiment[row]),
+        )
+
+    def spiking(
+        self, resolution: str = "hour", top_k: int = 20, min_zscore: Optional[float] = None, now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """Topics whose latest bucket is most anomalous, highest z-score first"""
+        table = self.table(resolution, now)
+        threshold = self.emerging_zscore if min_zscore is None else min_zscore
+        candidates = np.flatnonzero(table.zscore >= threshold)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-table.zscore[candidates], top_k - 1)[:top_k]]
+        candidates = candidates[np.argsort(-table.zscore[candidates], kind="stable")]
+        return [(table.topic_ids[i], float(table.zscore[i])) for i in candidates]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"topics": len(self.topic_ids), "resolutions": list(self.resolutions)}
+
+    def _statistics(self, ring: _Ring, counts: np.ndarray, sentiment: np.ndarray) -> Dict[str, np.ndarray]:
+        """Growth, anomaly and label arrays for windowed counts, one row per topic"""
+        weights = self.alpha * (1 - self.alpha) ** np.arange(ring.size - 1, -1, -1)
+        ewma_count = counts @ weights / weights.sum()
+        deltas = np.diff(np.log1p(counts), axis=1)
+        delta_weights = weights[1:] / weights[1:].sum()
+        growth = deltas @ delta_weights
+        previous = deltas[:, :-1] @ (weights[1:-1] / weights[1:-1].sum())
+        acceleration = growth - previous
+
+        history, latest = counts[:, :-1], counts[:, -1]
+        # A floor of 1 keeps a first signal from scoring as an infinite spike
+        zscore = (latest - history.mean(axis=1)) / np.maximum(history.std(axis=1), 1.0)
+
+        recent = counts @ weights
+        avg_sentiment = np.divide(sentiment @ weights, recent, out=np.zeros(len(counts)), where=recent > 0)
+
+        active = np.maximum(latest, ewma_count) >= self.min_count
+        labels = np.select(
+            [
+                active & ((zscore >= self.emerging_zscore) | (growth >= self.emerging_growth) & (acceleration > 0)),
+                growth >= self.growth_threshold,
+                growth <= -self.growth_threshold,
+            ],
+            ["emerging", "growing", "declining"],
+            default="stable",
+        )
+        return {
+            "growth": growth,
+            "acceleration": acceleration,
+            "zscore": zscore,
+            "latest_count": latest,
+            "ewma_count": ewma_count,
+            "avg_sentiment": avg_sentiment,
+            "labels": labels,
+        }
+
+    def _row(self, topic_id: str) -> int:
+        row = self._rows.get(topic_id)
+        if row is None:
+            row = len(self.topic_ids)
+            self._rows[topic_id] = row
+            self.topic_ids.append(topic_id)
+            if row >= self._capacity:
+                self._capacity *= 2
+                for ring in self._rings.values():
+                    ring.grow(self._capacity)
+        return row
@@ -0,0 +1,43 @@
+"""Tests for Two-Tier Cache"""
+
+import json
+import time
+
+from src.common import two_tier_cache
+from src.common.two_tier_cache import TwoTierCache
+
+
+def _cache(path=None, **kwargs) -> TwoTierCache:
+    return TwoTierCache("entries", encode=json.dumps, decode=json.loads, path=path, **kwargs)
+
+
+def test_disk_tier_is_bounded_by_least_recent_use(tmp_path):
+    """Test that a disk read counts as a use when evicting over the bound"""
+    cache = _cache(str(tmp_path / "cache.db"), memory_entries=1, disk_entries=2)
+    cache.EVICTION_INTERVAL = 1
+    cache.set("a", [1])
+    cache.set("b", [2])
+    assert cache.get("a") == [1]  # disk hit, now more recent than b
+    cache.set("c", [3])
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    metrics = cache.metrics()
+    assert metrics["disk_entries"] == 2
+    assert metrics["misses"] == 1
+
+
+def test_touch_restarts_the_ttl(monkeypatch):
+    """Test that a touched entry outlives its original expiry"""
+    cache = _cache(ttl_seconds=60)
+    cache.set("a", [1])
+    cache.set("b", [2])
+
+    now = time.time()
+    monkeypatch.setattr(two_tier_cache.time, "time", lambda: now + 30)
+    cache.touch("a")
+    monkeypatch.setattr(two_tier_cache.time, "time", lambda: now + 70)
+
+    assert cache.get("a") == [1]
+    assert cache.get("b") is None
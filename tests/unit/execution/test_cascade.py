@@ -0,0 +1,133 @@
+"""Tests for Provider Cascade"""
+
+import asyncio
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent, ContentSection
+from src.execution.llm.cascade import CascadeProvider
+from src.execution.llm.providers import GenerationRequest, LocalFakeProvider, ProviderError
+
+
+def _request() -> GenerationRequest:
+    return GenerationRequest(prompt="Summarize the launch", model="gpt-4", max_tokens=50)
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_answers_without_hedging():
+    """Test that a primary within budget serves the request alone"""
+    primary = LocalFakeProvider(name="primary")
+    secondary = LocalFakeProvider(name="secondary")
+    cascade = CascadeProvider([primary, secondary], latency_budget_seconds=0.5)
+
+    result = await cascade.generate(_request())
+
+    assert result.provider == "primary"
+    assert secondary.calls == []
+    assert cascade.metrics()["hedges"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled():
+    """Test that exceeding the latency budget races the secondary"""
+    primary = LocalFakeProvider(name="primary", latency_seconds=5.0)
+    secondary = LocalFakeProvider(name="secondary", latency_seconds=0.01)
+    cascade = CascadeProvider(
+        [primary, secondary], latency_budget_seconds=0.05, models={"secondary": "claude"}
+    )
+
+    started = asyncio.get_running_loop().time()
+    result = await cascade.generate(_request())
+
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert result.provider == "secondary"
+    assert result.model == "claude"
+    metrics = cascade.metrics()
+    assert metrics["hedges"] == 1
+    assert metrics["providers"]["secondary"]["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_primary_fails_over_immediately():
+    """Test failover on 429/5xx and that repeated failures demote the provider"""
+    primary = LocalFakeProvider(name="primary", failures=[429, 503])
+    secondary = LocalFakeProvider(name="secondary")
+    cascade = CascadeProvider(
+        [primary, secondary], latency_budget_seconds=5.0, failure_threshold=2
+    )
+
+    assert (await cascade.generate(_request())).provider == "secondary"
+    assert (await cascade.generate(_request())).provider == "secondary"
+    assert cascade.metrics()["failovers"] == 2
+    assert cascade.metrics()["providers"]["primary"]["healthy"] is False
+
+    # Demoted: the secondary is tried first while the primary cools down
+    await cascade.generate(_request())
+    assert len(primary.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_and_exhaustion_are_raised():
+    """Test that 4xx errors are not masked and that all-failed raises the last error"""
+    bad_request = CascadeProvider(
+        [LocalFakeProvider(name="primary", failures=[400]), LocalFakeProvider(name="secondary")]
+    )
+    with pytest.raises(ProviderError) as error:
+        await bad_request.generate(_request())
+    assert error.value.status_code == 400
+
+    all_down = CascadeProvider(
+        [LocalFakeProvider(name="primary", failures=[500]), LocalFakeProvider(name="secondary", failures=[502])]
+    )
+    with pytest.raises(ProviderError) as error:
+        await all_down.generate(_request())
+    assert error.value.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_chunk():
+    """Test that streaming switches provider when the primary fails up front"""
+    cascade = CascadeProvider(
+        [LocalFakeProvider(name="primary", failures=[500]), LocalFakeProvider(name="secondary")]
+    )
+    agent = ContentAgent(provider=cascade)
+
+    items = [item async for item in agent.stream_content("topic_1", {}, {}, include_chunks=True)]
+
+    assert len([item for item in items if isinstance(item, ContentSection)]) == 3
+    assert cascade.metrics()["failovers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_winning_during_hedge_is_not_a_hedge_win():
+    """Test hedge_wins only counts providers started as hedges"""
+    primary = LocalFakeProvider(name="primary", latency_seconds=0.1)
+    secondary = LocalFakeProvider(name="secondary", latency_seconds=5.0)
+    cascade = CascadeProvider([primary, secondary], latency_budget_seconds=0.02)
+
+    result = await cascade.generate(_request())
+
+    metrics = cascade.metrics()
+    assert result.provider == "primary"
+    assert metrics["hedges"] == 1
+    assert metrics["providers"]["primary"]["hedge_wins"] == 0
+    assert metrics["providers"]["secondary"]["hedge_wins"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_hedges_on_time_to_first_chunk():
+    """Test a primary slow to start streaming is raced and the loser closed"""
+    primary = LocalFakeProvider(name="primary", latency_seconds=50.0)
+    secondary = LocalFakeProvider(name="secondary")
+    cascade = CascadeProvider([primary, secondary], latency_budget_seconds=0.05)
+
+    started = asyncio.get_running_loop().time()
+    text = "".join([chunk async for chunk in cascade.stream(_request())])
+    expected = "".join([chunk async for chunk in LocalFakeProvider(name="x").stream(_request())])
+
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert text == expected
+    metrics = cascade.metrics()
+    assert metrics["hedges"] == 1
+    assert metrics["providers"]["secondary"]["hedge_wins"] == 1
+    assert metrics["providers"]["secondary"]["successes"] == 1
+    assert metrics["providers"]["primary"]["successes"] == 0
@@ -0,0 +1,84 @@
+"""Tests for Provider Client Pool"""
+
+import asyncio
+import json
+
+import pytest
+from src.execution.llm.client_pool import ClientPool, get_client_pool
+from src.execution.llm.providers import GenerationRequest, OpenAIProvider
+
+
+async def _start_server(delay: float = 0.0):
+    """Minimal keep-alive HTTP/1.1 server answering every POST with a chat completion"""
+
+    async def handle(reader, writer):
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            length = 0
+            for line in head.decode().split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            await reader.readexactly(length)
+            await asyncio.sleep(delay)
+            body = json.dumps(
+                {"model": "gpt-4", "choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}]}
+            ).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/v1"
+
+
+@pytest.mark.asyncio
+async def test_providers_share_warm_connections():
+    """Test that separate provider instances reuse the same keep-alive connection"""
+    server, base_url = await _start_server()
+    pool = get_client_pool()
+    try:
+        request = GenerationRequest(prompt="hi", model="gpt-4")
+        for _ in range(5):
+            provider = OpenAIProvider(api_key="test", base_url=base_url)
+            assert (await provider.generate(request)).text == "ok"
+            await provider.close()
+
+        metrics = pool.metrics()
+        assert metrics["hosts"] == 1
+        assert metrics["requests"] == 5
+        assert metrics["new_connections"] == 1
+        assert metrics["reuse_ratio"] == pytest.approx(0.8)
+        assert metrics["in_flight"] == 0
+    finally:
+        await pool.aclose()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_caps_in_flight_requests():
+    """Test that the pool-wide cap bounds concurrency and counts saturated waits"""
+    server, base_url = await _start_server(delay=0.05)
+    pool = ClientPool(max_connections=2, http2=False)
+    try:
+        client = pool.client(base_url)
+        responses = await asyncio.gather(
+            *(client.post(f"{base_url}/chat/completions", json={}) for _ in range(6))
+        )
+
+        assert all(r.status_code == 200 for r in responses)
+        metrics = pool.metrics()
+        assert metrics["peak_in_flight"] == 2
+        assert metrics["saturated_waits"] >= 4
+        assert metrics["new_connections"] <= 2
+        assert metrics["saturation"] == 0.0
+    finally:
+        await pool.aclose()
+        server.close()
@@ -0,0 +1,165 @@
+"""Tests for Content Agent"""
+
+import asyncio
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent, ContentChunk, ContentSection
+from src.execution.llm.batching import MicroBatcher
+from src.execution.llm.context_packing import ContextPacker
+from src.execution.llm.providers import LocalFakeProvider
+from src.execution.llm.rate_limits import RateLimitedProvider
+
+
+@pytest.mark.asyncio
+async def test_generate_content_with_default_sections():
+    """Test that the default three sections are generated deterministically"""
+    agent = ContentAgent(provider=LocalFakeProvider())
+
+    first = await agent.generate_content("topic_1", {"headline": "Launch"}, {})
+    second = await agent.generate_content("topic_1", {"headline": "Launch"}, {})
+
+    assert [s.section_type for s in first.sections] == ["introduction", "main", "action_items"]
+    assert [s.content for s in first.sections] == [s.content for s in second.sections]
+    assert first.sections[0].word_count == len(first.sections[0].content.split())
+    assert first.metadata["provider"] == "fake"
+    assert first.metadata["output_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_agents_sharing_batcher_coalesce_calls():
+    """Test that concurrent agents are served by batched provider calls"""
+    provider = LocalFakeProvider()
+    batcher = MicroBatcher(provider, window_ms=20)
+    agents = [ContentAgent(batcher=batcher) for _ in range(4)]
+    limited_calls = batcher.provider.limiter.calls
+
+    await asyncio.gather(
+        *(agent.generate_content(f"topic_{i}", {}, {}) for i, agent in enumerate(agents))
+    )
+
+    assert sum(provider.calls) == 12
+    assert len(provider.calls) == 1
+    # Batched calls still go through the provider's shared limiter
+    assert isinstance(agents[0].provider, RateLimitedProvider)
+    assert batcher.provider.limiter.calls == limited_calls + 1
+    metrics = batcher.metrics()
+    assert metrics["avg_batch_size"] == 12
+    assert metrics["time_to_batch_p95_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_stream_content_yields_sections_as_they_complete():
+    """Test that streaming yields partial chunks and every section once"""
+    agent = ContentAgent(provider=LocalFakeProvider())
+
+    items = [
+        item
+        async for item in agent.stream_content("topic_1", {}, {}, include_chunks=True)
+    ]
+
+    sections = [i for i in items if isinstance(i, ContentSection)]
+    chunks = [i for i in items if isinstance(i, ContentChunk)]
+    assert sorted(s.section_type for s in sections) == ["action_items", "introduction", "main"]
+    main = next(s for s in sections if s.section_type == "main")
+    assert "".join(c.text for c in chunks if c.section_type == "main") == main.content
+
+    full = await agent.generate_content("topic_1", {}, {})
+    assert [s.content for s in full.sections if s.section_type == "main"] == [main.content]
+
+
+@pytest.mark.asyncio
+async def test_dependent_section_waits_and_sees_upstream_content():
+    """Test that depends_on orders sections and passes upstream text into the prompt"""
+    provider = LocalFakeProvider()
+    agent = ContentAgent(provider=provider)
+    config = {
+        "content_sections": [
+            {"section_type": "summary", "depends_on": ["main"], "max_tokens": 100},
+            {"section_type": "main", "max_tokens": 400},
+        ]
+    }
+
+    content = await agent.generate_content("topic_1", {}, config)
+
+    summary, main = content.sections
+    assert summary.section_type == "summary"
+    packed = ContextPacker({}).pack(2000)
+    request = agent._build_request("topic_1", config["content_sections"][0], packed, config, {"main": main.content})
+    assert main.content in request.prompt
+    assert summary.content == provider._complete(request).text
+
+
+@pytest.mark.asyncio
+async def test_invalid_section_dependencies_are_rejected():
+    """Test that cycles and unknown dependencies raise ValueError"""
+    agent = ContentAgent(provider=LocalFakeProvider())
+
+    with pytest.raises(ValueError):
+        await agent.generate_content(
+            "topic_1",
+            {},
+            {"content_sections": [{"section_type": "a", "depends_on": ["b"]}, {"section_type": "b", "depends_on": ["a"]}]},
+        )
+    with pytest.raises(ValueError):
+        await agent.generate_content(
+            "topic_1", {}, {"content_sections": [{"section_type": "a", "depends_on": ["missing"]}]}
+        )
+
+
+@pytest.mark.asyncio
+async def test_research_is_packed_within_section_budget():
+    """Test that oversized research is trimmed per section and usage is recorded"""
+    agent = ContentAgent(provider=LocalFakeProvider())
+    research = {
+        "items": [
+            {"id": f"item_{i}", "title": f"Story {i}", "summary": "word " * 200, "relevance_score": i / 50}
+            for i in range(50)
+        ]
+    }
+
+    content = await agent.generate_content("topic_1", research, {"context_tokens": 500})
+
+    packing = content.metadata["context_packing"]
+    assert set(packing) == {"introduction", "main", "action_items"}
+    for usage in packing.values():
+        assert 0 < usage["tokens_used"] <= 500
+        assert usage["items_used"] + usage["items_dropped"] == 50
+    assert content.metadata["context_tokens"] == sum(u["tokens_used"] for u in packing.values())
+
+
+@pytest.mark.asyncio
+async def test_regenerate_only_changed_sections():
+    """Test that unchanged sections are reused and dependents of changed ones regenerate"""
+    provider = LocalFakeProvider()
+    agent = ContentAgent(provider=provider)
+    config = {
+        "content_sections": [
+            {"section_type": "intro", "max_tokens": 100, "context_tokens": 40},
+            {"section_type": "main", "max_tokens": 400, "context_tokens": 400},
+            {"section_type": "summary", "depends_on": ["main"], "max_tokens": 100, "context_tokens": 40},
+        ]
+    }
+    research = {"items": [{"id": "a", "title": "Launch", "summary": "New model", "relevance_score": 0.9}]}
+
+    first = await agent.generate_content("topic_1", research, config)
+    assert set(first.metadata["section_fingerprints"]) == {"intro", "main", "summary"}
+
+    unchanged = await agent.regenerate_content(first, research, config)
+    assert unchanged.metadata["reused_sections"] == ["intro", "main", "summary"]
+    assert [s.content for s in unchanged.sections] == [s.content for s in first.sections]
+
+    # A low-ranked late story only fits in main's larger research budget
+    research["items"].append(
+        {"id": "b", "title": "Late story", "summary": "details " * 30, "relevance_score": 0.1}
+    )
+    calls = len(provider.calls)
+    revised = await agent.regenerate_content(first, research, config)
+
+    assert revised.metadata["regenerated_sections"] == ["main", "summary"]
+    assert revised.metadata["reused_sections"] == ["intro"]
+    assert len(provider.calls) == calls + 2
+    assert revised.sections[0].content == first.sections[0].content
+    assert revised.sections[1].content != first.sections[1].content
+
+    tone_change = await agent.regenerate_content(revised, research, {**config, "tone": "casual"})
+    assert tone_change.metadata["reused_sections"] == []
@@ -0,0 +1,73 @@
+"""Tests for Context Packing"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.execution.llm.context_packing import ContextPacker, estimate_tokens
+
+
+def test_estimate_tokens_counts_words_and_punctuation():
+    """Test that the estimate grows with long words and punctuation"""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("AI news, today!") == 5
+    assert estimate_tokens("internationalization") == 4
+    assert estimate_tokens("word " * 100) == 100
+
+
+def test_pack_prefers_relevant_and_recent_items():
+    """Test that ranking blends relevance with recency and respects the budget"""
+    now = datetime(2026, 1, 10, tzinfo=timezone.utc)
+    research = {
+        "headline": "Model launch",
+        "items": [
+            {"id": "old", "title": "Old", "summary": "a " * 50, "relevance_score": 0.9,
+             "published_at": (now - timedelta(days=30)).isoformat()},
+            {"id": "fresh", "title": "Fresh", "summary": "b " * 50, "relevance_score": 0.9,
+             "published_at": now.isoformat()},
+            {"id": "weak", "title": "Weak", "summary": "c " * 50, "relevance_score": 0.1,
+             "published_at": now.isoformat()},
+        ],
+    }
+    packer = ContextPacker(research, now=now)
+
+    packed = packer.pack(80)
+
+    assert "Model launch" in packed.text
+    assert "Fresh" in packed.text
+    assert packed.tokens_used <= 80
+    assert packed.items_used == 1
+    assert packed.dropped_ids == ["old", "weak"]
+
+    everything = packer.pack(10_000)
+    assert everything.items_dropped == 0
+    assert everything.text.index("Fresh") < everything.text.index("Old") < everything.text.index("Weak")
+
+
+def test_pack_skips_items_that_do_not_fit_but_keeps_smaller_ones():
+    """Test that a large item does not block smaller lower-ranked ones"""
+    research = {
+        "items": [
+            {"id": "big", "title": "Big", "summary": "x " * 500, "relevance_score": 1.0},
+            {"id": "small", "title": "Small", "summary": "short note", "relevance_score": 0.2},
+        ]
+    }
+
+    packed = ContextPacker(research).pack(50)
+
+    assert packed.dropped_ids == ["big"]
+    assert "Small" in packed.text
+
+
+def test_pack_reports_fields_that_do_not_fit():
+    """Test oversized non-item fields are reported instead of silently dropped"""
+    research = {
+        "notes": "background " * 200,
+        "headline": "Launch",
+        "items": [{"id": "a", "title": "Short item", "relevance_score": 0.9}],
+    }
+
+    packed = ContextPacker(research).pack(token_budget=50)
+
+    assert packed.dropped_fields == ["headline", "notes"]
+    assert "background" not in packed.text
+    assert packed.items_used == 1
+    assert ContextPacker(research).pack(token_budget=1000).dropped_fields == []
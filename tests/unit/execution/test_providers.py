@@ -0,0 +1,57 @@
+"""Tests for LLM Providers"""
+
+import httpx
+import pytest
+from src.execution.llm.providers import (
+    AnthropicProvider,
+    GenerationRequest,
+    OpenAIProvider,
+    ProviderError,
+)
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_parses_chat_completion():
+    """Test request shape and response parsing for the OpenAI API"""
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["path"] = request.url.path
+        seen["auth"] = request.headers["authorization"]
+        return httpx.Response(
+            200,
+            json={
+                "model": "gpt-4",
+                "choices": [{"message": {"content": "Hello"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 1},
+            },
+        )
+
+    provider = OpenAIProvider(
+        api_key="test-key",
+        base_url="https://llm.test/v1",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    result = await provider.generate(GenerationRequest(prompt="Hi", model="gpt-4"))
+
+    assert seen == {"path": "/v1/chat/completions", "auth": "Bearer test-key"}
+    assert result.text == "Hello"
+    assert result.output_tokens == 1
+
+
+@pytest.mark.asyncio
+async def test_anthropic_provider_raises_retryable_error_on_429():
+    """Test that rate limits surface as retryable ProviderErrors"""
+    provider = AnthropicProvider(
+        api_key="test-key",
+        base_url="https://llm.test",
+        client=httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: httpx.Response(429, text="slow down"))
+        ),
+    )
+
+    with pytest.raises(ProviderError) as exc_info:
+        await provider.generate(GenerationRequest(prompt="Hi", model="claude-3-haiku"))
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retryable
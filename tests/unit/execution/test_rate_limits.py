@@ -0,0 +1,70 @@
+"""Tests for Provider Rate Limits"""
+
+import asyncio
+import time
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent
+from src.execution.llm.providers import LocalFakeProvider
+from src.execution.llm.rate_limits import (
+    ProviderLimiter,
+    RateLimitedProvider,
+    configure_provider_limits,
+)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_is_shared_across_agents():
+    """Test that agents sharing a limiter never exceed its concurrency"""
+    limiter = ProviderLimiter(max_concurrency=2)
+    provider = RateLimitedProvider(LocalFakeProvider(latency_seconds=0.02), limiter)
+    peak = 0
+
+    async def watch() -> None:
+        nonlocal peak
+        while True:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.001)
+
+    watcher = asyncio.create_task(watch())
+    agents = [ContentAgent(provider=provider) for _ in range(3)]
+    started = time.monotonic()
+    await asyncio.gather(*(a.generate_content(f"t{i}", {}, {}) for i, a in enumerate(agents)))
+    elapsed = time.monotonic() - started
+    watcher.cancel()
+
+    assert limiter.calls == 9
+    assert peak == 2
+    assert elapsed >= 0.02 * 9 / 2
+
+
+@pytest.mark.asyncio
+async def test_request_rate_limit_throttles():
+    """Test that requests beyond the per-minute budget wait for refill"""
+    limiter = ProviderLimiter(max_concurrency=10, requests_per_minute=600)  # 10/s, burst 600
+    limiter._requests.available = 1
+    limiter._requests.updated = time.monotonic()
+    provider = RateLimitedProvider(LocalFakeProvider(), limiter)
+
+    agent = ContentAgent(provider=provider)
+    await agent.generate_content("topic_1", {}, {})
+
+    assert limiter.throttled_seconds >= 0.15
+
+
+def test_shared_limiter_works_across_event_loops():
+    """Test a provider wrapped once can be used under contention from several loops"""
+
+    class LoopTestProvider(LocalFakeProvider):
+        name = "fake_loop_test"
+
+    configure_provider_limits("fake_loop_test", max_concurrency=1)
+    provider = RateLimitedProvider(LoopTestProvider(latency_seconds=0.01))
+    agent = ContentAgent(provider=provider)
+
+    async def contended() -> int:
+        await asyncio.gather(*(agent.generate_content(f"t{i}", {}, {}) for i in range(2)))
+        return provider.limiter.calls
+
+    assert asyncio.run(contended()) == 6
+    assert asyncio.run(contended()) == 6  # a fresh limiter for the new loop
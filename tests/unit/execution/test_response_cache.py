@@ -0,0 +1,57 @@
+"""Tests for Response Cache"""
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent
+from src.execution.llm.providers import GenerationResult, LocalFakeProvider
+from src.execution.llm.response_cache import ResponseCache
+
+
+def _result(text: str) -> GenerationResult:
+    return GenerationResult(text=text, model="gpt-4", provider="fake")
+
+
+def test_memory_lru_disk_tier_and_ttl(tmp_path):
+    """Test LRU eviction, promotion from disk and expiry"""
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path=path, memory_entries=1)
+    key_a = ResponseCache.make_key("gpt-4", 0.7, "prompt a", {"x": 1})
+    key_b = ResponseCache.make_key("gpt-4", 0.7, "prompt b", {"x": 1})
+
+    cache.set(key_a, _result("a"))
+    cache.set(key_b, _result("b"))  # pushes a out of memory
+    cache.set("expired", _result("old"), ttl_seconds=-1)
+
+    assert cache.get(key_a).text == "a"  # served from disk
+    assert cache.get("expired") is None
+    metrics = cache.metrics()
+    assert metrics["disk_hits"] == 1
+    assert metrics["misses"] == 1
+    assert metrics["hit_rate"] == 0.5
+
+    reopened = ResponseCache(path=path)
+    assert reopened.get(key_b).text == "b"
+
+
+def test_key_depends_on_research_data():
+    """Test that the same prompt with different research is a different entry"""
+    assert ResponseCache.make_key("gpt-4", 0.7, "p", {"a": 1}) != ResponseCache.make_key(
+        "gpt-4", 0.7, "p", {"a": 2}
+    )
+    assert ResponseCache.make_key("gpt-4", 0.7, "p", {"a": 1, "b": 2}) == ResponseCache.make_key(
+        "gpt-4", 0.7, "p", {"b": 2, "a": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_rerun_is_served_from_cache():
+    """Test that regenerating identical content makes no provider calls"""
+    provider = LocalFakeProvider()
+    agent = ContentAgent(provider=provider, cache=ResponseCache())
+
+    first = await agent.generate_content("topic_1", {"headline": "Launch"}, {})
+    calls = len(provider.calls)
+    second = await agent.generate_content("topic_1", {"headline": "Launch"}, {})
+
+    assert len(provider.calls) == calls
+    assert second.metadata["cache_hits"] == 3
+    assert [s.content for s in first.sections] == [s.content for s in second.sections]
@@ -0,0 +1,107 @@
+"""Tests for Semantic Cache"""
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent
+from src.execution.llm.providers import GenerationResult, LocalFakeProvider
+from src.execution.llm.semantic_cache import HashedNgramVectorizer, SemanticCache
+
+LAUNCH = (
+    "Write a short introduction. Topic: ai_models. Research: OpenAI released a new reasoning "
+    "model today with stronger coding benchmarks, lower prices and a larger context window."
+)
+
+
+def _result(text: str) -> GenerationResult:
+    return GenerationResult(text=text, model="gpt-4", provider="fake")
+
+
+def test_vectorizer_scores_near_duplicates_above_unrelated_text():
+    """Test that cosine similarity separates near-duplicates from unrelated prompts"""
+    vectorizer = HashedNgramVectorizer()
+    base = vectorizer.transform(LAUNCH)
+    near = vectorizer.transform(LAUNCH.replace("ai_models", "ai_tools"))
+    other = vectorizer.transform("Quarterly earnings for European banks beat analyst expectations.")
+
+    assert float(base @ base) == pytest.approx(1.0, abs=1e-5)
+    assert float(base @ near) > 0.9
+    assert float(base @ other) < 0.5
+
+
+def test_lookup_respects_threshold_namespace_and_bounds():
+    """Test hits, misses, namespace isolation and oldest-entry overwrite"""
+    cache = SemanticCache(threshold=0.9, max_entries=2)
+    cache.add(LAUNCH, _result("launch"), namespace="intro")
+
+    match = cache.lookup(LAUNCH.replace("ai_models", "ai_tools"), namespace="intro")
+    assert match is not None and match.result.text == "launch"
+    assert cache.lookup(LAUNCH, namespace="main") is None
+    assert cache.lookup("Completely different newsletter about gardening.", namespace="intro") is None
+
+    cache.add("first filler prompt about gardening", _result("a"))
+    cache.add("second filler prompt about cooking", _result("b"))  # overwrites the launch entry
+    assert cache.lookup(LAUNCH, namespace="intro") is None
+
+    metrics = cache.metrics()
+    assert metrics["entries"] == 2
+    assert metrics["hits"] == 1
+    assert metrics["hit_rate"] == pytest.approx(0.25)
+
+
+@pytest.mark.asyncio
+async def test_agent_reuses_output_for_near_duplicate_research():
+    """Test that refreshed research for the same topic makes no provider calls"""
+    provider = LocalFakeProvider()
+    agent = ContentAgent(
+        provider=provider, semantic_cache=SemanticCache(threshold=0.9, policy="reuse")
+    )
+
+    first = await agent.generate_content("ai_models", {"headline": LAUNCH}, {})
+    calls = len(provider.calls)
+    refreshed = {"headline": LAUNCH.replace("today", "this week")}
+    second = await agent.generate_content("ai_models", refreshed, {})
+
+    assert len(provider.calls) == calls
+    assert second.metadata["semantic_hits"] == 3
+    assert [s.content for s in first.sections] == [s.content for s in second.sections]
+
+
+@pytest.mark.asyncio
+async def test_other_topic_tone_or_language_is_never_reused():
+    """Test that requests differing only in topic, tone or language get their own output"""
+    provider = LocalFakeProvider()
+    agent = ContentAgent(
+        provider=provider, semantic_cache=SemanticCache(threshold=0.9, policy="reuse")
+    )
+    research = {"headline": LAUNCH}
+    first = await agent.generate_content("ai_models", research, {})
+
+    for topic_id, config in [
+        ("ai_models", {"language": "de"}),
+        ("ai_models", {"tone": "casual"}),
+        ("ai_tools", {}),
+    ]:
+        other = await agent.generate_content(topic_id, research, config)
+        assert other.metadata["semantic_hits"] == 0
+        assert [s.content for s in other.sections] != [s.content for s in first.sections]
+
+
+@pytest.mark.asyncio
+async def test_adapt_policy_sends_prior_output_as_draft():
+    """Test that the default adapt policy regenerates with the prior output in the prompt"""
+    provider = LocalFakeProvider()
+    agent = ContentAgent(provider=provider, semantic_cache=SemanticCache(threshold=0.9))
+
+    first = await agent.generate_content("ai_models", {"headline": LAUNCH}, {})
+    calls = len(provider.calls)
+    refreshed = {"headline": LAUNCH.replace("today", "this week")}
+    second = await agent.generate_content("ai_models", refreshed, {})
+
+    assert len(provider.calls) == calls + 3
+    assert second.metadata["semantic_hits"] == 3
+    assert first.sections[0].content != second.sections[0].content
+
+
+def test_unknown_policy_is_rejected():
+    """Test that an invalid policy raises ValueError"""
+    with pytest.raises(ValueError):
+        SemanticCache(policy="sometimes")
@@ -0,0 +1,78 @@
+"""Tests for LLM Stand-in Server"""
+
+import httpx
+import pytest
+from src.execution.llm.providers import (
+    AnthropicProvider,
+    GenerationRequest,
+    LocalFakeProvider,
+    OpenAIProvider,
+    ProviderError,
+)
+from src.execution.llm.standin_server import StandinConfig, create_app
+
+
+def _client(config: StandinConfig) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(config)))
+
+
+FAST = dict(latency_distribution="fixed", latency_median_seconds=0.0, tokens_per_second=1e6)
+
+
+@pytest.mark.asyncio
+async def test_openai_and_anthropic_providers_run_against_standin():
+    """Test that both providers parse the stand-in's responses, streamed or not"""
+    client = _client(StandinConfig(**FAST))
+    request = GenerationRequest(prompt="Summarize the launch", model="gpt-4", max_tokens=60)
+    expected = LocalFakeProvider()._complete(request).text
+
+    openai = OpenAIProvider(api_key="k", base_url="http://standin/v1", client=client)
+    anthropic = AnthropicProvider(api_key="k", base_url="http://standin", client=client)
+
+    assert (await openai.generate(request)).text == expected
+    assert "".join([c async for c in openai.stream(request)]) == expected
+    assert (await anthropic.generate(request)).text == expected
+    assert "".join([c async for c in anthropic.stream(request)]) == expected
+
+    stats = (await client.get("http://standin/stats")).json()
+    assert stats["requests"] == 4
+    assert stats["streamed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_and_token_rate_limit():
+    """Test injected 500s and 429s once the tokens-per-minute window is spent"""
+    request = GenerationRequest(prompt="Hi", model="gpt-4", max_tokens=100)
+
+    failing = OpenAIProvider(
+        api_key="k", base_url="http://standin/v1", client=_client(StandinConfig(**FAST, error_rate_500=1.0))
+    )
+    with pytest.raises(ProviderError) as error:
+        await failing.generate(request)
+    assert error.value.status_code == 500
+
+    limited = OpenAIProvider(
+        api_key="k",
+        base_url="http://standin/v1",
+        client=_client(StandinConfig(**FAST, tokens_per_minute=250)),
+    )
+    await limited.generate(request)
+    await limited.generate(request)
+    with pytest.raises(ProviderError) as error:
+        await limited.generate(request)
+    assert error.value.status_code == 429
+    assert error.value.retryable
+
+
+def test_latency_distributions_are_seeded():
+    """Test that latency samples follow the configured distribution deterministically"""
+    first = create_app(StandinConfig(latency_median_seconds=0.2, seed=7)).state.standin
+    second = create_app(StandinConfig(latency_median_seconds=0.2, seed=7)).state.standin
+    samples = [first.latency() for _ in range(200)]
+
+    assert samples == [second.latency() for _ in range(200)]
+    assert 0.15 < sorted(samples)[100] < 0.25
+    uniform = create_app(
+        StandinConfig(latency_distribution="uniform", latency_median_seconds=0.2, latency_spread=0.5)
+    ).state.standin
+    assert all(0.1 <= uniform.latency() <= 0.3 for _ in range(100))
@@ -0,0 +1,102 @@
+"""Tests for Autoscaler"""
+
+import asyncio
+import pytest
+from src.operational.autoscaler import (
+    Autoscaler,
+    LocalProcessProvisioner,
+    ScalingPolicy,
+)
+from src.operational.resource_scheduler import Resource, ResourceScheduler
+
+
+@pytest.mark.asyncio
+async def test_scale_up_requires_sustained_pressure():
+    """Test that scale-up waits for hysteresis and respects cooldown"""
+    scheduler = ResourceScheduler()
+    await scheduler.register_resource(
+        Resource(resource_id="content_1", resource_type="content", name="Content 1")
+    )
+    await scheduler.allocate_resource("generate_content", {"resource_type": "content"})
+
+    autoscaler = Autoscaler(
+        scheduler,
+        LocalProcessProvisioner(),
+        [ScalingPolicy(resource_type="content", min_resources=1, scale_up_evaluations=2)],
+    )
+
+    first = autoscaler.evaluate(now=0.0)[0]
+    second = autoscaler.evaluate(now=1.0)[0]
+
+    assert first.action == "hold"
+    assert first.reason == "scale_up_pending_hysteresis"
+    assert second.action == "scale_up"
+    assert second.delta == 1
+
+    autoscaler._last_scaled_at["content"] = 1.0
+    third = autoscaler.evaluate(now=2.0)[0]
+    assert third.reason == "scale_up_cooldown"
+
+
+@pytest.mark.asyncio
+async def test_local_provisioner_follows_demand():
+    """Test scaling up on queued demand and back down when idle"""
+    scheduler = ResourceScheduler()
+    provisioner = LocalProcessProvisioner()
+    policy = ScalingPolicy(
+        resource_type="compute",
+        min_resources=0,
+        scale_up_evaluations=1,
+        scale_down_evaluations=1,
+        scale_up_cooldown_seconds=0,
+        scale_down_cooldown_seconds=0,
+    )
+    autoscaler = Autoscaler(scheduler, provisioner, [policy])
+
+    try:
+        waiter = asyncio.create_task(
+            scheduler.acquire_resource("render", {"resource_type": "compute"}, timeout=5)
+        )
+        await asyncio.sleep(0.01)
+        assert scheduler.get_pool_stats()["compute"]["queue_depth"] == 1
+
+        applied = await autoscaler.run_once()
+        assert applied[0].action == "scale_up"
+        assert len(provisioner.processes) == 1
+
+        resource_id = await waiter
+        assert resource_id in scheduler.resources
+        await scheduler.release_resource(resource_id)
+
+        applied = await autoscaler.run_once()
+        assert applied[0].action == "scale_down"
+        assert scheduler.resources == {}
+        assert provisioner.processes == {}
+    finally:
+        await provisioner.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_past_waits_do_not_keep_scaling_up():
+    """Test wait samples from before a scaling action are not counted again"""
+    scheduler = ResourceScheduler()
+    await scheduler.register_resource(
+        Resource(resource_id="content_1", resource_type="content", name="Content 1")
+    )
+    scheduler._record_wait("content", 30.0)
+    autoscaler = Autoscaler(
+        scheduler,
+        LocalProcessProvisioner(),
+        [ScalingPolicy(resource_type="content", scale_up_evaluations=1, scale_up_cooldown_seconds=0)],
+    )
+    assert autoscaler.evaluate(now=0.0)[0].reason == "wait_p95"
+
+    autoscaler._last_scaled_at["content"] = 0.0
+    autoscaler._wait_cursor["content"] = scheduler.wait_sample_count("content")
+
+    decision = autoscaler.evaluate(now=1.0)[0]
+    assert decision.action == "hold"
+    assert decision.metrics["wait_p95_seconds"] == 0.0
+
+    scheduler._record_wait("content", 12.0)
+    assert autoscaler.evaluate(now=2.0)[0].action == "scale_up"
@@ -0,0 +1,120 @@
+"""Tests for Streaming Content Pipeline"""
+
+import asyncio
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent
+from src.execution.llm.providers import LocalFakeProvider
+from src.operational.content_pipeline import StreamingContentPipeline
+from src.operational.workflow_engine import TaskStatus, WorkflowEngine, WorkflowStatus
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reviews_and_formats_each_section():
+    """Test that every section is reviewed and formatted, in section order"""
+    reviewed = []
+
+    async def qa_stage(section):
+        reviewed.append(section.section_type)
+        return {"section_type": section.section_type, "passed": True}
+
+    pipeline = StreamingContentPipeline(
+        ContentAgent(provider=LocalFakeProvider()), qa_stage=qa_stage
+    )
+    result = await pipeline.run("topic_1", {"headline": "Launch"}, {})
+
+    assert sorted(reviewed) == ["action_items", "introduction", "main"]
+    assert [s["section_type"] for s in result["sections"]] == ["introduction", "main", "action_items"]
+    assert result["qa_passed"]
+    assert result["html"].count("<section>") == 3
+    assert 0 <= result["time_to_first_section_seconds"] <= result["total_seconds"]
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_streams_from_provider_and_reports_first_chunk():
+    """Test that stream_chunks uses provider streaming and times the first chunk"""
+    provider = LocalFakeProvider(latency_seconds=0.05)
+    pipeline = StreamingContentPipeline(ContentAgent(provider=provider), stream_chunks=True)
+    result = await pipeline.run("topic_1", {"headline": "Launch"}, {})
+
+    assert provider.calls == [1, 1, 1]  # one stream per section, nothing batched
+    assert len(result["sections"]) == 3
+    assert 0 < result["time_to_first_chunk_seconds"] < result["time_to_first_section_seconds"]
+
+
+@pytest.mark.asyncio
+async def test_register_routes_content_tasks_through_pipeline():
+    """Test that the pipeline handles generate_content, qa_review and format_email tasks"""
+    engine = WorkflowEngine()
+    StreamingContentPipeline(ContentAgent(provider=LocalFakeProvider())).register(engine)
+    workflow = await engine.create_workflow("content_generation", topic_id="topic_1")
+    generate, qa, format_email = workflow.tasks[1:4]
+
+    generate.output_data = await engine.task_handlers["generate_content"](workflow, generate)
+    qa.output_data = await engine.task_handlers["qa_review"](workflow, qa)
+    formatted = await engine.task_handlers["format_email"](workflow, format_email)
+
+    assert formatted["topic_id"] == "topic_1"
+    assert formatted["html"].startswith("<section>")
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_cancels_section_processing():
+    """Test sections still in QA are cancelled when generation fails"""
+    cancelled = []
+
+    async def qa_stage(section):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(section.section_type)
+            raise
+
+    class FailingAgent(ContentAgent):
+        async def stream_content(self, topic_id, research_data, config, include_chunks=False):
+            async for section in super().stream_content(topic_id, research_data, config):
+                yield section
+                await asyncio.sleep(0.01)  # let QA of the first section start
+                raise RuntimeError("provider went away")
+
+    pipeline = StreamingContentPipeline(FailingAgent(provider=LocalFakeProvider()), qa_stage=qa_stage)
+
+    with pytest.raises(RuntimeError):
+        await pipeline.run("topic_1", {}, {})
+    assert len(cancelled) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_qa_fails_workflow_without_sending():
+    """Test a QA failure is not retried, skips formatting and sending, and fails the workflow"""
+    engine = WorkflowEngine()
+    StreamingContentPipeline(ContentAgent(provider=LocalFakeProvider())).register(engine)
+    sent = []
+
+    async def research(workflow, task):
+        return {"research_data": {}}
+
+    async def generate(workflow, task):
+        return {"topic_id": "topic_1", "html": "<section>x</section>",
+                "qa": [{"section_type": "main", "passed": False}], "qa_passed": False}
+
+    async def send(workflow, task):
+        sent.append(task.task_id)
+        return {}
+
+    engine.register_handler("research", research)
+    engine.register_handler("generate_content", generate)
+    engine.register_handler("send_email", send)
+    engine.register_handler("track_delivery", send)
+    workflow = await engine.create_workflow("content_generation", topic_id="topic_1")
+
+    await engine._execute_workflow(workflow)
+
+    statuses = {t.task_type: t.status for t in workflow.tasks}
+    qa = next(t for t in workflow.tasks if t.task_type == "qa_review")
+    assert workflow.status == WorkflowStatus.FAILED
+    assert statuses["qa_review"] == TaskStatus.FAILED
+    assert qa.retry_count == 0
+    assert "main" in qa.error_message
+    assert statuses["format_email"] == statuses["send_email"] == TaskStatus.SKIPPED
+    assert sent == []
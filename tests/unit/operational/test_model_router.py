@@ -0,0 +1,103 @@
+"""Tests for Model Router"""
+
+import pytest
+from src.operational.model_router import ModelProfile, ModelRouter
+from src.operational.resource_scheduler import Resource, ResourceScheduler
+
+
+async def _router() -> ModelRouter:
+    scheduler = ResourceScheduler()
+    for model in ["gpt-4", "gpt-4o-mini"]:
+        await scheduler.register_resource(
+            Resource(
+                resource_id=f"llm_{model}",
+                resource_type="llm",
+                name=model,
+                metadata={"model": model},
+            )
+        )
+    return ModelRouter(
+        scheduler,
+        [
+            ModelProfile(
+                model="gpt-4",
+                quality_tier=3,
+                cost_per_1k_output_tokens=0.06,
+                expected_latency_seconds=8.0,
+            ),
+            ModelProfile(
+                model="gpt-4o-mini",
+                quality_tier=2,
+                cost_per_1k_output_tokens=0.0006,
+                expected_latency_seconds=2.0,
+            ),
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_routes_to_cheapest_model_meeting_tier_and_slo():
+    """Test that the cheap model wins unless the tier requires premium"""
+    router = await _router()
+
+    standard = await router.route("generate_content", {"quality_tier": 2, "latency_slo_seconds": 5})
+    premium = await router.route("generate_content", {"quality_tier": 3})
+
+    assert standard.model == "gpt-4o-mini"
+    assert standard.meets_slo
+    assert premium.model == "gpt-4"
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_model_saturated_and_learns_latency():
+    """Test fallback on saturation and that observed latency updates the profile"""
+    router = await _router()
+
+    first = await router.route("generate_content", {"quality_tier": 2, "latency_slo_seconds": 5})
+    second = await router.route("generate_content", {"quality_tier": 2, "latency_slo_seconds": 5})
+
+    assert first.model == "gpt-4o-mini"
+    assert second.model == "gpt-4"
+    assert second.reason == "fastest_fallback"
+
+    await router.record_outcome(first, latency_seconds=12.0, input_tokens=100, output_tokens=400)
+    assert router.profiles["gpt-4o-mini"].latency_p95() == 12.0
+    assert router.scheduler.resources["llm_gpt-4o-mini"].current_load == 0
+
+
+@pytest.mark.asyncio
+async def test_topic_budget_excludes_models():
+    """Test that a nearly spent topic budget leaves no eligible model"""
+    router = await _router()
+    router.set_topic_budget("topic_1", max_tokens=300)
+
+    decision = await router.route("generate_content", {"input_tokens": 100}, topic_id="topic_1")
+
+    assert decision is None
+
+
+@pytest.mark.asyncio
+async def test_llm_resource_without_model_metadata_is_not_routed_to():
+    """Test routing never lands on a resource that serves another or no model"""
+    scheduler = ResourceScheduler()
+    await scheduler.register_resource(Resource(resource_id="llm_bare", resource_type="llm", name="bare"))
+    router = ModelRouter(
+        scheduler,
+        [ModelProfile(model="gpt-4", quality_tier=3, cost_per_1k_output_tokens=0.06, expected_latency_seconds=8.0)],
+    )
+
+    assert await router.route("generate_content", {"quality_tier": 3}) is None
+    assert scheduler.resources["llm_bare"].current_load == 0
+
+
+@pytest.mark.asyncio
+async def test_route_reads_pool_state_once(monkeypatch):
+    """Test free capacity comes from one snapshot per route, not one per model"""
+    router = await _router()
+    snapshot = router.scheduler.state.snapshot
+    calls = []
+    monkeypatch.setattr(router.scheduler.state, "snapshot", lambda: calls.append(1) or snapshot())
+
+    await router.route("generate_content", {"quality_tier": 2})
+
+    assert len(calls) == 2  # capacity check and the allocation itself
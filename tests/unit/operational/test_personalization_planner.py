@@ -0,0 +1,110 @@
+"""Tests for Personalization Planner"""
+
+import pytest
+from src.execution.agents.content_agent import ContentAgent, ContentSection, GeneratedContent
+from src.execution.llm.providers import LocalFakeProvider
+from src.execution.llm.semantic_cache import SemanticCache
+from src.operational.personalization_planner import (
+    PersonalizationPlanner,
+    Subscriber,
+    apply_merge_fields,
+    render_template,
+)
+
+
+def _subscribers(count: int):
+    tones = ["professional", "conversational"]
+    return [
+        Subscriber(
+            subscriber_id=f"sub_{i}",
+            email=f"reader{i}@example.com",
+            name=f"Reader {i}" if i % 2 else None,
+            preferred_topics=["ai_models"] + (["fintech"] if i % 3 == 0 else []),
+            tone=tones[i % 2],
+            language="zh-TW",
+            frequency="daily" if i == 0 else "weekly",
+            merge_fields={"plan": "pro"},
+        )
+        for i in range(count)
+    ]
+
+
+def test_plan_groups_subscribers_into_variants():
+    """Test that variants are (topic, tone, language) segments"""
+    planner = PersonalizationPlanner(ContentAgent(provider=LocalFakeProvider()))
+
+    plan = planner.plan(_subscribers(30))
+
+    assert plan.subscriber_count == 30
+    assert plan.delivery_count == 40
+    assert plan.variant_count == 4
+    assert plan.fanout_ratio == 10
+    assert sum(len(v.subscriber_ids) for v in plan.variants) == plan.delivery_count
+
+    weekly_ai = planner.plan(_subscribers(30), topic_ids=["ai_models"], frequency="weekly")
+    assert weekly_ai.subscriber_count == 29
+    assert {v.topic_id for v in weekly_ai.variants} == {"ai_models"}
+
+
+@pytest.mark.asyncio
+async def test_run_generates_once_per_variant_and_merges_per_recipient():
+    """Test that generation scales with variants and merge fields are per recipient"""
+    provider = LocalFakeProvider()
+    planner = PersonalizationPlanner(ContentAgent(provider=provider))
+    research = {"ai_models": {"headline": "Launch"}, "fintech": {"headline": "Rates"}}
+
+    report = await planner.run(_subscribers(30), research)
+
+    assert report["variant_count"] == 4
+    assert report["delivery_count"] == 40
+    assert sum(provider.calls) == 4 * 3  # three sections per variant
+    deliveries = {(d.subscriber_id, d.topic_id): d for d in report["deliveries"]}
+    named = deliveries[("sub_1", "ai_models")]
+    assert named.body.startswith("Hi Reader 1,")
+    assert "reader1@example.com" in named.body
+    assert deliveries[("sub_2", "ai_models")].body.startswith("Hi reader2,")
+    # Same variant, same content apart from merge fields
+    assert named.body.replace("Reader 1", "X").replace("reader1", "y") == deliveries[
+        ("sub_3", "ai_models")
+    ].body.replace("Reader 3", "X").replace("reader3", "y")
+
+
+@pytest.mark.asyncio
+async def test_variants_differ_with_a_semantic_cache():
+    """Test that semantic reuse never hands one variant's text to another"""
+    agent = ContentAgent(
+        provider=LocalFakeProvider(), semantic_cache=SemanticCache(threshold=0.9, policy="reuse")
+    )
+    planner = PersonalizationPlanner(agent)
+    plan = planner.plan(
+        [
+            Subscriber(subscriber_id="a", email="a@example.com", preferred_topics=["ai_models"]),
+            Subscriber(subscriber_id="b", email="b@example.com", preferred_topics=["ai_models"],
+                       tone="casual"),
+            Subscriber(subscriber_id="c", email="c@example.com", preferred_topics=["ai_models"],
+                       language="en"),
+        ]
+    )
+
+    contents = await planner.generate(plan, {"ai_models": {"headline": "Launch " * 50}})
+
+    bodies = [tuple(s.content for s in c.sections) for c in contents.values()]
+    assert len(set(bodies)) == 3
+    assert all(c.metadata["semantic_hits"] == 0 for c in contents.values())
+
+
+def test_generated_text_is_not_merged():
+    """Test that {{...}} in generated content stays literal"""
+    content = GeneratedContent(
+        topic_id="ai_models",
+        sections=[ContentSection(section_type="main", title="Main {{name}}",
+                                 content="Reply to {{ email }} or {{{plan}}", word_count=5)],
+    )
+    subscriber = Subscriber(subscriber_id="a", email="a@example.com", name="Ann",
+                            merge_fields={"plan": "pro"})
+
+    body = apply_merge_fields(render_template(content), subscriber)
+
+    assert body.startswith("Hi Ann,")
+    assert "Main {{name}}\n\nReply to {{ email }} or {{{plan}}" in body
+    assert body.endswith("because a@example.com subscribed to ai_models.")
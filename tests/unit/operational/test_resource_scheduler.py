@@ -0,0 +1,111 @@
+"""Tests for Resource Scheduler"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.operational.resource_scheduler import Resource, ResourceScheduler
+from src.operational.scheduler_state import SQLiteStateBackend
+
+
+def _allocate_all(path: str, attempts: int) -> int:
+    """Grab as many slots as possible from a shared pool in a separate process"""
+    scheduler = ResourceScheduler(state=SQLiteStateBackend(path))
+
+    async def run() -> int:
+        won = 0
+        for _ in range(attempts):
+            if await scheduler.allocate_resource("generate_content", {}):
+                won += 1
+        return won
+
+    return asyncio.run(run())
+
+
+@pytest.mark.asyncio
+async def test_allocation_from_thread_pool_never_exceeds_capacity():
+    """Test that concurrent allocations from threads respect capacity"""
+    scheduler = ResourceScheduler()
+    await scheduler.register_resource(
+        Resource(resource_id="agent_1", resource_type="agent", name="Agent", capacity=50)
+    )
+
+    def allocate() -> bool:
+        return asyncio.run(scheduler.allocate_resource("generate_content", {})) is not None
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: allocate(), range(200)))
+
+    assert sum(results) == 50
+    assert scheduler.resources["agent_1"].current_load == 50
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_shares_pool_across_processes(tmp_path):
+    """Test that several processes sharing one SQLite pool never oversubscribe it"""
+    path = str(tmp_path / "scheduler.db")
+    scheduler = ResourceScheduler(state=SQLiteStateBackend(path))
+    await scheduler.register_resource(
+        Resource(resource_id="agent_1", resource_type="agent", name="Agent", capacity=30)
+    )
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        won = pool.starmap(_allocate_all, [(path, 20)] * 4)
+
+    assert sum(won) == 30
+    assert scheduler.resources["agent_1"].current_load == 30
+
+    await scheduler.release_resource("agent_1")
+    assert await scheduler.unregister_resource("agent_1", only_if_idle=True) is None
+    assert scheduler.resources["agent_1"].current_load == 29
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+@pytest.mark.asyncio
+async def test_resources_view_is_read_only_and_reregistering_keeps_load(tmp_path, backend):
+    """Test resources returns copies and re-registering never resets shared load"""
+    state = SQLiteStateBackend(str(tmp_path / "scheduler.db")) if backend == "sqlite" else None
+    scheduler = ResourceScheduler(state=state)
+    await scheduler.register_resource(
+        Resource(resource_id="agent_1", resource_type="agent", name="Agent", capacity=3)
+    )
+    await scheduler.allocate_resource("generate_content", {})
+
+    scheduler.resources["agent_1"].current_load = 3
+    with pytest.raises(TypeError):
+        scheduler.resources["agent_2"] = Resource(resource_id="agent_2", resource_type="agent", name="X")
+    assert scheduler.resources["agent_1"].current_load == 1
+
+    await scheduler.register_resource(
+        Resource(resource_id="agent_1", resource_type="agent", name="Renamed", capacity=5)
+    )
+    assert scheduler.resources["agent_1"].name == "Renamed"
+    assert scheduler.resources["agent_1"].capacity == 5
+    assert scheduler.resources["agent_1"].current_load == 1
+
+
+def test_wait_samples_are_trimmed_without_polling():
+    """Test that recording waits drops expired samples even if nobody reads the stats"""
+    scheduler = ResourceScheduler(wait_sample_window_seconds=0.0)
+    for _ in range(1000):
+        scheduler._record_wait("agent", 0.1)
+
+    assert len(scheduler._wait_samples["agent"]) < 10  # only samples sharing the latest timestamp
+    assert scheduler.wait_sample_count("agent") == 1000
+
+
+@pytest.mark.asyncio
+async def test_memory_snapshot_is_detached_from_live_state():
+    """Test that snapshot copies do not change when resources are acquired"""
+    scheduler = ResourceScheduler()
+    await scheduler.register_resource(
+        Resource(resource_id="agent_1", resource_type="agent", name="Agent", capacity=2)
+    )
+    snapshot = scheduler.state.snapshot()
+
+    assert scheduler.state.try_acquire("agent_1")
+    assert snapshot["agent_1"].current_load == 0
+
+    snapshot["agent_1"].current_load = 2
+    assert scheduler.state.get("agent_1").current_load == 1
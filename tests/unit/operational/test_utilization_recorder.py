@@ -0,0 +1,78 @@
+"""Tests for Utilization Recorder"""
+
+import pytest
+from src.operational.resource_scheduler import Resource, ResourceScheduler
+from src.operational.utilization_recorder import UtilizationRecorder
+
+
+@pytest.mark.asyncio
+async def test_sample_query_and_saturation_report():
+    """Test recording samples at several resolutions and summarizing them"""
+    recorder = UtilizationRecorder()
+    scheduler = ResourceScheduler(recorder=recorder)
+    await scheduler.register_resource(
+        Resource(resource_id="agent_1", resource_type="agent", name="Agent", capacity=2)
+    )
+
+    base = 1_700_000_000.0
+    recorder.sample(scheduler, now=base)
+    await scheduler.allocate_resource("generate_content", {})
+    await scheduler.allocate_resource("generate_content", {})
+    recorder.sample(scheduler, now=base + 1)
+    recorder.sample(scheduler, now=base + 61)
+
+    per_second = recorder.query("utilization", "agent", resolution="1s", now=base + 61)
+    per_minute = recorder.query("utilization", "agent", resolution="1m", now=base + 61)
+    per_resource = recorder.query(
+        "utilization", "agent_1", scope="resource", resolution="1h", now=base + 61
+    )
+
+    assert [p.avg for p in per_second] == [0.0, 1.0, 1.0]
+    assert len(per_minute) == 2
+    assert per_resource[0].max == 1.0
+
+    report = recorder.saturation_report(resolution="1s", window_seconds=120, now=base + 61)
+    assert report["agent"]["peak_utilization"] == 1.0
+    assert report["agent"]["saturated_fraction"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_ring_buffer_is_bounded_and_prometheus_export():
+    """Test that old buckets are overwritten and the latest values are exported"""
+    recorder = UtilizationRecorder(resolutions={"1s": (1, 10)})
+
+    for second in range(25):
+        recorder.record("type", "agent", "queue_length", second, now=float(second))
+    recorder.record_wait("agent", 0.25)
+
+    points = recorder.query("queue_length", "agent", resolution="1s", now=24.0)
+    assert [p.avg for p in points] == list(range(15, 25))
+
+    text = recorder.render_prometheus()
+    assert "# TYPE newsletter_pool_queue_length gauge" in text
+    assert 'newsletter_pool_queue_length{resource_type="agent"} 24' in text
+    assert 'newsletter_pool_wait_seconds{resource_type="agent"} 0.25' in text
+
+
+@pytest.mark.asyncio
+async def test_series_of_removed_and_idle_resources_are_dropped():
+    """Test unregistered resources and stale series do not accumulate"""
+    recorder = UtilizationRecorder(stale_after_seconds=60)
+    scheduler = ResourceScheduler(recorder=recorder)
+    base = 1_700_000_000.0
+    for i in range(3):
+        await scheduler.register_resource(
+            Resource(resource_id=f"auto_{i}", resource_type="agent", name="Auto")
+        )
+    recorder.sample(scheduler, now=base)
+
+    await scheduler.unregister_resource("auto_0")
+    assert recorder.query("utilization", "auto_0", scope="resource", now=base) == []
+    assert 'resource_id="auto_0"' not in recorder.render_prometheus()
+
+    recorder.record("resource", "ghost", "utilization", 0.5, now=base)
+    recorder.sample(scheduler, now=base + 120)
+
+    assert recorder.query("utilization", "ghost", scope="resource", now=base + 120) == []
+    assert len(recorder.query("utilization", "auto_1", scope="resource", now=base + 120)) == 2
+    assert len(recorder._series) == 4  # auto_1, auto_2, agent utilization and queue length
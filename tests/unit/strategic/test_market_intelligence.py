@@ -0,0 +1,224 @@
+"""Tests for Market Intelligence Engine"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+from src.strategic.market_intelligence import MarketIntelligenceEngine, MarketSignal
+from src.strategic.source_fetchers import SourceFetcher, SourceItem
+
+
+class PagedFetcher(SourceFetcher):
+    """Fetcher yielding fixed pages, each after a delay"""
+
+    def __init__(self, name, pages, delay=0.0):
+        self.name = name
+        self._pages = pages
+        self.delay = delay
+        self.pages_served = 0
+
+    async def fetch(self, pool, since=None, seen_ids=()):
+        return [item async for page in self.pages(pool) for item in page]
+
+    async def pages(self, pool, since=None, seen_ids=()):
+        for titles in self._pages:
+            await asyncio.sleep(self.delay)
+            self.pages_served += 1
+            yield [
+                SourceItem(source=self.name, item_id=title, title=title, relevance_score=0.9,
+                           published_at=datetime(2026, 1, 12, tzinfo=timezone.utc))
+                for title in titles
+            ]
+
+
+def _engine(*fetchers):
+    return MarketIntelligenceEngine(
+        enabled_sources=[f.name for f in fetchers], fetchers={f.name: f for f in fetchers}
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_scan_yields_fast_sources_first():
+    """Test batches arrive per source as they complete"""
+    slow = PagedFetcher("slow", [["Slow story"]], delay=0.2)
+    fast = PagedFetcher("fast", [["Fast one"], ["Fast two"]])
+    engine = _engine(slow, fast)
+
+    batches = [[s.source for s in batch] async for batch in engine.stream_scan()]
+
+    assert batches == [["fast"], ["fast"], ["slow"]]
+
+
+@pytest.mark.asyncio
+async def test_stream_scan_buffers_a_bounded_number_of_batches():
+    """Test producers wait for the consumer, and unread batches stay unwatermarked"""
+    fetcher = PagedFetcher("paged", [[f"story {i}"] for i in range(10)])
+    engine = _engine(fetcher)
+
+    stream = engine.stream_scan(max_buffered_batches=2)
+    first = await stream.__anext__()
+    await asyncio.sleep(0.05)
+    served = fetcher.pages_served
+    await stream.aclose()
+
+    assert first[0].topic == "story 0"
+    assert served <= 4
+    assert list(engine.watermarks.get("paged").seen) == ["story 0"]
+
+
+@pytest.mark.asyncio
+async def test_identify_opportunities_stream_matches_batch_analysis():
+    """Test incremental clustering gives the same opportunities as the list API"""
+    titles = ["AI agents"] * 9 + ["Quantum chips"] * 8
+    engine = _engine()
+    signals = [
+        engine._item_to_signal(SourceItem(source="test", item_id=str(i), title=title, relevance_score=0.9))
+        for i, title in enumerate(titles)
+    ]
+
+    async def batches():
+        for start in range(0, len(signals), 4):
+            yield signals[start:start + 4]
+
+    streamed = await engine.identify_opportunities_stream(batches(), existing_topics=["Quantum chips"])
+    listed = await engine.identify_opportunities(signals, existing_topics=["Quantum chips"])
+
+    assert [o.topic_name for o in streamed] == [o.topic_name for o in listed] == ["AI agents"]
+    assert streamed[0].confidence_score == listed[0].confidence_score
+
+
+class FailingFetcher(SourceFetcher):
+    """Fetcher raising until told to recover"""
+
+    name = "flaky"
+
+    def __init__(self):
+        self.calls = 0
+        self.broken = True
+
+    async def fetch(self, pool, since=None, seen_ids=()):
+        self.calls += 1
+        if self.broken:
+            raise RuntimeError("upstream down")
+        return [SourceItem(source=self.name, item_id=str(self.calls), title="Recovered")]
+
+
+@pytest.mark.asyncio
+async def test_slow_source_is_cut_off_at_its_deadline():
+    """Test a hanging source keeps its early pages and does not hold up the scan"""
+    hanging = PagedFetcher("hanging", [])
+
+    async def pages(pool, since=None, seen_ids=()):
+        yield [SourceItem(source="hanging", item_id="early", title="Early page")]
+        await asyncio.sleep(60)
+        yield []
+
+    hanging.pages = pages
+    fast = PagedFetcher("fast", [["Fast story"]])
+    engine = _engine(hanging, fast)
+    engine.source_timeouts = {"hanging": 0.1}
+
+    result = await asyncio.wait_for(engine.run_scan(), timeout=5)
+
+    assert sorted(s.topic for s in result.signals) == ["Early page", "Fast story"]
+    assert result.sources_used == ["fast"]
+    assert result.sources_timed_out == ["hanging"]
+    assert engine.source_health["hanging"].timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_then_probes_half_open():
+    """Test repeated failures skip a source until a probe succeeds"""
+    flaky = FailingFetcher()
+    engine = _engine(flaky)
+    engine.failure_threshold = 2
+    engine.breaker_cooldown_seconds = 0.05
+
+    for _ in range(3):
+        result = await engine.run_scan()
+    assert flaky.calls == 2
+    assert result.sources_skipped == ["flaky"]
+    assert engine.source_health["flaky"].state == "open"
+
+    await asyncio.sleep(0.06)
+    result = await engine.run_scan()  # failed probe reopens straight away
+    assert result.sources_failed == ["flaky"]
+    assert engine.source_health["flaky"].state == "open"
+
+    await asyncio.sleep(0.06)
+    flaky.broken = False
+    result = await engine.run_scan()
+    health = engine.source_health["flaky"]
+    assert result.sources_used == ["flaky"]
+    assert [s.topic for s in result.signals] == ["Recovered"]
+    assert health.state == "closed"
+    assert health.history == ["failed", "failed", "skipped", "failed", "used"]
+
+
+def _clusters(n, max_size=12):
+    """n clusters of 1-max_size signals with varied sentiment and relevance"""
+    clusters = {}
+    for c in range(n):
+        size = (c * 7) % max_size + 1
+        signals = [
+            MarketSignal(
+                signal_id=f"s{c}_{i}",
+                signal_type="trend",
+                source="news_api",
+                topic=f"Topic {c}",
+                keywords=["AI"],
+                sentiment=((c + i) % 5) / 2 - 1,
+                relevance_score=((c * 3 + i) % 10) / 9,
+            )
+            for i in range(size)
+        ]
+        clusters[f"c{c}"] = (f"Topic {c}", signals)
+    return clusters
+
+
+@pytest.mark.asyncio
+async def test_batch_scoring_matches_per_cluster_evaluation():
+    """Test the vectorized ranking agrees with evaluating clusters one by one"""
+    engine = _engine()
+    clusters = _clusters(200)
+
+    ranked = await engine._rank_opportunities(clusters, existing_topics=["Topic 3"])
+
+    expected = []
+    for label, signals in clusters.values():
+        if label == "Topic 3":
+            continue
+        opportunity = await engine._evaluate_topic_opportunity(label, signals)
+        if opportunity.confidence_score >= 0.6:
+            expected.append(opportunity)
+    expected.sort(key=lambda o: o.confidence_score, reverse=True)
+    assert [o.topic_name for o in ranked] == [o.topic_name for o in expected]
+    for got, want in zip(ranked, expected):
+        assert got.confidence_score == pytest.approx(want.confidence_score)
+        assert got.recommended_action == want.recommended_action
+        assert got.market_size_estimate == want.market_size_estimate
+        assert got.cluster_id == f"c{got.topic_name.split()[1]}"
+
+
+@pytest.mark.asyncio
+async def test_batch_scoring_keeps_top_k_of_many_clusters(monkeypatch):
+    """Test a limit keeps the best clusters and only those are materialized"""
+    engine = _engine()
+    clusters = _clusters(50_000, max_size=3)
+    full = await engine._rank_opportunities(clusters, existing_topics=[])
+
+    built, labelled = [], []
+    build, labels = engine._build_opportunity, engine.trend_engine.labels
+    monkeypatch.setattr(engine, "_build_opportunity", lambda *a: built.append(a[0]) or build(*a))
+    monkeypatch.setattr(
+        engine.trend_engine, "labels", lambda ids, *a: labelled.extend(ids) or labels(ids, *a)
+    )
+    started = time.perf_counter()
+    top = await engine._rank_opportunities(clusters, existing_topics=[], limit=25)
+    elapsed = time.perf_counter() - started
+
+    assert len(top) == 25
+    assert len(built) == 25 and len(labelled) == 25
+    assert [o.confidence_score for o in top] == [o.confidence_score for o in full[:25]]
+    assert elapsed < 2.0
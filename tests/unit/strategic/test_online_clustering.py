@@ -0,0 +1,116 @@
+"""Tests for Online Topic Clustering"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from src.strategic.market_intelligence import MarketIntelligenceEngine, MarketSignal
+from src.strategic.online_clustering import OnlineTopicClusterer
+
+
+def test_state_persists_between_runs(tmp_path):
+    """Test a reloaded clusterer keeps assigning to the same clusters"""
+    path = str(tmp_path / "clusters.db")
+    clusterer = OnlineTopicClusterer(path=path)
+    healthcare = clusterer.assign("AI in Healthcare")
+    assert clusterer.assign("Healthcare AI startups") == healthcare
+    rust = clusterer.assign("Rust in the Linux kernel")
+    assert rust != healthcare
+    clusterer.save()
+
+    reloaded = OnlineTopicClusterer(path=path)
+
+    assert reloaded.assign("Healthcare AI regulation") == healthcare
+    assert reloaded.assign("Linux kernel adopts Rust") == rust
+    assert reloaded.centroids[healthcare].count == 3
+    assert reloaded.metrics()["assigned"] == 2
+
+
+def test_converged_clusters_merge():
+    """Test maintenance merges clusters whose centroids became similar"""
+    clusterer = OnlineTopicClusterer(threshold=0.95, merge_threshold=0.5)
+    first = clusterer.assign("AI healthcare startups")
+    second = clusterer.assign("Healthcare AI startups funding")
+    assert first != second
+
+    assert clusterer.maintain() == {"merged": 1, "split": 0, "expired": 0}
+    assert clusterer.resolve(first) == clusterer.resolve(second)
+    assert clusterer.centroids[clusterer.resolve(first)].count == 2
+
+
+def test_drifting_cluster_splits():
+    """Test an incoherent cluster is split into its two topics"""
+    clusterer = OnlineTopicClusterer(threshold=0.05, split_cohesion=0.8, min_split_size=4)
+    ids = {clusterer.assign(t) for t in ["apple fruit orchard harvest", "apple iphone launch event"] * 10}
+    assert len(ids) == 1
+
+    assert clusterer.maintain() == {"merged": 0, "split": 1, "expired": 0}
+    labels = sorted(c.label for c in clusterer.centroids.values())
+    assert labels == ["apple fruit orchard harvest", "apple iphone launch event"]
+    assert clusterer.assign("apple iphone launch") != clusterer.assign("apple orchard harvest")
+
+
+@pytest.mark.asyncio
+async def test_engine_keeps_cluster_ids_across_scans(tmp_path):
+    """Test the online mode gives a topic the same id in every scan"""
+    path = str(tmp_path / "clusters.db")
+
+    def signals(prefix):
+        return [
+            MarketSignal(signal_id=f"{prefix}{i}", signal_type="trend", source="news_api", topic=topic,
+                         keywords=[], sentiment=0.5, relevance_score=0.9)
+            for i, topic in enumerate(["AI in Healthcare", "Healthcare AI", "AI healthcare startups"] * 3)
+        ]
+
+    async def batches(items):
+        for start in range(0, len(items), 4):
+            yield items[start:start + 4]
+
+    first = await MarketIntelligenceEngine(
+        fetchers={}, online_clusterer=OnlineTopicClusterer(path=path)
+    ).identify_opportunities_stream(batches(signals("a")), existing_topics=[])
+    second = await MarketIntelligenceEngine(
+        fetchers={}, online_clusterer=OnlineTopicClusterer(path=path)
+    ).identify_opportunities_stream(batches(signals("b")), existing_topics=[])
+
+    assert len(first) == len(second) == 1
+    assert first[0].cluster_id == second[0].cluster_id
+    assert len(second[0].supporting_signals) == 9
+
+
+def test_idle_clusters_expire_with_their_terms(tmp_path):
+    """Test idle clusters, their aliases and unused terms are dropped, also on disk"""
+    path = str(tmp_path / "clusters.db")
+    clusterer = OnlineTopicClusterer(path=path, threshold=0.95, merge_threshold=0.5, idle_ttl_seconds=3600)
+    old = clusterer.assign("Rust in the Linux kernel")
+    assert clusterer.assign("Linux kernel Rust drivers") != old
+    clusterer.maintain()
+    clusterer.save()
+    assert len(clusterer.aliases) == 1
+
+    later = datetime.utcnow() + timedelta(hours=2)
+    fresh = clusterer.assign("AI healthcare startups")
+    clusterer.centroids[fresh].updated_at = later
+    assert clusterer.maintain(now=later)["expired"] == 1
+    clusterer.save()
+
+    reloaded = OnlineTopicClusterer(path=path)
+    for state in (clusterer, reloaded):
+        assert list(state.centroids) == [fresh]
+        assert state.aliases == {}
+        assert sorted(state.vectorizer.vocabulary) == ["ai", "healthcare", "startup"]
+        assert state.terms(fresh) == clusterer.terms(fresh)
+    assert reloaded.assign("Healthcare AI startups funding") == fresh
+
+
+def test_save_writes_only_changes(tmp_path):
+    """Test saving after one assignment costs rows for that cluster, not the history"""
+    clusterer = OnlineTopicClusterer(path=str(tmp_path / "clusters.db"))
+    for i in range(200):
+        clusterer.assign(f"topic{i} story{i}")
+    clusterer.save()
+    before = clusterer._conn.total_changes
+
+    clusterer.assign("topic7 story7")
+    clusterer.save()
+
+    assert clusterer._conn.total_changes - before == 4  # centroid, two terms, document count
@@ -0,0 +1,88 @@
+"""Tests for Scan State"""
+
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from src.strategic.market_intelligence import MarketIntelligenceEngine
+from src.strategic.scan_state import WatermarkStore
+from src.strategic.source_fetchers import FetchPool, HackerNewsFetcher, SourceFetcher, SourceItem
+
+NOW = datetime(2026, 1, 12, 9, 0, tzinfo=timezone.utc)
+
+
+class StaticFetcher(SourceFetcher):
+    """Fetcher returning whatever items the test sets"""
+
+    name = "static"
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    async def fetch(self, pool, since=None, seen_ids=()):
+        self.calls.append(since)
+        return list(self.items)
+
+
+def _item(item_id, title, hours_ago=0):
+    return SourceItem(source="static", item_id=item_id, title=title,
+                      published_at=NOW - timedelta(hours=hours_ago))
+
+
+def _engine(fetcher, store):
+    return MarketIntelligenceEngine(
+        enabled_sources=["static"], fetchers={"static": fetcher}, watermarks=store
+    )
+
+
+@pytest.mark.asyncio
+async def test_rescan_only_emits_new_and_updated_items(tmp_path):
+    """Test watermark classification, persisted across engine instances"""
+    path = str(tmp_path / "watermarks.json")
+    fetcher = StaticFetcher([_item("a", "AI agents ship"), _item("b", "GPU prices fall", 1)])
+
+    first = await _engine(fetcher, WatermarkStore(path)).run_scan()
+    assert (first.new, first.updated, first.skipped) == (2, 0, 0)
+
+    fetcher.items = [
+        _item("a", "AI agents ship"),
+        _item("b", "GPU prices fall sharply", 1),
+        _item("c", "Open model release"),
+        _item("old", "Last year's news", 48),
+    ]
+    second = await _engine(fetcher, WatermarkStore(path)).run_scan()
+
+    assert (second.new, second.updated, second.skipped) == (1, 1, 2)
+    assert second.sources["static"] == {"new": 1, "updated": 1, "skipped": 2}
+    assert sorted(s.topic for s in second.signals) == ["GPU prices fall sharply", "Open model release"]
+    assert fetcher.calls[1] == NOW
+
+
+def test_tracked_items_are_bounded():
+    """Test only the most recent items keep digests"""
+    store = WatermarkStore(max_tracked=2)
+    store.advance("static", [_item("a", "one"), _item("b", "two")])
+    store.advance("static", [_item("c", "three")])
+
+    assert list(store.get("static").seen) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_hackernews_skips_seen_story_requests():
+    """Test seen story ids are not fetched again"""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        if request.url.path == "/v0/topstories.json":
+            return httpx.Response(200, json=[1, 2, 3])
+        item_id = int(request.url.path.rsplit("/", 1)[1].split(".")[0])
+        return httpx.Response(200, json={"id": item_id, "type": "story", "title": f"Story {item_id}",
+                                         "score": 10, "time": 1768208400})
+
+    pool = FetchPool(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    items = await HackerNewsFetcher(base_url="https://hn.test/v0").fetch(pool, seen_ids={"1", "3"})
+
+    assert [i.item_id for i in items] == ["2"]
+    assert requested == ["/v0/topstories.json", "/v0/item/2.json"]
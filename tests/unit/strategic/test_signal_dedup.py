@@ -0,0 +1,99 @@
+"""Tests for Signal Deduplication"""
+
+import random
+import string
+
+import pytest
+from src.strategic.market_intelligence import MarketIntelligenceEngine
+from src.strategic.signal_dedup import NearDuplicateIndex
+from src.strategic.source_fetchers import SourceFetcher, SourceItem
+
+
+class StaticFetcher(SourceFetcher):
+    """Fetcher returning fixed items"""
+
+    def __init__(self, name, items):
+        self.name = name
+        self.items = items
+
+    async def fetch(self, pool, since=None, seen_ids=()):
+        return [
+            SourceItem(source=self.name, item_id=item_id, title=title, url=f"https://{self.name}.test/{item_id}",
+                       relevance_score=score)
+            for item_id, title, score in self.items
+        ]
+
+
+def test_index_matches_rewordings_only():
+    """Test paraphrased titles match and unrelated ones do not"""
+    index = NearDuplicateIndex()
+    index.match_or_add("OpenAI launches GPT-5 reasoning model", "first")
+
+    assert index.match_or_add("OpenAI launches GPT-5, its new reasoning model", "second")[0] == "first"
+    assert index.match_or_add("Apple unveils new iPad", "ipad") == ("ipad", None)
+    assert index.match_or_add("Apple unveils new iPhone", "iphone") == ("iphone", None)
+    assert index.metrics()["entries"] == 3
+
+
+def test_index_cost_does_not_grow_with_size():
+    """Test lookups only check bucket candidates, and the index stays bounded"""
+    rng = random.Random(0)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(6)) for _ in range(2000)]
+    index = NearDuplicateIndex(max_entries=5000)
+    for i in range(6000):
+        index.match_or_add(" ".join(rng.sample(vocabulary, 6)), i)
+
+    metrics = index.metrics()
+    assert metrics["entries"] == 5000
+    assert metrics["evicted"] == 1000
+    assert metrics["avg_candidates"] < 5
+
+
+@pytest.mark.asyncio
+async def test_scan_merges_cross_source_duplicates():
+    """Test the same story from two sources becomes one signal with provenance"""
+    news = StaticFetcher("news_api", [("n1", "OpenAI launches GPT-5 reasoning model", 0.6)])
+    hn = StaticFetcher("hackernews", [
+        ("h1", "OpenAI launches GPT-5, its new reasoning model", 0.9),
+        ("h2", "Rust lands in the Linux kernel", 0.5),
+    ])
+    engine = MarketIntelligenceEngine(
+        enabled_sources=["news_api", "hackernews"], fetchers={"news_api": news, "hackernews": hn}
+    )
+
+    result = await engine.run_scan()
+
+    assert result.duplicates == 1
+    assert len(result.signals) == 2
+    merged = next(s for s in result.signals if "OpenAI" in s.topic)
+    assert merged.metadata["sources"] == ["hackernews", "news_api"]
+    assert len(merged.metadata["provenance"]) == 2
+    assert merged.relevance_score == 0.9
+
+
+@pytest.mark.asyncio
+async def test_story_repeated_in_later_scan_is_still_reported():
+    """Test a duplicate of an earlier scan's story keeps the story in the new scan"""
+    news = StaticFetcher("news_api", [("n1", "OpenAI launches GPT-5 reasoning model", 0.6)])
+    hn = StaticFetcher("hackernews", [])
+    engine = MarketIntelligenceEngine(
+        enabled_sources=["news_api", "hackernews"], fetchers={"news_api": news, "hackernews": hn}
+    )
+    await engine.run_scan()
+
+    hn.items = [("h1", "OpenAI launches GPT-5, its new reasoning model", 0.9)]
+    result = await engine.run_scan()
+
+    assert result.duplicates == 1
+    assert [s.signal_id for s in result.signals] == ["news_api_n1"]
+    assert result.signals[0].metadata["sources"] == ["hackernews", "news_api"]
+
+
+def test_index_forgets_stories_older_than_ttl():
+    """Test that entries past ttl_seconds no longer match"""
+    index = NearDuplicateIndex(ttl_seconds=60)
+    index.match_or_add("OpenAI launches GPT-5 reasoning model", "first", now=0.0)
+
+    assert index.match_or_add("OpenAI launches GPT-5 reasoning model", "again", now=30.0)[0] == "first"
+    assert index.match_or_add("OpenAI launches GPT-5 reasoning model", "later", now=61.0) == ("later", None)
+    assert index.metrics()["entries"] == 1
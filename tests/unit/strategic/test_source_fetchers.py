@@ -0,0 +1,185 @@
+"""Tests for Source Fetchers"""
+
+from datetime import datetime, timezone
+import time
+
+import httpx
+import pytest
+from src.common import two_tier_cache
+from src.strategic.market_intelligence import MarketIntelligenceEngine
+from src.strategic.source_fetchers import (
+    FetchPool,
+    HackerNewsFetcher,
+    NewsAPIFetcher,
+    RedditFetcher,
+    RSSFetcher,
+    ValidatorCache,
+)
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Tech</title>
+<item><guid>a1</guid><title>OpenAI launches new reasoning model</title><link>https://t.test/a1</link>
+<description>Record benchmark results</description><pubDate>Mon, 12 Jan 2026 09:00:00 GMT</pubDate></item>
+<item><guid>a2</guid><title>Chipmaker warns of layoffs</title><link>https://t.test/a2</link></item>
+</channel></rss>"""
+
+
+class Fixtures:
+    """Local HTTP stand-ins for the real sites"""
+
+    def __init__(self):
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/feed.xml":
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, content=RSS, headers={"ETag": '"v1"'})
+        if path == "/r/technology/hot.json":
+            children = [{"data": {"id": "p1", "title": "AI tools for product managers", "ups": 1200,
+                                  "num_comments": 80, "created_utc": 1768208400, "subreddit": "technology"}}]
+            return httpx.Response(200, json={"data": {"children": children}},
+                                  headers={"Last-Modified": "Mon, 12 Jan 2026 09:00:00 GMT"})
+        if path == "/v2/everything":
+            if request.headers.get("if-none-match") == '"n1"':
+                return httpx.Response(304)
+            articles = [{"url": "https://n.test/new", "title": "New chip", "publishedAt": "2026-01-12T09:00:00Z"},
+                        {"url": "https://n.test/old", "title": "Old chip", "publishedAt": "2026-01-10T09:00:00Z"}]
+            return httpx.Response(200, json={"articles": articles}, headers={"ETag": '"n1"'})
+        if path == "/v0/topstories.json":
+            return httpx.Response(200, json=[1, 2])
+        if path.startswith("/v0/item/"):
+            item_id = int(path.rsplit("/", 1)[1].split(".")[0])
+            title = {1: "Cutting cloud costs with spot instances", 2: "Rust lands in the Linux kernel"}[item_id]
+            return httpx.Response(200, json={"id": item_id, "type": "story", "title": title,
+                                             "score": 300, "descendants": 40, "time": 1768208400})
+        return httpx.Response(404)
+
+
+def _pool(fixtures: Fixtures, cache: ValidatorCache = None) -> FetchPool:
+    return FetchPool(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(fixtures.handler)),
+        cache=cache,
+        source_concurrency={"hackernews": 1},
+    )
+
+
+@pytest.mark.asyncio
+async def test_unchanged_feed_costs_a_304(tmp_path):
+    """Test conditional GET reuse of the parsed feed, also after a restart"""
+    fixtures = Fixtures()
+    path = str(tmp_path / "validators.db")
+    fetcher = RSSFetcher(["https://t.test/feed.xml"])
+    pool = _pool(fixtures, ValidatorCache(path))
+
+    first = await fetcher.fetch(pool)
+    second = await fetcher.fetch(pool)
+
+    assert [i.item_id for i in first] == ["a1", "a2"]
+    assert second == first
+    assert fixtures.requests[1].headers["if-none-match"] == '"v1"'
+    assert pool.metrics()["rss_feeds"]["not_modified"] == 1
+    assert pool.metrics()["rss_feeds"]["downloaded_bytes"] == len(RSS)
+
+    restarted = _pool(fixtures, ValidatorCache(path))
+    assert await fetcher.fetch(restarted) == first
+    assert restarted.metrics()["rss_feeds"]["not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_scan_market_uses_real_fetchers():
+    """Test that scan_market turns fetched items into signals"""
+    fixtures = Fixtures()
+    engine = MarketIntelligenceEngine(
+        enabled_sources=["reddit", "hackernews", "rss_feeds"],
+        fetchers={
+            "reddit": RedditFetcher(["technology"], base_url="https://reddit.test"),
+            "hackernews": HackerNewsFetcher(base_url="https://hn.test/v0"),
+            "rss_feeds": RSSFetcher(["https://t.test/feed.xml"]),
+        },
+        fetch_pool=_pool(fixtures),
+    )
+
+    signals = await engine.scan_market()
+
+    by_id = {s.signal_id: s for s in signals}
+    assert set(by_id) == {"reddit_p1", "hackernews_1", "hackernews_2", "rss_feeds_a1", "rss_feeds_a2"}
+    assert by_id["reddit_p1"].signal_type == "opportunity"
+    assert by_id["reddit_p1"].metadata["upvotes"] == 1200
+    assert by_id["rss_feeds_a1"].sentiment > 0
+    assert by_id["rss_feeds_a2"].sentiment < 0
+    assert "OpenAI" in by_id["rss_feeds_a1"].keywords
+    assert 0 < by_id["hackernews_1"].relevance_score < 1
+
+
+@pytest.mark.asyncio
+async def test_unconfigured_source_yields_no_signals():
+    """Test that a source without a fetcher (e.g. no NEWS_API_KEY) is skipped"""
+    engine = MarketIntelligenceEngine(enabled_sources=["news_api"], fetchers={}, fetch_pool=_pool(Fixtures()))
+
+    assert await engine.scan_market() == []
+
+
+@pytest.mark.asyncio
+async def test_failed_subreddit_does_not_drop_the_others():
+    """Test that one failing subreddit is skipped like a failed feed"""
+    fetcher = RedditFetcher(["missing", "technology"], base_url="https://reddit.test")
+    pool = _pool(Fixtures())
+
+    items = await fetcher.fetch(pool)
+
+    assert [i.item_id for i in items] == ["p1"]
+    assert pool.metrics()["reddit"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_news_api_url_is_stable_across_watermarks():
+    """Test that `since` filters locally so later scans still get a 304"""
+    fixtures = Fixtures()
+    cache = ValidatorCache()
+    pool = _pool(fixtures, cache)
+    fetcher = NewsAPIFetcher("key", base_url="https://news.test/v2")
+
+    first = await fetcher.fetch(pool, since=datetime(2026, 1, 11, tzinfo=timezone.utc))
+    second = await fetcher.fetch(pool, since=datetime(2026, 1, 1))
+
+    assert [i.title for i in first] == ["New chip"]
+    assert [i.title for i in second] == ["New chip", "Old chip"]
+    assert fixtures.requests[0].url == fixtures.requests[1].url
+    assert pool.metrics()["news_api"]["not_modified"] == 1
+    assert len(cache) == 1
+
+
+def test_validator_cache_is_bounded(tmp_path, monkeypatch):
+    """Test size and age bounds on both cache tiers"""
+    cache = ValidatorCache(str(tmp_path / "validators.db"), max_entries=3, ttl_seconds=60)
+    cache._entries.EVICTION_INTERVAL = 1
+    for i in range(5):
+        cache.set(f"https://t.test/{i}", f'"{i}"', None, [i])
+
+    assert len(cache) == 3
+    assert cache.get("https://t.test/0") is None
+    assert cache.get("https://t.test/4") == ('"4"', None, [4])
+
+    later = time.time() + 61
+    monkeypatch.setattr(two_tier_cache.time, "time", lambda: later)
+    assert cache.get("https://t.test/4") is None
+
+
+@pytest.mark.asyncio
+async def test_not_modified_payload_is_a_copy():
+    """Test that changing a returned payload never changes the cached one"""
+    fixtures = Fixtures()
+    pool = _pool(fixtures)
+    url = "https://news.test/v2/everything"
+
+    first = await pool.fetch("news_api", url, lambda r: r.json())
+    first.payload["articles"].clear()
+    second = await pool.fetch("news_api", url, lambda r: r.json())
+    second.payload["articles"].pop()
+    third = await pool.fetch("news_api", url, lambda r: r.json())
+
+    assert second.not_modified and third.not_modified
+    assert len(third.payload["articles"]) == 2
@@ -0,0 +1,67 @@
+"""Tests for Topic Clustering"""
+
+import random
+
+import pytest
+from src.strategic.market_intelligence import MarketIntelligenceEngine, MarketSignal
+from src.strategic.topic_clustering import TopicClusterer
+
+
+def test_reworded_topics_share_a_cluster():
+    """Test word order and plurals do not split a topic"""
+    clusters = TopicClusterer().cluster([
+        "AI in Healthcare",
+        "Healthcare AI",
+        "Quantum chips",
+        "Quantum chip breakthrough",
+        "Rust in the Linux kernel",
+    ])
+
+    groups = sorted(sorted(c.members) for c in clusters)
+    assert groups == [[0, 1], [2, 3], [4]]
+    rust = next(c for c in clusters if c.members == [4])
+    assert rust.label == "Rust in the Linux kernel"
+    assert set(rust.terms) == {"rust", "linux", "kernel"}
+
+
+def test_cluster_ids_are_stable_across_batches():
+    """Test the same topic gets the same id in differently ordered batches"""
+    texts = ["Healthcare AI", "AI in Healthcare", "Rust in the Linux kernel", "Linux kernel Rust drivers"]
+    first = {c.cluster_id: c.terms for c in TopicClusterer().cluster(texts)}
+    second = {c.cluster_id: c.terms for c in TopicClusterer().cluster(list(reversed(texts)))}
+
+    assert first.keys() == second.keys()
+
+
+def test_large_batch_recovers_topics():
+    """Test blocking-based clustering on a synthetic batch of many topics"""
+    rng = random.Random(0)
+    texts, truth = [], []
+    for _ in range(20000):
+        topic = rng.randrange(500)
+        words = [f"t{topic}a", f"t{topic}b", f"t{topic}c", f"t{topic}d"]
+        texts.append(" ".join(rng.sample(words, 3)))
+        truth.append(topic)
+
+    clusters = TopicClusterer().cluster(texts)
+
+    assert len(clusters) == 500
+    assert all(len({truth[i] for i in c.members}) == 1 for c in clusters)
+
+
+@pytest.mark.asyncio
+async def test_similar_topics_form_one_opportunity():
+    """Test identify_opportunities no longer needs identical topic strings"""
+    engine = MarketIntelligenceEngine(fetchers={})
+    topics = ["AI in Healthcare", "Healthcare AI", "AI healthcare startups"] * 3
+    signals = [
+        MarketSignal(signal_id=f"s{i}", signal_type="trend", source="news_api", topic=topic,
+                     keywords=[], sentiment=0.5, relevance_score=0.9)
+        for i, topic in enumerate(topics)
+    ]
+
+    opportunities = await engine.identify_opportunities(signals, existing_topics=[])
+
+    assert len(opportunities) == 1
+    assert len(opportunities[0].supporting_signals) == 9
+    assert opportunities[0].cluster_id.startswith("topic_")
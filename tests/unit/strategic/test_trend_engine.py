@@ -0,0 +1,109 @@
+"""Tests for Trend Engine"""
+
+import time
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from src.strategic.market_intelligence import MarketIntelligenceEngine, MarketSignal
+from src.strategic.trend_engine import TrendEngine
+
+DAY = 86400.0
+NOW = 1_700_000_000.0 - 1_700_000_000.0 % DAY + DAY / 2
+
+
+def _record_daily(engine, topic_id, counts, end=NOW):
+    """Record counts[i] signals on each day ending at `end`"""
+    stamps = [end - (len(counts) - 1 - i) * DAY for i, n in enumerate(counts) for _ in range(n)]
+    engine.record([topic_id] * len(stamps), stamps, now=end)
+
+
+def test_labels_follow_the_time_series():
+    """Test rising, falling, flat and spiking series get their labels"""
+    engine = TrendEngine()
+    rising = [round(2 * 1.1 ** i) for i in range(30)]
+    _record_daily(engine, "rising", rising)
+    _record_daily(engine, "falling", rising[::-1])
+    _record_daily(engine, "flat", [5] * 30)
+    _record_daily(engine, "spike", [1] * 29 + [12])
+
+    labels = {t: engine.trend(t, "day").label for t in ("rising", "falling", "flat", "spike")}
+
+    assert labels == {"rising": "growing", "falling": "declining", "flat": "stable", "spike": "emerging"}
+    assert engine.labels(["spike", "unknown", "falling"], "day") == ["emerging", "stable", "declining"]
+    assert engine.trend("rising", "day").growth > 0
+    assert engine.trend("falling", "day").growth < 0
+    assert engine.trend("unknown") is None
+
+
+def test_old_buckets_roll_out_of_the_window():
+    """Test advancing past the window clears expired counts"""
+    engine = TrendEngine(resolutions={"day": (DAY, 7)})
+    _record_daily(engine, "topic", [3, 3, 3])
+    assert engine.trend("topic", "day", now=NOW).ewma_count > 0
+
+    engine.record(["other"], [NOW + 10 * DAY], now=NOW + 10 * DAY)
+
+    trend = engine.trend("topic", "day")
+    assert trend.ewma_count == 0
+    assert trend.latest_count == 0
+    # Signals older than the window are dropped
+    engine.record(["topic"], [NOW], now=NOW + 10 * DAY)
+    assert engine.trend("topic", "day").ewma_count == 0
+
+
+def test_sentiment_is_averaged_per_topic():
+    """Test the weighted sentiment of a topic's recent signals"""
+    engine = TrendEngine()
+    engine.record(["a", "a", "b"], [NOW, NOW, NOW], [0.5, 1.0, -1.0], now=NOW)
+
+    assert engine.trend("a", "hour").avg_sentiment == pytest.approx(0.75)
+    assert engine.trend("b", "hour").avg_sentiment == pytest.approx(-1.0)
+
+
+def test_spiking_ranks_thousands_of_topics_quickly():
+    """Test the spike query is vectorized across topics"""
+    rng = np.random.default_rng(0)
+    engine = TrendEngine(initial_capacity=16)
+    topics = [f"topic_{i}" for i in range(5000)]
+    hours = 48
+    stamps = NOW - rng.integers(1, hours, 50_000) * 3600.0
+    engine.record([topics[i] for i in rng.integers(0, len(topics), len(stamps))], stamps, now=NOW)
+    for rank, topic in enumerate(["topic_7", "topic_42", "topic_99"]):
+        engine.record([topic] * (40 - rank * 10), [NOW] * (40 - rank * 10), now=NOW)
+
+    started = time.perf_counter()
+    spikes = engine.spiking("hour", top_k=3)
+    elapsed = time.perf_counter() - started
+
+    assert [topic for topic, _ in spikes] == ["topic_7", "topic_42", "topic_99"]
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_opportunity_growth_trend_comes_from_trend_engine():
+    """Test a spike of fresh signals is labelled emerging and counted once"""
+    engine = MarketIntelligenceEngine(enabled_sources=[], fetchers={})
+    now = datetime.now(timezone.utc)
+    signals = [
+        MarketSignal(
+            signal_id=f"s{i}",
+            signal_type="trend",
+            source="news_api",
+            topic=f"AI Healthcare diagnostics update {i}",
+            keywords=["AI", "Healthcare", "diagnostics"],
+            sentiment=0.5,
+            relevance_score=0.9,
+            metadata={"published_at": (now - timedelta(seconds=i)).isoformat()},
+        )
+        for i in range(8)
+    ]
+
+    opportunities = await engine.identify_opportunities(signals, existing_topics=[])
+
+    assert len(opportunities) == 1
+    assert opportunities[0].growth_trend == "emerging"
+    trend = engine.trend_engine.trend(opportunities[0].cluster_id, "day")
+    assert trend.latest_count == 8
+
+    await engine.identify_opportunities(signals, existing_topics=[])
+    assert engine.trend_engine.trend(opportunities[0].cluster_id, "day").latest_count == 8